@@ -12,5 +12,37 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main.settings')
+# bajo ASGI el código sync corre en hilos de asgiref que cambian entre
+# requests: una conexión persistente abierta en uno no se reutiliza ni se
+# cierra. Sin conexiones persistentes (o con el pool de DB_POOL_MAX).
+os.environ['DB_CONN_MAX_AGE'] = '0'
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402 - recién configurado por get_*_application
+
+from utils.apiCliente.asincrono import cerrar_clientes_http  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """La app de Django más el protocolo lifespan (Django sólo atiende HTTP).
+
+    Al apagarse el worker cierra los pools httpx del event loop, así las
+    conexiones keep-alive a los upstreams terminan limpias.
+    """
+    if scope["type"] != "lifespan":
+        return await django_application(scope, receive, send)
+    while True:
+        mensaje = await receive()
+        if mensaje["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif mensaje["type"] == "lifespan.shutdown":
+            await cerrar_clientes_http()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+if getattr(settings, "WARMUP_ENABLED", False):
+    from Main.warmup import calentar
+
+    calentar()
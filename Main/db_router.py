@@ -0,0 +1,144 @@
+# Main/db_router.py
+"""Lecturas de historial y listados en la réplica, escrituras siempre en la primaria.
+
+Sólo van a la réplica las lecturas hechas dentro de una vista (o bloque)
+marcada con :func:`lectura_en_replica`; el resto del código no cambia de
+base. Para que un usuario vea enseguida lo que acaba de escribir (la réplica
+llega con algo de atraso):
+
+- dentro de la misma request, después de una escritura todas las lecturas
+  vuelven a la primaria;
+- `ReplicaStickinessMiddleware` deja una cookie que fija a ese cliente en la
+  primaria por REPLICA_STICKY_SECONDS después de su última escritura.
+
+Sin alias ``replica`` en DATABASES el router no cambia nada.
+"""
+from __future__ import annotations
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+ALIAS_REPLICA = "replica"
+COOKIE_STICKY = "replica_sticky"
+
+# la vista en curso admite leer de la réplica
+_usar_replica: ContextVar[bool] = ContextVar("usar_replica", default=False)
+# el cliente escribió hace poco (cookie): leer de la primaria
+_fijado_a_primaria: ContextVar[bool] = ContextVar("fijado_a_primaria", default=False)
+# hubo una escritura en esta request: leer de la primaria desde acá
+_escribio: ContextVar[bool] = ContextVar("escribio", default=False)
+
+
+def replica_configurada() -> bool:
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+@contextmanager
+def replica():
+    token = _usar_replica.set(True)
+    try:
+        yield
+    finally:
+        _usar_replica.reset(token)
+
+
+def lectura_en_replica(vista):
+    """Decorador para vistas de sólo lectura (funciones sync o async, o acciones de DRF)."""
+    if iscoroutinefunction(vista):
+        @functools.wraps(vista)
+        async def envoltura_async(*args, **kwargs):
+            with replica():
+                return await vista(*args, **kwargs)
+        return envoltura_async
+
+    @functools.wraps(vista)
+    def envoltura(*args, **kwargs):
+        with replica():
+            return vista(*args, **kwargs)
+    return envoltura
+
+
+@contextmanager
+def fijar_a_primaria(fijar: bool = True):
+    """Contexto de una request: fija (o no) a la primaria y empieza sin escrituras."""
+    tokens = (_fijado_a_primaria.set(fijar), _escribio.set(False))
+    try:
+        yield
+    finally:
+        _escribio.reset(tokens[1])
+        _fijado_a_primaria.reset(tokens[0])
+
+
+def hubo_escritura() -> bool:
+    return _escribio.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _usar_replica.get() and not (_fijado_a_primaria.get() or _escribio.get()) and replica_configurada():
+            return ALIAS_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # a partir de acá la request lee lo que escribió
+        _escribio.set(True)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # réplica y primaria tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # la réplica recibe el esquema por replicación, no por migrate
+        return db != ALIAS_REPLICA
+
+
+class ReplicaStickinessMiddleware:
+    """Fija al cliente en la primaria un rato después de que escribe (read-your-writes).
+
+    Sirve en los dos modos: bajo ASGI con vistas async no obliga a Django a
+    pasar la cadena de middlewares a un hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with fijar_a_primaria(self._fijado(request)):
+            response = self.get_response(request)
+            escribio = hubo_escritura()
+        return self._marcar(response, escribio)
+
+    async def __acall__(self, request):
+        with fijar_a_primaria(self._fijado(request)):
+            response = await self.get_response(request)
+            escribio = hubo_escritura()
+        return self._marcar(response, escribio)
+
+    @staticmethod
+    def _fijado(request) -> bool:
+        try:
+            hasta = float(request.COOKIES.get(COOKIE_STICKY, 0))
+        except ValueError:
+            hasta = 0
+        return hasta > time.time()
+
+    @staticmethod
+    def _marcar(response, escribio: bool):
+        if escribio and replica_configurada():
+            segundos = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+            response.set_cookie(COOKIE_STICKY, f"{time.time() + segundos:.3f}", max_age=segundos,
+                                httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,116 @@
+# Main/gunicorn_conf.py
+"""Configuración de gunicorn.
+
+    gunicorn -c python:Main.gunicorn_conf
+
+Modelo de workers (GUNICORN_WORKER_CLASS):
+
+- ``gthread`` (por defecto): procesos con varios hilos. La app pasa la mayor
+  parte de cada request esperando a Stock/Logística; mientras un hilo espera
+  el GIL queda libre para los demás. Concurrencia = workers x threads.
+- ``sync``: una request por proceso; sólo para comparar o depurar.
+- ``gevent``: miles de requests por proceso con greenlets (``pip install
+  gevent``). Se desactiva el preload: el monkey-patching tiene que correr
+  antes de importar la app.
+- ``uvicorn``: Main.asgi con ``uvicorn_worker.UvicornWorker``, un event loop
+  por proceso. Activa ``ASYNC_VIEWS`` (tienda, productos, tracking, mis
+  pedidos): mientras esperan a Stock/Logística no ocupan ningún hilo. El
+  resto de las vistas (DRF, allauth, admin) corre en el pool de hilos de
+  asgiref (``ASGI_THREADS``).
+
+La app (``wsgi_app``) sale del modelo: Main.asgi para uvicorn, Main.wsgi
+para los demás.
+
+Los valores por defecto salen de los CPUs disponibles para el proceso (los
+del cgroup/affinity, no los del host):
+
+- GUNICORN_WORKERS: sync 2*CPU+1, gthread CPU+1, gevent/uvicorn CPU
+- GUNICORN_THREADS: hilos por worker gthread (8)
+- GUNICORN_WORKER_CONNECTIONS: greenlets por worker gevent (1000)
+- GUNICORN_MAX_REQUESTS / _JITTER: recicla cada worker después de N
+  requests (1000 ± 100) para acotar fugas de memoria y fragmentación
+- GUNICORN_KEEPALIVE: segundos que se mantiene abierta una conexión de nginx
+  entre requests (5; sync no usa keep-alive)
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT
+- GUNICORN_PRELOAD: 1 para cargar la app en el master (por defecto, salvo gevent)
+- GUNICORN_BIND
+
+Con ``preload_app`` el master importa Django y corre el warm-up de
+Main/warmup.py una sola vez; los workers nacen por fork con todo eso ya en
+memoria. Lo que abre conexiones (base, cache) no debe heredarse: el master
+cierra las suyas antes de cada fork; en ``post_worker_init`` cada worker
+prueba el cache y la base (esa conexión se cierra: cada hilo de requests
+abre la suya).
+
+Cada hilo de gthread tiene su propia conexión a la base: con conexiones
+persistentes son hasta workers x threads conexiones por contenedor
+(conviene el pool de DB_POOL_MAX, ver documentacion/BASE_DE_DATOS.md).
+"""
+import os
+
+MODELOS = ("sync", "gthread", "gevent", "uvicorn")
+# clase de worker de gunicorn para los modelos que no son built-in
+CLASES_WORKER = {"uvicorn": "uvicorn_worker.UvicornWorker"}
+
+
+def cpus_disponibles():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def _entero(clave, defecto):
+    valor = os.environ.get(clave)
+    return int(valor) if valor not in (None, "") else defecto
+
+
+def workers_por_defecto(modelo, cpus):
+    if modelo == "sync":
+        return 2 * cpus + 1
+    if modelo == "gthread":
+        return cpus + 1
+    return cpus
+
+
+modelo = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+if modelo not in MODELOS:
+    raise ValueError(f"GUNICORN_WORKER_CLASS inválido: {modelo!r} (opciones: {', '.join(MODELOS)})")
+worker_class = CLASES_WORKER.get(modelo, modelo)
+if modelo == "uvicorn":
+    wsgi_app = "Main.asgi:application"
+    # se lee al importar los URLconf, en el master (preload) o en cada worker
+    os.environ.setdefault("ASYNC_VIEWS", "1")
+else:
+    wsgi_app = "Main.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = _entero("GUNICORN_WORKERS", workers_por_defecto(modelo, cpus_disponibles()))
+threads = _entero("GUNICORN_THREADS", 8) if modelo == "gthread" else 1
+worker_connections = _entero("GUNICORN_WORKER_CONNECTIONS", 1000)
+max_requests = _entero("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _entero("GUNICORN_MAX_REQUESTS_JITTER", 100)
+keepalive = _entero("GUNICORN_KEEPALIVE", 5)
+timeout = _entero("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _entero("GUNICORN_GRACEFUL_TIMEOUT", 30)
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0" if modelo == "gevent" else "1") == "1"
+# el heartbeat de los workers en memoria: en Docker /tmp puede ser overlayfs y bloquear
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        # AppConfig.ready() de pedidos consulta la base al arrancar: esa conexión
+        # quedaría compartida entre el master y todos los workers
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    from django.conf import settings
+
+    if getattr(settings, "WARMUP_ENABLED", False):
+        from Main.warmup import calentar_worker
+
+        calentar_worker()
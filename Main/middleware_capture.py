@@ -0,0 +1,212 @@
+# Main/middleware_capture.py
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+log = logging.getLogger("app")
+
+# claves cuyo valor nunca se guarda (se compara en minúsculas y por "contiene")
+CLAVES_SENSIBLES = (
+    "password", "contraseña", "contrasena", "token", "secret", "csrf", "session",
+    "gmail", "email", "telefono", "phone", "tarjeta", "card", "cvv", "dni", "api_key",
+)
+REDACTADO = "***"
+# tope de elementos por lista en la forma del body (alcanza para reproducir tamaños típicos)
+MAX_ELEMENTOS = 50
+
+
+def _sensible(clave):
+    clave = str(clave).lower()
+    return any(s in clave for s in CLAVES_SENSIBLES)
+
+
+def forma_json(valor):
+    """Reemplaza cada valor por su tipo, conservando claves y largo de listas.
+
+    {"products": [{"productId": 3}]} -> {"products": [{"productId": "int"}]}
+    """
+    if isinstance(valor, dict):
+        return {k: forma_json(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [forma_json(v) for v in valor[:MAX_ELEMENTOS]]
+    if valor is None:
+        return None
+    return type(valor).__name__
+
+
+def ruta_legible(match):
+    """Ruta resuelta normalizada: 'api/product/(?P<pk>[^/.]+)/$' -> 'api/product/{pk}/'."""
+    ruta = getattr(match, "route", None)
+    if not ruta:
+        return None
+    ruta = re.sub(r"\(\?P<(\w+)>[^)]*\)", r"{\1}", ruta)
+    return ruta.replace("^", "").rstrip("$")
+
+
+def path_sanitizado(request):
+    """Path con los parámetros de la URL no numéricos reemplazados por ``{nombre}``.
+
+    Los ids numéricos se conservan para poder reproducir la request; el resto
+    (p. ej. las claves de ``confirm-email/<key>/`` o ``password/reset/key/``
+    de allauth) no se guarda.
+    """
+    path = request.path
+    match = getattr(request, "resolver_match", None)
+    for nombre, valor in (getattr(match, "kwargs", None) or {}).items():
+        valor = str(valor)
+        if valor and not valor.isdigit():
+            path = path.replace(valor, "{%s}" % nombre)
+    return path
+
+
+def query_sanitizada(querydict):
+    return {
+        clave: [REDACTADO] * len(valores) if _sensible(clave) else valores
+        for clave, valores in querydict.lists()
+    }
+
+
+def forma_body(request, cuerpo):
+    """Describe el body sin guardar su contenido."""
+    if not cuerpo:
+        return None
+    tipo = (request.content_type or "").lower()
+    if tipo == "application/json":
+        try:
+            return {"tipo": "json", "forma": forma_json(json.loads(cuerpo))}
+        except ValueError:
+            return {"tipo": "json_invalido", "bytes": len(cuerpo)}
+    if tipo == "application/x-www-form-urlencoded":
+        return {"tipo": "form", "forma": {k: "str" for k in request.POST.keys() if not _sensible(k)}}
+    return {"tipo": tipo or "desconocido", "bytes": len(cuerpo)}
+
+
+class ArchivoCaptura:
+    """Escritor JSONL compartido por los hilos del proceso (una línea por request)."""
+
+    def __init__(self, ruta):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._lock = threading.Lock()
+        self._archivo = open(ruta, "a", encoding="utf-8", buffering=1)
+
+    def escribir(self, registro):
+        linea = json.dumps(registro, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._archivo.write(linea + "\n")
+
+
+_archivos = {}
+_archivos_lock = threading.Lock()
+
+
+def obtener_archivo(ruta):
+    """Un único escritor por ruta y proceso, aunque se instancie más de un handler."""
+    with _archivos_lock:
+        if ruta not in _archivos:
+            _archivos[ruta] = ArchivoCaptura(ruta)
+        return _archivos[ruta]
+
+
+class TrafficCaptureMiddleware:
+    """Registra requests reales (sanitizadas) en JSONL para reproducirlas con tools/replay_traffic.py.
+
+    Se activa con TRAFFIC_CAPTURE_ENABLED; si está apagado Django lo saca de la
+    cadena (MiddlewareNotUsed) y no cuesta nada. Por request guarda método,
+    path (sin los parámetros de URL que no son ids), ruta resuelta, query (con valores sensibles redactados), la *forma*
+    del body (claves y tipos, nunca valores), status, bytes y duración.
+
+    - TRAFFIC_CAPTURE_PATH: archivo destino (uno por proceso conviene en gunicorn)
+    - TRAFFIC_CAPTURE_SAMPLE_RATE: fracción de requests a registrar (0..1)
+    - TRAFFIC_CAPTURE_EXCLUDE: prefijos de path que no se registran
+
+    Es async-capable: bajo ASGI con vistas async no obliga a pasar la cadena
+    de middlewares a un hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "TRAFFIC_CAPTURE_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.muestreo = float(getattr(settings, "TRAFFIC_CAPTURE_SAMPLE_RATE", 1.0))
+        self.excluidos = tuple(getattr(settings, "TRAFFIC_CAPTURE_EXCLUDE", ()))
+        ruta = str(getattr(settings, "TRAFFIC_CAPTURE_PATH", "trafico.jsonl")).format(pid=os.getpid())
+        self.destino = obtener_archivo(ruta)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._registrar(request):
+            return self.get_response(request)
+
+        # leer el body antes que la vista para poder describirlo después
+        cuerpo = self._cuerpo(request)
+        ts = time.time()
+        inicio = time.perf_counter()
+        response = self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        usuario = getattr(request, "user", None)
+        autenticado = bool(usuario is not None and usuario.is_authenticated)
+        self._escribir(request, response, cuerpo, ts, duracion_ms, autenticado)
+        return response
+
+    async def __acall__(self, request):
+        if not self._registrar(request):
+            return await self.get_response(request)
+
+        cuerpo = self._cuerpo(request)
+        ts = time.time()
+        inicio = time.perf_counter()
+        response = await self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        # request.user es lazy y consulta la sesión de forma sync
+        try:
+            autenticado = (await request.auser()).is_authenticated
+        except Exception:
+            autenticado = False
+        self._escribir(request, response, cuerpo, ts, duracion_ms, autenticado)
+        return response
+
+    def _registrar(self, request):
+        return not request.path.startswith(self.excluidos) and random.random() < self.muestreo
+
+    @staticmethod
+    def _cuerpo(request):
+        try:
+            return request.body
+        except Exception:
+            return b""
+
+    def _escribir(self, request, response, cuerpo, ts, duracion_ms, autenticado):
+        try:
+            self.destino.escribir({
+                "ts": round(ts, 3),
+                "method": request.method,
+                "path": path_sanitizado(request),
+                "route": ruta_legible(getattr(request, "resolver_match", None)),
+                "query": query_sanitizada(request.GET),
+                "body": forma_body(request, cuerpo),
+                "autenticado": autenticado,
+                "status": response.status_code,
+                "bytes": None if response.streaming else len(response.content),
+                "duracion_ms": round(duracion_ms, 2),
+            })
+        except Exception:
+            # la captura nunca puede romper la request
+            log.exception("No se pudo registrar la request en la captura de tráfico")
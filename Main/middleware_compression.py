@@ -0,0 +1,80 @@
+# Main/middleware_compression.py
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:  # dependencia opcional: si no está, sólo se negocia gzip
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+re_accepts_br = re.compile(r"\bbr\b(?!\s*;\s*q=0(\.0*)?\b)")
+
+# Tipos que vale la pena comprimir (imágenes/zip ya vienen comprimidos)
+TIPOS_COMPRIMIBLES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.oai.openapi",
+    "image/svg+xml",
+)
+
+
+def sin_compresion(view_func):
+    """Decorador para que una vista nunca devuelva el cuerpo comprimido."""
+    @wraps(view_func)
+    def _wrapped(*args, **kwargs):
+        response = view_func(*args, **kwargs)
+        response.sin_compresion = True
+        return response
+    return _wrapped
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Comprime las respuestas con brotli (si está instalado) o gzip.
+
+    A diferencia de GZipMiddleware, el umbral de tamaño es configurable:
+    - COMPRESSION_ENABLED: apaga la compresión (p. ej. si nginx ya comprime)
+    - COMPRESSION_MIN_SIZE: bytes mínimos del cuerpo para comprimir
+    Las respuestas chicas, las de tipos no comprimibles y las marcadas con
+    ``sin_compresion`` se devuelven tal cual.
+
+    El HTML siempre va con gzip: GZipMiddleware agrega bytes aleatorios al
+    comprimido como mitigación de BREACH (las páginas llevan el token CSRF) y
+    la rama de brotli no lo hace.
+    """
+
+    def process_response(self, request, response):
+        if not getattr(settings, "COMPRESSION_ENABLED", True) or getattr(response, "sin_compresion", False):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(TIPOS_COMPRIMIBLES):
+            return response
+
+        min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        ae = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (brotli is not None and not response.streaming and re_accepts_br.search(ae)
+                and not content_type.startswith("text/html")):
+            patch_vary_headers(response, ("Accept-Encoding",))
+            compressed_content = brotli.compress(response.content, quality=5)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+            etag = response.get("ETag")
+            if etag and etag.startswith('"'):
+                response.headers["ETag"] = "W/" + etag
+            response.headers["Content-Encoding"] = "br"
+            return response
+
+        return super().process_response(request, response)
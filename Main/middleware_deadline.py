@@ -0,0 +1,49 @@
+# Main/middleware_deadline.py
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from utils.apiCliente.deadline import establecer_deadline, restablecer_deadline
+
+# header que usa BaseAPIClient para propagar el tiempo restante (en ms)
+META_DEADLINE = "HTTP_X_REQUEST_DEADLINE_MS"
+
+
+class DeadlineMiddleware(MiddlewareMixin):
+    """Fija el deadline de punta a punta de cada request.
+
+    - REQUEST_DEADLINE_SECONDS: deadline por defecto (None lo desactiva)
+    - REQUEST_DEADLINES: {url_name: segundos} para vistas puntuales
+    - si la request viene de otro servicio nuestro con el header
+      X-Request-Deadline-Ms se respeta el tiempo que le queda al llamador.
+
+    Todas las llamadas de BaseAPIClient hechas durante la request (con sus
+    reintentos y llamadas anidadas) quedan acotadas por ese deadline.
+    """
+
+    def process_request(self, request):
+        tokens = [establecer_deadline(getattr(settings, "REQUEST_DEADLINE_SECONDS", None))]
+        entrante = request.META.get(META_DEADLINE)
+        if entrante:
+            try:
+                tokens.append(establecer_deadline(int(entrante) / 1000))
+            except ValueError:
+                pass
+        request._deadline_tokens = tokens
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = getattr(request, "resolver_match", None)
+        segundos = getattr(settings, "REQUEST_DEADLINES", {}).get(getattr(match, "url_name", None))
+        if segundos is not None:
+            request._deadline_tokens.append(establecer_deadline(segundos))
+        return None
+
+    def process_response(self, request, response):
+        # restaurar en orden inverso para dejar el contexto como estaba
+        for token in reversed(getattr(request, "_deadline_tokens", [])):
+            try:
+                restablecer_deadline(token)
+            except ValueError:
+                # token creado en otro contexto (p. ej. al adaptar sync/async); se descarta
+                pass
+        request._deadline_tokens = []
+        return response
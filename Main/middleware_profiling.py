@@ -0,0 +1,122 @@
+# Main/middleware_profiling.py
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils.perfilador import PerfiladorMuestreo, guardar_perfil
+
+log = logging.getLogger("app")
+
+HEADER_PERFIL = "X-Profile"
+META_PERFIL = "HTTP_X_PROFILE"
+PARAMETRO_PERFIL = "_perfil"
+SALT_PERFIL = "Main.middleware_profiling"
+
+
+def firmar_token():
+    """Valor para el header X-Profile (vence según PROFILING_HEADER_MAX_AGE)."""
+    return signing.TimestampSigner(salt=SALT_PERFIL).sign("perfilar")
+
+
+def token_valido(valor):
+    max_age = getattr(settings, "PROFILING_HEADER_MAX_AGE", 3600)
+    try:
+        signing.TimestampSigner(salt=SALT_PERFIL).unsign(valor, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def motivo_perfilado(request, muestreo, usuario=None):
+    """Por qué se perfila esta request ("header", "staff", "muestreo") o None.
+
+    ``usuario`` ya resuelto (bajo ASGI, con ``request.auser()``); si no se
+    pasa se usa ``request.user``.
+    """
+    valor = request.META.get(META_PERFIL)
+    if valor and token_valido(valor):
+        return "header"
+    if PARAMETRO_PERFIL in request.GET:
+        if usuario is None:
+            usuario = getattr(request, "user", None)
+        if usuario is not None and usuario.is_authenticated and usuario.is_staff:
+            return "staff"
+    if muestreo and random.random() < muestreo:
+        return "muestreo"
+    return None
+
+
+class ProfilingMiddleware:
+    """Perfil estadístico de requests puntuales, para encontrar caminos calientes en producción.
+
+    Se activa con PROFILING_ENABLED (si no, Django lo saca de la cadena). Una
+    request se perfila si trae un header X-Profile firmado (ver
+    ``manage.py token_perfilado``), si un usuario staff agrega ``?_perfil=1``
+    o por muestreo al azar (PROFILING_SAMPLE_RATE). Los perfiles quedan en
+    PROFILING_DIR y se ven en /administracion/perfiles/.
+
+    - PROFILING_INTERVAL_MS: cada cuánto se muestrea la pila
+    - PROFILING_MAX_FILES: perfiles que se conservan (se borran los más viejos)
+
+    Es async-capable: bajo ASGI no saca la cadena a un hilo y muestrea el
+    hilo del event loop, donde corre la vista async. Ese hilo lo comparten
+    las requests concurrentes, así que el perfil puede incluir pilas ajenas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.muestreo = float(getattr(settings, "PROFILING_SAMPLE_RATE", 0.0))
+        self.intervalo = float(getattr(settings, "PROFILING_INTERVAL_MS", 5)) / 1000
+        self.directorio = getattr(settings, "PROFILING_DIR", "perfiles")
+        self.maximo = getattr(settings, "PROFILING_MAX_FILES", 500)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        motivo = motivo_perfilado(request, self.muestreo)
+        if motivo is None:
+            return self.get_response(request)
+
+        perfilador = PerfiladorMuestreo(intervalo=self.intervalo)
+        with perfilador:
+            response = self.get_response(request)
+        return self._guardar(request, response, perfilador, motivo)
+
+    async def __acall__(self, request):
+        usuario = await request.auser() if PARAMETRO_PERFIL in request.GET else None
+        motivo = motivo_perfilado(request, self.muestreo, usuario)
+        if motivo is None:
+            return await self.get_response(request)
+
+        # iniciado acá, el perfilador toma el hilo del event loop
+        perfilador = PerfiladorMuestreo(intervalo=self.intervalo)
+        with perfilador:
+            response = await self.get_response(request)
+        return self._guardar(request, response, perfilador, motivo)
+
+    def _guardar(self, request, response, perfilador, motivo):
+        try:
+            match = getattr(request, "resolver_match", None)
+            ruta = guardar_perfil(self.directorio, perfilador, {
+                "method": request.method,
+                "path": request.path,
+                "url_name": getattr(match, "url_name", None),
+                "status": response.status_code,
+                "motivo": motivo,
+            }, maximo=self.maximo)
+            response[HEADER_PERFIL] = ruta.stem
+        except Exception:
+            # el perfilado nunca puede romper la request
+            log.exception("No se pudo guardar el perfil de la request")
+        return response
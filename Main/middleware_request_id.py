@@ -2,29 +2,141 @@
 import uuid
 import time
 import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
-from .logging_filters import set_request_context
+from utils.contexto_request import (
+    HEADER_REQUEST_ID, establecer_contexto, establecer_usuario, request_id_entrante, restablecer_contexto,
+)
+from utils.metricas_request import finalizar_metricas, iniciar_metricas, metricas_actuales, wrapper_sql
 
 logger = logging.getLogger("app")
 
+# límites que se pueden fijar por vista en REQUEST_BUDGETS
+CAMPOS_PRESUPUESTO = ("sql_consultas", "sql_ms", "upstream_llamadas", "upstream_ms", "total_ms")
+
+
+def server_timing(resumen):
+    """Header Server-Timing (lo muestran las devtools del navegador en la pestaña Timing)."""
+    partes = [
+        f'db;dur={resumen["sql_ms"]};desc="{resumen["sql_consultas"]} consultas"',
+        f'upstream;dur={resumen["upstream_ms"]};desc="{resumen["upstream_llamadas"]} llamadas"',
+        f'app;dur={resumen["app_ms"]}',
+    ]
+    if resumen["cpu_ms"] is not None:
+        partes.append(f'cpu;dur={resumen["cpu_ms"]}')
+    partes.append(f'total;dur={resumen["total_ms"]}')
+    return ", ".join(partes)
+
+
+def presupuesto_excedido(resumen, presupuesto):
+    """[(campo, valor, límite)] de los límites superados."""
+    return [
+        (campo, resumen[campo], presupuesto[campo])
+        for campo in CAMPOS_PRESUPUESTO
+        if presupuesto.get(campo) is not None and resumen[campo] > presupuesto[campo]
+    ]
+
+
 class RequestContextMiddleware(MiddlewareMixin):
+    """Request id en los logs y métricas de la request.
+
+    El request id (nuevo, o el X-Request-ID que manda otro servicio nuestro)
+    queda en utils.contexto_request para los logs y las llamadas a upstreams,
+    y se devuelve en el header X-Request-ID de la respuesta.
+
+    Además del tiempo total registra cantidad y tiempo de consultas SQL
+    (execute wrapper en cada conexión), llamadas a upstreams hechas con
+    BaseAPIClient y tiempo de CPU del hilo (sólo bajo WSGI: con ASGI la
+    request pasa por varios hilos y no se mide). Van en el log de cierre (también
+    como campos ``extra``) y, con SERVER_TIMING_ENABLED, en el header
+    Server-Timing. REQUEST_BUDGETS = {url_name: {campo: límite}} avisa con un
+    warning cuando una vista se pasa (p. ej. un N+1 que dispara las consultas).
+    """
+
     def process_request(self, request):
-        req_id = str(uuid.uuid4())
-        user_id = "-"
+        # antes de tocar request.user, así también se cuentan las consultas de sesión y usuario
+        request._metricas_token = iniciar_metricas(medir_cpu=not isinstance(request, ASGIRequest))
+        request._metricas = metricas_actuales()
+        request._metricas_wrappers = stack = ExitStack()
+        for conexion in connections.all():
+            stack.enter_context(conexion.execute_wrapper(wrapper_sql))
+
+        # si la request viene de otro servicio nuestro se continúa su request id
+        req_id = request_id_entrante(request.META.get("HTTP_X_REQUEST_ID")) or str(uuid.uuid4())
+        request.request_id = req_id
+        request._contexto_tokens = establecer_contexto(req_id)
         if hasattr(request, "user") and getattr(request.user, "is_authenticated", False):
-            user_id = str(getattr(request.user, "pk", "-"))
-        set_request_context(req_id, user_id)
+            establecer_usuario(str(getattr(request.user, "pk", "-")))
         request._start_time = time.time()
         logger.info("➡️ %s %s", request.method, request.path)
 
     def process_response(self, request, response):
         try:
-            duration_ms = int((time.time() - getattr(request, "_start_time", time.time())) * 1000)
-        except Exception:
-            duration_ms = -1
-        logger.info("✅ %s %s %s (%d ms)", request.method, request.path, getattr(response, "status_code", "?"), duration_ms)
+            return self._cerrar(request, response)
+        finally:
+            self._restablecer_contexto(request)
+
+    def _cerrar(self, request, response):
+        if getattr(request, "request_id", None):
+            response[HEADER_REQUEST_ID] = request.request_id
+        resumen = self._cerrar_metricas(request)
+        if resumen is None:
+            try:
+                duration_ms = int((time.time() - getattr(request, "_start_time", time.time())) * 1000)
+            except Exception:
+                duration_ms = -1
+            logger.info("✅ %s %s %s (%d ms)", request.method, request.path, getattr(response, "status_code", "?"), duration_ms)
+            return response
+
+        cpu = f', cpu {resumen["cpu_ms"]:.1f} ms' if resumen["cpu_ms"] is not None else ""
+        logger.info(
+            "✅ %s %s %s (%d ms, sql %d/%.1f ms, upstream %d/%.1f ms%s)",
+            request.method, request.path, getattr(response, "status_code", "?"), resumen["total_ms"],
+            resumen["sql_consultas"], resumen["sql_ms"], resumen["upstream_llamadas"], resumen["upstream_ms"],
+            cpu,
+            extra={"metricas": resumen},
+        )
+        if getattr(settings, "SERVER_TIMING_ENABLED", False):
+            response["Server-Timing"] = server_timing(resumen)
+
+        match = getattr(request, "resolver_match", None)
+        url_name = getattr(match, "url_name", None)
+        presupuesto = getattr(settings, "REQUEST_BUDGETS", {}).get(url_name)
+        if presupuesto:
+            for campo, valor, limite in presupuesto_excedido(resumen, presupuesto):
+                logger.warning("⚠️ %s excedió el presupuesto de %s: %s > %s", url_name, campo, valor, limite,
+                               extra={"metricas": resumen})
         return response
 
     def process_exception(self, request, exception):
         logger.exception("💥 Error no manejado: %s", str(exception))
         return None
+
+    def _cerrar_metricas(self, request):
+        token = getattr(request, "_metricas_token", None)
+        if token is None:
+            return None
+        request._metricas_wrappers.close()
+        resumen = request._metricas.resumen()
+        try:
+            finalizar_metricas(token)
+        except ValueError:
+            # token creado en otro contexto (p. ej. al adaptar sync/async); se descarta
+            pass
+        request._metricas_token = None
+        return resumen
+
+    def _restablecer_contexto(self, request):
+        tokens = getattr(request, "_contexto_tokens", None)
+        if tokens is None:
+            return
+        try:
+            restablecer_contexto(tokens)
+        except ValueError:
+            # token creado en otro contexto (p. ej. al adaptar sync/async); se descarta
+            pass
+        request._contexto_tokens = None
@@ -8,6 +8,8 @@ from pathlib import Path
 import os
 import sys
 
+from Main.db_config import configuracion_db
+
 # --- BASE_DIR (unificado, no lo redefinas más abajo) ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,11 +32,44 @@ ALLOWED_HOSTS = ['*']
 # CONFIGURACIÓN DE APIS MOCK/EXTERNAS
 # ==========================================
 # Cambiar USE_MOCK_APIS a False en producción para usar APIs reales
-USE_MOCK_APIS = True
+USE_MOCK_APIS = os.environ.get("USE_MOCK_APIS", "1") == "1"
 
 base_url_api = "http://localhost:8000/api/"
-STOCK_API_BASE_URL = "http://localhost:8000" 
-LOGISTICA_API_BASE_URL= "http://localhost:8000"
+# Apuntar a tools/stub_services.py para pruebas de carga sin los servicios reales
+STOCK_API_BASE_URL = os.environ.get("STOCK_API_BASE_URL", "http://localhost:8000")
+LOGISTICA_API_BASE_URL = os.environ.get("LOGISTICA_API_BASE_URL", "http://localhost:8000")
+# usado por pedidoApi.client.obtener_cliente_logistica (si es None cae a base_url_api)
+LOGISTICS_API_BASE_URL = os.environ.get("LOGISTICA_API_BASE_URL")
+
+# apps.modulos.pedidos borra todos los pedidos al arrancar (datos de demo);
+# apagarlo para trabajar con datos generados por `manage.py generar_datos_escala`
+LIMPIAR_PEDIDOS_AL_INICIAR = os.environ.get("LIMPIAR_PEDIDOS_AL_INICIAR", "1") == "1"
+
+# Bulkhead adaptativo por upstream (utils/apiCliente/bulkhead.py): máximo de
+# llamadas en vuelo por proceso; el límite real se achica si sube la latencia.
+UPSTREAM_BULKHEADS = {
+    "stock": {"limite_inicial": 20, "limite_minimo": 4, "limite_maximo": 64},
+    "logistica": {"limite_inicial": 10, "limite_minimo": 2, "limite_maximo": 32},
+}
+
+# Deadline de punta a punta por request (Main/middleware_deadline.py): acota la
+# suma de llamadas a upstreams, reintentos incluidos. Debe quedar por debajo
+# del timeout del worker de gunicorn (30 s por defecto).
+REQUEST_DEADLINE_SECONDS = 25
+REQUEST_DEADLINES = {
+    "inicio": 12,
+    "api_checkout_confirm": 25,
+}
+
+# Métricas por request (Main/middleware_request_id.py): consultas SQL, llamadas
+# a upstreams y CPU. Server-Timing expone tiempos internos, por eso sólo se
+# activa por defecto en desarrollo.
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "1" if DEBUG else "0") == "1"
+# {url_name: {campo: límite}}; campos: sql_consultas, sql_ms, upstream_llamadas, upstream_ms, total_ms
+REQUEST_BUDGETS = {
+    "inicio": {"sql_consultas": 10, "upstream_llamadas": 3, "total_ms": 2000},
+    "api_checkout_confirm": {"sql_consultas": 30, "upstream_llamadas": 4},
+}
 
 # Application definition
 INSTALLED_APPS = [
@@ -84,24 +119,56 @@ AUTHENTICATION_BACKENDS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'Main.middleware_compression.CompressionMiddleware',        # <-- antes de los que leen/escriben el body
+    'Main.middleware_capture.TrafficCaptureMiddleware',         # <-- sólo activo con TRAFFIC_CAPTURE_ENABLED
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # <-- primero esto
     'Main.middleware_request_id.RequestContextMiddleware',      # <-- y recién después el nuestro
+    'Main.middleware_profiling.ProfilingMiddleware',            # <-- sólo activo con PROFILING_ENABLED
+    'Main.middleware_deadline.DeadlineMiddleware',
+    'Main.db_router.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
 ]
 
+# Compresión de respuestas (gzip, o brotli si está instalado)
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "1") == "1"
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))  # bytes; por debajo no se comprime
+
+# Captura de tráfico sanitizado para reproducirlo con tools/replay_traffic.py
+TRAFFIC_CAPTURE_ENABLED = os.environ.get("TRAFFIC_CAPTURE_ENABLED", "0") == "1"
+TRAFFIC_CAPTURE_PATH = os.environ.get("TRAFFIC_CAPTURE_PATH", str(BASE_DIR / "capturas" / "trafico-{pid}.jsonl"))
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.environ.get("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0"))
+TRAFFIC_CAPTURE_EXCLUDE = ("/static/", "/media/", "/admin/", "/favicon.ico")
+
+# Perfilado por muestreo de requests puntuales (Main/middleware_profiling.py):
+# header X-Profile firmado, ?_perfil=1 para staff o PROFILING_SAMPLE_RATE.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", "5"))
+PROFILING_DIR = os.environ.get("PROFILING_DIR", str(BASE_DIR / "perfiles"))
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", "500"))
+PROFILING_HEADER_MAX_AGE = 3600  # segundos de validez del token de X-Profile
 
 ROOT_URLCONF = 'Main.urls'
 
+# Templates: con TEMPLATES_CACHED cada template se compila una sola vez por
+# proceso (Main/warmup.py los precarga al arrancar el worker); con 0 se leen
+# y compilan en cada render. TEMPLATES_DEBUG guarda la info de depuración de
+# cada nodo (la página de error de DEBUG); en producción va apagado.
+TEMPLATES_CACHED = os.environ.get("TEMPLATES_CACHED", "1") == "1"
+TEMPLATES_DEBUG = os.environ.get("TEMPLATES_DEBUG", "1" if DEBUG else "0") == "1"
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',  # reemplaza a APP_DIRS
+]
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -109,20 +176,59 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'debug': TEMPLATES_DEBUG,
+            'loaders': [('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS)] if TEMPLATES_CACHED else _TEMPLATE_LOADERS,
         },
     },
 ]
+# Warm-up del worker al cargar Main.wsgi / Main.asgi (Main/warmup.py)
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") == "1"
 
 WSGI_APPLICATION = 'Main.wsgi.application'
+ASGI_APPLICATION = 'Main.asgi.application'
+# Vistas async (httpx) para las páginas y endpoints que esperan a Stock/Logística.
+# Sólo rinden bajo ASGI (GUNICORN_WORKER_CLASS=uvicorn lo activa); bajo WSGI
+# cada una correría en su propio event loop.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
 
 # Database
+# Base de datos por entorno (Main/db_config.py): DATABASE_URL, conexiones
+# persistentes, pool de psycopg, statement timeout y SQLite en modo WAL.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': configuracion_db(os.environ, BASE_DIR),
+}
+# Cache (utils/cache.py): CACHE_BACKEND = locmem | file | redis. Con varios
+# workers conviene redis (o file en un solo nodo) para que las invalidaciones
+# por tag lleguen a todos los procesos; redis necesita `pip install redis`.
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+_CACHE_BACKENDS = {
+    "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tienda",
+               "OPTIONS": {"MAX_ENTRIES": 5000}},
+    "file": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+             "LOCATION": os.environ.get("CACHE_DIR", str(BASE_DIR / "cache"))},
+    "redis": {"BACKEND": "django.core.cache.backends.redis.RedisCache",
+              "LOCATION": os.environ.get("CACHE_URL", "redis://127.0.0.1:6379/0")},
+}
+CACHES = {
+    "default": {**_CACHE_BACKENDS[CACHE_BACKEND], "KEY_PREFIX": "tienda", "TIMEOUT": 300},
+}
+# TTL en segundos por dominio de cache
+CACHE_TTLS = {
+    "catalogo": int(os.environ.get("CACHE_TTL_CATALOGO", "60")),
+    "categorias": 600,
+    "transportes": 3600,
+    "pedidos": 30,
+    "paginas": int(os.environ.get("CACHE_TTL_PAGINAS", "60")),
 }
 
+# Réplica de lectura (Main/db_router.py): historial y listados de pedidos
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES['replica'] = configuracion_db(os.environ, BASE_DIR, url=os.environ["DATABASE_REPLICA_URL"])
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['Main.db_router.ReplicaRouter']
+# segundos que un cliente lee de la primaria después de escribir (read-your-writes)
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "5"))
+
 SECURE_SSL_REDIRECT = False
 
 # Password validation
@@ -143,6 +249,17 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# STATIC_HASHED=1 (imagen de Docker): collectstatic genera nombres con hash y
+# variantes .gz/.br (utils/static_storage.py) y {% static %} usa el manifest.
+# Sin collectstatic previo (runserver) dejarlo en 0.
+STATIC_HASHED = os.environ.get("STATIC_HASHED", "0") == "1"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "utils.static_storage.ManifestComprimido" if STATIC_HASHED
+        else "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -228,26 +345,40 @@ SPECTACULAR_SETTINGS = {
 
 SOCIALACCOUNT_ADAPTER = "apps.login.adapters.MySocialAccountAdapter"
 
-# Logging: enviar únicamente a consola (stdout) durante desarrollo
+# Logging: enviar únicamente a consola (stdout). Con LOG_ASYNC (por defecto)
+# la request sólo encola el registro y un hilo de fondo escribe de a lotes
+# (utils/logging_async.py); LOG_ASYNC=0 vuelve al StreamHandler sincrónico.
+LOG_ASYNC = os.environ.get("LOG_ASYNC", "1") == "1"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+# nivel de los módulos con logs de diagnóstico (inicio, stockApi)
+LOG_LEVEL_DIAGNOSTICO = os.environ.get("LOG_LEVEL_DIAGNOSTICO", "DEBUG" if DEBUG else "INFO")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        # request_id / user_id de la request en curso (utils/contexto_request.py)
+        "request_context": {"()": "Main.logging_filters.RequestContextFilter"},
+    },
     "formatters": {
-        "simple": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+        "simple": {"format": "%(asctime)s %(levelname)s %(name)s [%(request_id)s %(user_id)s] %(message)s"},
     },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            **({"()": "utils.logging_async.HandlerAsincrono"} if LOG_ASYNC else {"class": "logging.StreamHandler"}),
             "formatter": "simple",
+            "filters": ["request_context"],
             "stream": "ext://sys.stdout",
         },
     },
     "root": {
         "handlers": ["console"],
-        "level": "INFO",
+        "level": LOG_LEVEL,
     },
     "loggers": {
-        "apps.modulos.inicio": {"handlers": ["console"], "level": "DEBUG", "propagate": False},
-        "apps.apis.stockApi": {"handlers": ["console"], "level": "DEBUG", "propagate": False},
+        "apps.modulos.inicio": {"handlers": ["console"], "level": LOG_LEVEL_DIAGNOSTICO, "propagate": False},
+        "apps.apis.stockApi": {"handlers": ["console"], "level": LOG_LEVEL_DIAGNOSTICO, "propagate": False},
+        # httpx loguea cada request en INFO; la latencia de upstream ya va en la línea de la request
+        "httpx": {"level": "WARNING"},
     },
 }
\ No newline at end of file
@@ -0,0 +1,168 @@
+# Main/warmup.py
+"""Precalentamiento del worker antes de su primera request.
+
+Dos fases:
+
+- :func:`calentar` (``PASOS``): sólo memoria, sin abrir conexiones. Main/wsgi.py
+  y Main/asgi.py la llaman al crear la aplicación (con ``WARMUP_ENABLED``);
+  con ``gunicorn --preload`` corre una sola vez en el master y los workers la
+  heredan por fork (copy-on-write).
+- :func:`calentar_worker` (``PASOS_WORKER``): abre lo que no puede compartirse
+  entre procesos (conexión a la base, cliente del cache). Corre en cada
+  worker desde el hook ``post_worker_init`` de Main/gunicorn_conf.py.
+
+Cada paso es una función sin argumentos que devuelve un dict con lo que
+hizo; se mide cuánto tardó y un paso que falla se loguea sin impedir que el
+worker arranque.
+
+- ``urls``: importa el URLconf (y con él todas las vistas) y arma los
+  índices de reverse/resolve.
+- ``templates``: compila todos los templates que encuentran los loaders del
+  engine de Django. Con el loader cacheado (``TEMPLATES_CACHED``) quedan en
+  memoria y ningún render vuelve a leer ni parsear el archivo.
+- ``clientes``: instancia los clientes de Stock y Logística (codec JSON,
+  bulkhead del upstream en el registro) sin hacer requests.
+- ``cache`` / ``db`` (por worker): primera operación contra el cache y
+  chequeo de la base (abre la conexión y la cierra: cada hilo de requests
+  abre la suya).
+
+``python -m tools.importtime`` muestra cuánto tarda en importarse cada
+módulo al arrancar.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.template import engines
+from django.template.loaders.cached import Loader as LoaderCacheado
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES_TEMPLATE = (".html", ".txt")
+
+
+def _nombres_templates(loader) -> Iterator[str]:
+    for directorio in loader.get_dirs():
+        raiz = Path(directorio)
+        if not raiz.is_dir():
+            continue
+        for archivo in sorted(raiz.rglob("*")):
+            if archivo.suffix in EXTENSIONES_TEMPLATE and archivo.is_file():
+                yield archivo.relative_to(raiz).as_posix()
+
+
+def precargar_templates() -> Dict[str, Any]:
+    """Compila cada template una vez en el loader cacheado de cada engine."""
+    cargados, errores = 0, 0
+    for backend in engines.all():
+        engine = getattr(backend, "engine", None)
+        if engine is None:
+            continue  # backends que no son DjangoTemplates
+        cacheados = [loader for loader in engine.template_loaders if isinstance(loader, LoaderCacheado)]
+        if not cacheados:
+            continue  # TEMPLATES_CACHED=0: lo compilado no se guardaría
+        vistos = set()
+        for cacheado in cacheados:
+            for loader in cacheado.loaders:
+                for nombre in _nombres_templates(loader):
+                    if nombre in vistos:
+                        continue
+                    vistos.add(nombre)
+                    try:
+                        engine.get_template(nombre)
+                        cargados += 1
+                    except Exception as exc:
+                        # p. ej. templates de features de allauth que no están instaladas
+                        errores += 1
+                        logger.debug("warm-up: no se pudo compilar %s: %s", nombre, exc)
+    return {"templates": cargados, "errores": errores}
+
+
+def precargar_urls() -> Dict[str, Any]:
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # reverse_dict dispara el armado de los índices (incluye los includes con namespace)
+    return {"patrones": len(resolver.reverse_dict), "namespaces": len(resolver.namespace_dict)}
+
+
+def precargar_clientes() -> Dict[str, Any]:
+    from apps.apis.productoApi.client import ProductoAPIClient
+    from utils.apiCliente import LogisticsClient, StockClient
+    from utils.apiCliente.bulkhead import estado_bulkheads
+
+    clientes = [
+        StockClient(base_url=settings.STOCK_API_BASE_URL),
+        LogisticsClient(base_url=settings.LOGISTICA_API_BASE_URL),
+        ProductoAPIClient(),
+    ]
+    for cliente in clientes:
+        # la sesión todavía no abrió conexiones; cada request crea su cliente
+        cliente.session.close()
+    return {"clientes": len(clientes), "bulkheads": len(estado_bulkheads())}
+
+
+def conectar_cache() -> Dict[str, Any]:
+    from django.core.cache import caches
+
+    from utils.cache import DOMINIOS, dominio
+
+    caches["default"].get("warmup")
+    for nombre in DOMINIOS:
+        dominio(nombre)
+    return {"backend": settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]}
+
+
+def conectar_db() -> Dict[str, Any]:
+    from django.db import connections
+
+    # sólo verifica que la base responde al arrancar el worker: las conexiones
+    # son por hilo y con gthread/uvicorn ninguna request corre en este, así
+    # que se cierra enseguida para no retener un lugar del pool (DB_POOL_MAX)
+    try:
+        for alias in connections:
+            connections[alias].ensure_connection()
+    finally:
+        connections.close_all()
+    return {"alias": list(connections)}
+
+
+PASOS: List[Tuple[str, Callable[[], Dict[str, Any]]]] = [
+    ("urls", precargar_urls),
+    ("templates", precargar_templates),
+    ("clientes", precargar_clientes),
+]
+PASOS_WORKER: List[Tuple[str, Callable[[], Dict[str, Any]]]] = [
+    ("cache", conectar_cache),
+    ("db", conectar_db),
+]
+
+
+def _correr(pasos, etiqueta: str) -> Dict[str, Dict[str, Any]]:
+    resultados = {}
+    for nombre, paso in pasos:
+        inicio = time.perf_counter()
+        try:
+            resultado = paso()
+        except Exception:
+            logger.exception("warm-up: falló el paso %s", nombre)
+            resultado = {"error": True}
+        resultado["ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+        resultados[nombre] = resultado
+    logger.info("%s pid=%s: %s", etiqueta, os.getpid(), resultados)
+    return resultados
+
+
+def calentar() -> Dict[str, Dict[str, Any]]:
+    """Corre los pasos de ``PASOS`` en orden y devuelve el resultado y los ms de cada uno."""
+    return _correr(PASOS, "Warm-up")
+
+
+def calentar_worker() -> Dict[str, Dict[str, Any]]:
+    """Pasos que abren conexiones: después del fork, en cada worker."""
+    return _correr(PASOS_WORKER, "Warm-up del worker")
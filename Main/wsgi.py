@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Main.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402 - recién configurado por get_*_application
+
+if getattr(settings, "WARMUP_ENABLED", False):
+    from Main.warmup import calentar
+
+    calentar()
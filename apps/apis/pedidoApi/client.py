@@ -14,6 +14,7 @@ from typing import Any, Dict, Iterable, Optional
 
 from django.conf import settings
 
+from utils.apiCliente.asincrono import AsyncLogisticsClient
 from utils.apiCliente.base import BaseAPIClient
 from utils.apiCliente.logistica import LogisticsClient
 from utils.apiCliente.stock import StockClient
@@ -166,6 +167,13 @@ def obtener_cliente_logistica() -> LogisticsClient:
     return LogisticsClient(base_url=base_url)
 
 
+def obtener_cliente_logistica_async() -> AsyncLogisticsClient:
+    """Como :func:`obtener_cliente_logistica`, para vistas async."""
+    base_por_defecto = getattr(settings, "base_url_api", "http://localhost:8000/api/")
+    base_url = getattr(settings, "LOGISTICS_API_BASE_URL", base_por_defecto) or base_por_defecto
+    return AsyncLogisticsClient(base_url=base_url)
+
+
 def obtener_cliente_stock() -> StockClient:
     base_por_defecto = getattr(settings, "base_url_api", "http://localhost:8000/api/")
     base_url = getattr(settings, "STOCK_API_BASE_URL", base_por_defecto) or base_por_defecto
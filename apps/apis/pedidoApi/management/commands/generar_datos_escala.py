@@ -0,0 +1,250 @@
+"""Genera datos sintéticos a escala de producción (usuarios, pedidos, carritos, catálogo).
+
+    python manage.py generar_datos_escala --usuarios 200000 --pedidos 2000000 \\
+        --carritos 50000 --productos 20000 --catalogo-salida capturas/catalogo.json
+
+Todo sale de una semilla: misma semilla y mismos parámetros generan los
+mismos datos. Las filas se insertan con ``bulk_create`` en lotes de
+``--lote`` dentro de una transacción por lote, sin cargar todo en memoria.
+
+El catálogo se guarda como JSON con el formato de `tools/stub_services.py`
+(``--catalogo``), así el stub sirve exactamente los productos que aparecen en
+los pedidos generados.
+"""
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.apis.carritoApi.models import Carrito, ItemCarrito
+from apps.apis.pedidoApi.models import DetallePedido, DireccionEnvio, Pedido
+from tools.stub_services import generar_catalogo
+
+CIUDADES = [
+    ("Resistencia", "Chaco", "3500"),
+    ("Corrientes", "Corrientes", "3400"),
+    ("Córdoba", "Córdoba", "5000"),
+    ("Rosario", "Santa Fe", "2000"),
+    ("Mendoza", "Mendoza", "5500"),
+    ("La Plata", "Buenos Aires", "1900"),
+    ("Salta", "Salta", "4400"),
+    ("Neuquén", "Neuquén", "8300"),
+]
+CALLES = ["San Martín", "Belgrano", "Rivadavia", "Mitre", "Sarmiento", "Moreno", "Av. 9 de Julio", "Güemes"]
+TRANSPORTES = ["road", "air", "rail", "domicilio", "retiro_sucursal"]
+# distribución aproximada de estados en producción
+ESTADOS = [
+    (Pedido.Estado.CONFIRMADO, 70),
+    (Pedido.Estado.PENDIENTE, 15),
+    (Pedido.Estado.CANCELADO, 10),
+    (Pedido.Estado.BORRADOR, 5),
+]
+
+
+def _rango(valor):
+    """'1-5' -> (1, 5); '3' -> (3, 3)."""
+    minimo, _, maximo = str(valor).partition("-")
+    minimo, maximo = int(minimo), int(maximo or minimo)
+    if minimo < 0 or maximo < minimo:
+        raise ValueError(valor)
+    return minimo, maximo
+
+
+@contextmanager
+def fechas_manuales(*modelos):
+    """Desactiva auto_now/auto_now_add para poder repartir fechas en el pasado."""
+    originales = []
+    for modelo in modelos:
+        for campo in modelo._meta.concrete_fields:
+            if isinstance(campo, models.DateField) and (campo.auto_now or campo.auto_now_add):
+                originales.append((campo, campo.auto_now, campo.auto_now_add))
+                campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in originales:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Genera usuarios, pedidos, detalles, direcciones, carritos y un catálogo sintético con bulk_create."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--usuarios", type=int, default=1000)
+        parser.add_argument("--pedidos", type=int, default=10000)
+        parser.add_argument("--detalles-por-pedido", default="1-5", help="rango MIN-MAX de ítems por pedido")
+        parser.add_argument("--carritos", type=int, default=500, help="carritos abiertos (uno por usuario)")
+        parser.add_argument("--items-por-carrito", default="1-4")
+        parser.add_argument("--productos", type=int, default=5000, help="tamaño del catálogo sintético")
+        parser.add_argument("--dias", type=int, default=365, help="antigüedad máxima de los pedidos")
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--lote", type=int, default=5000, help="filas por bulk_create / transacción")
+        parser.add_argument("--prefijo", default="escala", help="prefijo de los usernames generados")
+        parser.add_argument("--catalogo-salida", help="guardar el catálogo en este JSON (para stub_services --catalogo)")
+
+    def handle(self, *args, **opciones):
+        try:
+            self.detalles_rango = _rango(opciones["detalles_por_pedido"])
+            self.items_rango = _rango(opciones["items_por_carrito"])
+        except ValueError as exc:
+            raise CommandError(f"Rango inválido: {exc}")
+        if self.detalles_rango[0] < 1:
+            raise CommandError("Cada pedido necesita al menos un detalle")
+        if opciones["carritos"] > opciones["usuarios"]:
+            raise CommandError("--carritos no puede superar a --usuarios (un carrito por usuario)")
+
+        Usuario = get_user_model()
+        self.prefijo = opciones["prefijo"]
+        if Usuario.objects.filter(username__startswith=f"{self.prefijo}-").exists():
+            raise CommandError(f"Ya hay usuarios '{self.prefijo}-*'; usá otro --prefijo")
+        if getattr(settings, "LIMPIAR_PEDIDOS_AL_INICIAR", False):
+            self.stderr.write(self.style.WARNING(
+                "LIMPIAR_PEDIDOS_AL_INICIAR está activo: los pedidos generados se borran al reiniciar el servidor"
+            ))
+
+        self.rng = random.Random(opciones["semilla"])
+        self.lote = max(1, opciones["lote"])
+        self.ahora = timezone.now()
+        self.dias = max(1, opciones["dias"])
+        inicio = time.perf_counter()
+
+        self.catalogo = generar_catalogo(opciones["productos"], opciones["semilla"])
+        if opciones["catalogo_salida"]:
+            ruta = Path(opciones["catalogo_salida"])
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_text(json.dumps(self.catalogo, ensure_ascii=False), encoding="utf-8")
+            self.stdout.write(f"Catálogo de {len(self.catalogo)} productos en {ruta}")
+
+        with fechas_manuales(Usuario, DireccionEnvio, Pedido, DetallePedido, Carrito, ItemCarrito):
+            ids_usuarios = self._generar_usuarios(Usuario, opciones["usuarios"])
+            self._generar_pedidos(opciones["pedidos"], ids_usuarios)
+            self._generar_carritos(ids_usuarios[:opciones["carritos"]])
+
+        self.stdout.write(self.style.SUCCESS(f"Datos generados en {time.perf_counter() - inicio:.1f} s"))
+
+    # ------------------------------------------------------------------
+    def _fecha(self):
+        return self.ahora - timedelta(seconds=self.rng.randrange(self.dias * 86400))
+
+    def _lotes(self, total):
+        for desde in range(0, total, self.lote):
+            yield desde, min(self.lote, total - desde)
+
+    def _progreso(self, etiqueta, hechos, total):
+        self.stdout.write(f"  {etiqueta}: {hechos}/{total}")
+
+    def _generar_usuarios(self, Usuario, total):
+        # un solo hash para todos: hashear millones de contraseñas tardaría horas
+        password = make_password(f"{self.prefijo}.12345")
+        for desde, cantidad in self._lotes(total):
+            usuarios = []
+            for n in range(desde, desde + cantidad):
+                alta = self._fecha()
+                usuarios.append(Usuario(
+                    username=f"{self.prefijo}-{n}",
+                    email=f"{self.prefijo}-{n}@example.com",
+                    password=password,
+                    first_name=f"Nombre{n}",
+                    last_name=f"Apellido{n}",
+                    date_joined=alta,
+                    fecha_registro=alta,
+                ))
+            with transaction.atomic():
+                Usuario.objects.bulk_create(usuarios, batch_size=self.lote)
+            self._progreso("usuarios", desde + cantidad, total)
+        # pks en orden de creación (no todos los backends los devuelven en bulk_create)
+        return list(
+            Usuario.objects.filter(username__startswith=f"{self.prefijo}-").order_by("pk").values_list("pk", flat=True)
+        )
+
+    def _generar_pedidos(self, total, ids_usuarios):
+        estados = [e for e, _ in ESTADOS]
+        pesos = [p for _, p in ESTADOS]
+        for desde, cantidad in self._lotes(total):
+            direcciones, pedidos, detalles_por_pedido = [], [], []
+            for n in range(desde, desde + cantidad):
+                ciudad, provincia, cp = self.rng.choice(CIUDADES)
+                usuario_id = self.rng.choice(ids_usuarios) if ids_usuarios else None
+                creado = self._fecha()
+                direcciones.append(DireccionEnvio(
+                    usuario_id=usuario_id,
+                    nombre_receptor=f"Cliente {usuario_id or n}",
+                    calle=f"{self.rng.choice(CALLES)} {self.rng.randint(1, 5000)}",
+                    ciudad=ciudad,
+                    provincia=provincia,
+                    codigo_postal=cp,
+                    telefono=f"362{self.rng.randint(1000000, 9999999)}",
+                    creado_en=creado,
+                    actualizado_en=creado,
+                ))
+                detalles = []
+                for _ in range(self.rng.randint(*self.detalles_rango)):
+                    producto = self.rng.choice(self.catalogo)
+                    detalles.append(DetallePedido(
+                        producto_id=producto["id"],
+                        nombre_producto=producto["nombre"],
+                        cantidad=self.rng.randint(1, 3),
+                        precio_unitario=Decimal(str(producto["precio"])),
+                        creado_en=creado,
+                        actualizado_en=creado,
+                    ))
+                estado = self.rng.choices(estados, weights=pesos)[0]
+                confirmado = estado == Pedido.Estado.CONFIRMADO
+                pedidos.append(Pedido(
+                    usuario_id=usuario_id,
+                    estado=estado,
+                    tipo_transporte=self.rng.choice(TRANSPORTES),
+                    total=sum((d.precio_total for d in detalles), Decimal("0.00")),
+                    referencia_envio=f"TRK-{n}" if confirmado else "",
+                    referencia_reserva_stock=str(n) if confirmado else "",
+                    confirmado_en=creado + timedelta(minutes=5) if confirmado else None,
+                    creado_en=creado,
+                    actualizado_en=creado,
+                ))
+                detalles_por_pedido.append(detalles)
+
+            # SQLite y PostgreSQL devuelven los pks en bulk_create, así se pueden encadenar las FKs
+            with transaction.atomic():
+                DireccionEnvio.objects.bulk_create(direcciones, batch_size=self.lote)
+                for pedido, direccion in zip(pedidos, direcciones):
+                    pedido.direccion_envio = direccion
+                Pedido.objects.bulk_create(pedidos, batch_size=self.lote)
+                filas = []
+                for pedido, detalles in zip(pedidos, detalles_por_pedido):
+                    for detalle in detalles:
+                        detalle.pedido = pedido
+                        filas.append(detalle)
+                DetallePedido.objects.bulk_create(filas, batch_size=self.lote)
+            self._progreso("pedidos", desde + cantidad, total)
+
+    def _generar_carritos(self, ids_usuarios):
+        total = len(ids_usuarios)
+        for desde, cantidad in self._lotes(total):
+            carritos, items_por_carrito = [], []
+            for usuario_id in ids_usuarios[desde:desde + cantidad]:
+                creado = self._fecha()
+                carritos.append(Carrito(usuario_id=usuario_id, creado_en=creado, actualizado_en=creado))
+                productos = self.rng.sample(self.catalogo, min(len(self.catalogo), self.rng.randint(*self.items_rango)))
+                items_por_carrito.append([
+                    ItemCarrito(producto_id=p["id"], cantidad=self.rng.randint(1, 3), agregado_en=creado)
+                    for p in productos
+                ])
+            with transaction.atomic():
+                Carrito.objects.bulk_create(carritos, batch_size=self.lote)
+                filas = []
+                for carrito, items in zip(carritos, items_por_carrito):
+                    for item in items:
+                        item.carrito = carrito
+                        filas.append(item)
+                ItemCarrito.objects.bulk_create(filas, batch_size=self.lote)
+            self._progreso("carritos", desde + cantidad, total)
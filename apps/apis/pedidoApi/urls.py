@@ -1,8 +1,16 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import PedidoViewSet
+from .views import PedidoViewSet, tracking_async
 
 router = DefaultRouter()
 router.register(r'pedidos', PedidoViewSet, basename='pedido')
 
 urlpatterns = router.urls
+
+if settings.ASYNC_VIEWS:
+    # antes que las rutas del router: las dos acciones de tracking comparten URL
+    urlpatterns = [
+        path('pedidos/<str:pk>/tracking/', tracking_async, name='pedido-tracking-async'),
+    ] + urlpatterns
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
+from Main.db_router import lectura_en_replica
 from utils.apiCliente import APIError
 
 from apps.apis.carritoApi.models import Carrito
 from apps.apis.carritoApi.client import obtener_cliente_carrito
 
-from .client import obtener_cliente_logistica, obtener_cliente_stock
+from .client import obtener_cliente_logistica, obtener_cliente_logistica_async, obtener_cliente_stock
 from .models import Pedido, DireccionEnvio, DetallePedido
 from .serializer import PedidoSerializer
 
@@ -231,6 +236,7 @@ class PedidoViewSet(viewsets.ModelViewSet):
         )
 
     @action(detail=False, methods=["get"], url_path="history")
+    @lectura_en_replica
     def history(self, request):
         """GET /api/shopcart/history - Ver historial de pedidos del usuario autenticado"""
         queryset = self.get_queryset()  # Ya está filtrado por usuario en get_queryset
@@ -238,6 +244,7 @@ class PedidoViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["get"], url_path="history-detail")
+    @lectura_en_replica
     def history_detail(self, request, pk=None):
         """GET /api/shopcart/history/{id} - Ver un pedido específico"""
         try:
@@ -446,3 +453,49 @@ class PedidoViewSet(viewsets.ModelViewSet):
                 )
 
         return Response({"tracking": data, "pedido_id": pedido.id}, status=status.HTTP_200_OK)
+
+
+# Con ASYNC_VIEWS, GET /api/pedidos/{id}/tracking/ espera a Logística en el
+# event loop en vez de ocupar un hilo; el POST (crea el tracking y guarda la
+# referencia) sigue por el ViewSet.
+_tracking_sync = sync_to_async(
+    PedidoViewSet.as_view({"post": "crear_tracking"}, detail=True, basename="pedido")
+)
+
+
+@csrf_exempt
+async def tracking_async(request, pk):
+    """Versión async de ``PedidoViewSet.obtener_tracking`` (mismas respuestas)."""
+    if request.method != "GET":
+        return await _tracking_sync(request, pk=pk)
+
+    # mismo filtro que PedidoViewSet.get_queryset
+    usuario = await request.auser()
+    pedidos = Pedido.objects.all()
+    if usuario.is_authenticated and not usuario.is_staff:
+        pedidos = pedidos.filter(usuario=usuario)
+    try:
+        pedido = await pedidos.aget(pk=pk)
+    except (Pedido.DoesNotExist, ValueError, TypeError, ValidationError):
+        return JsonResponse({"detail": "No Pedido matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+
+    if not pedido.referencia_envio:
+        return JsonResponse(
+            {"error": "El pedido no tiene tracking asociado", "code": "NO_TRACKING"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    cliente_logistica = obtener_cliente_logistica_async()
+    tracking_id = pedido.referencia_envio
+    try:
+        data = await cliente_logistica.get_tracking(int(tracking_id))
+    except APIError:
+        try:
+            data = await cliente_logistica.get_shipment(int(tracking_id))
+        except APIError as exc2:
+            return JsonResponse(
+                {"error": "Error al obtener el tracking", "code": "EXTERNAL_SERVICE_ERROR", "detail": str(exc2)},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
+    return JsonResponse({"tracking": data, "pedido_id": pedido.id}, status=status.HTTP_200_OK)
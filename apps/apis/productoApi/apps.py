@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InicioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.apis.productoApi'
+
+    def ready(self):
+        import apps.apis.productoApi.signals
@@ -10,10 +10,11 @@ consume estos recursos.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from django.conf import settings
 
+from utils.apiCliente.asincrono import AsyncClientMixin, SinStreaming
 from utils.apiCliente.base import BaseAPIClient
 
 
@@ -23,7 +24,7 @@ class ProductoAPIClient(BaseAPIClient):
     El contrato implementado por esta clase replica los endpoints
     disponibles en ``apps.apis.productoApi.views.ProductoViewSet``:
 
-    - ``GET /productos/``         → :meth:`listar_productos`
+    - ``GET /productos/``         → :meth:`listar_productos` / :meth:`iterar_productos`
     - ``GET /productos/{id}/``    → :meth:`obtener_producto`
 
     Parameters
@@ -73,20 +74,39 @@ class ProductoAPIClient(BaseAPIClient):
         marca: Optional[str] = None,
     ) -> Any:
         """Obtiene el listado paginado de productos disponibles."""
-        params: Dict[str, Any] = {}
-        if page is not None:
-            params["page"] = page
-        if limit is not None:
-            params["limit"] = limit
-        if search:
-            params["search"] = search
-        if categoria:
-            params["categoria"] = categoria
-        if marca:
-            params["marca"] = marca
-
+        params = self._parametros_listado(page=page, limit=limit, search=search, categoria=categoria, marca=marca)
         return self.get("/api/product/", params=params or None, expected_status=200)
 
+    def iterar_productos(
+        self,
+        *,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        search: Optional[str] = None,
+        categoria: Optional[str] = None,
+        marca: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Versión streaming de :meth:`listar_productos`.
+
+        Produce los productos del arreglo ``data`` a medida que se parsean,
+        útil para listados grandes (``limit=5000``) donde no hace falta la
+        metadata de paginación.
+        """
+        params = self._parametros_listado(page=page, limit=limit, search=search, categoria=categoria, marca=marca)
+        return self.iter_get("/api/product/", params=params or None, key="data", expected_status=200)
+
+    @staticmethod
+    def _parametros_listado(**filtros: Any) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        if filtros.get("page") is not None:
+            params["page"] = filtros["page"]
+        if filtros.get("limit") is not None:
+            params["limit"] = filtros["limit"]
+        for nombre in ("search", "categoria", "marca"):
+            if filtros.get(nombre):
+                params[nombre] = filtros[nombre]
+        return params
+
     def obtener_producto(self, producto_id: int, *, parametros_extra: Optional[Dict[str, Any]] = None) -> Any:
         """Recupera el detalle de un producto específico."""
         params = parametros_extra if parametros_extra else None
@@ -98,3 +118,9 @@ def obtener_cliente_productos(**kwargs: Any) -> ProductoAPIClient:
     base_por_defecto = getattr(settings, "base_url_api", "http://localhost:8000/api/")
     base_url = getattr(settings, "PRODUCTOS_API_BASE_URL", base_por_defecto) or base_por_defecto
     return ProductoAPIClient(base_url=base_url, **kwargs)
+
+
+class AsyncProductoAPIClient(AsyncClientMixin, ProductoAPIClient):
+    """:class:`ProductoAPIClient` con transporte async (httpx) para vistas async."""
+
+    iterar_productos = SinStreaming()
@@ -0,0 +1,28 @@
+"""Invalida lo cacheado de la tienda cuando cambia el catálogo local.
+
+Los cambios de productos en Stock no pasan por acá: se invalidan con
+``python manage.py invalidar_catalogo`` (o ``invalidar_tags("catalogo")``
+desde el webhook que los reciba).
+
+Con un cache por proceso (locmem) la invalidación sólo llega al worker que
+guardó; los demás esperan el TTL. Por eso se loguea una advertencia.
+"""
+import logging
+import os
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from utils.cache import TAG_CATALOGO, cache_compartido, invalidar_tags
+
+from .models import Categoria
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=Categoria)
+def invalidar_catalogo(sender, **kwargs):
+    invalidar_tags(TAG_CATALOGO)
+    if not cache_compartido():
+        logger.warning("Catálogo invalidado sólo en el proceso %s: el cache no es compartido entre workers",
+                       os.getpid())
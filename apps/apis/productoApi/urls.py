@@ -1,9 +1,16 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import ProductoViewSet
+from .views import ProductoViewSet, producto_detail_async, producto_list_async
 
 router = DefaultRouter()
 router.register(r'product', ProductoViewSet, basename='producto')
 
 urlpatterns = router.urls
 
-
+if settings.ASYNC_VIEWS:
+    # mismos nombres que las rutas del router, que quedan detrás
+    urlpatterns = [
+        path('product/', producto_list_async, name='producto-list'),
+        path('product/<str:pk>/', producto_detail_async, name='producto-detail'),
+    ] + urlpatterns
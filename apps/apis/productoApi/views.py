@@ -5,7 +5,11 @@ from .models import Categoria
 from .serializer import CategoriaSerializer
 from rest_framework import status
 from utils.apiCliente.stock import StockClient
+from utils.apiCliente.asincrono import AsyncStockClient
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
 import math
 
 
@@ -1083,3 +1087,65 @@ class ProductoViewSet(viewsets.ViewSet):
                 "error": "Error interno del servidor",
                 "code": "INTERNAL_ERROR"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ============================
+# Vistas async (ASYNC_VIEWS)
+# ============================
+# Bajo ASGI las vistas de DRF corren en un hilo por request y ese hilo queda
+# bloqueado mientras Stock responde. Estas versiones hacen la llamada en el
+# event loop en modo real; el mock y los demás métodos siguen por el ViewSet.
+
+_producto_list_sync = sync_to_async(ProductoViewSet.as_view({"get": "list"}))
+_producto_detail_sync = sync_to_async(ProductoViewSet.as_view({"get": "retrieve"}))
+
+
+def _error_stock(exc):
+    if 'Connection' in str(exc):
+        return JsonResponse({
+            "error": "Servicio Stock no disponible",
+            "code": "STOCK_SERVICE_UNAVAILABLE"
+        }, status=status.HTTP_502_BAD_GATEWAY)
+    return JsonResponse({
+        "error": "Error interno del servidor",
+        "code": "INTERNAL_ERROR"
+    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@csrf_exempt
+async def producto_list_async(request):
+    """GET /api/product/ - igual que ``ProductoViewSet.list``."""
+    if request.method != "GET" or getattr(settings, "USE_MOCK_APIS", True):
+        return await _producto_list_sync(request)
+
+    stock_client = AsyncStockClient(base_url=settings.STOCK_API_BASE_URL)
+    try:
+        categoria = request.GET.get('categoria')
+        productos = await stock_client.listar_productos(
+            page=int(request.GET.get('page', 1)),
+            limit=int(request.GET.get('limit', 20)),
+            q=request.GET.get('search'),
+            categoriaId=int(categoria) if categoria else None
+        )
+    except Exception as e:
+        return _error_stock(e)
+    return JsonResponse(productos, status=status.HTTP_200_OK, safe=False)
+
+
+@csrf_exempt
+async def producto_detail_async(request, pk):
+    """GET /api/product/{id}/ - igual que ``ProductoViewSet.retrieve``."""
+    if request.method != "GET" or getattr(settings, "USE_MOCK_APIS", True):
+        return await _producto_detail_sync(request, pk=pk)
+
+    stock_client = AsyncStockClient(base_url=settings.STOCK_API_BASE_URL)
+    try:
+        producto = await stock_client.obtener_producto(int(pk))
+    except Exception as e:
+        return _error_stock(e)
+    if not producto:
+        return JsonResponse({
+            "error": "Producto no encontrado",
+            "code": "PRODUCT_NOT_FOUND"
+        }, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse(producto, status=status.HTTP_200_OK, safe=False)
@@ -0,0 +1,26 @@
+"""Descarta listados, páginas y fragmentos de la tienda cacheados.
+
+    python manage.py invalidar_catalogo
+
+Para usar después de cambios de productos o precios en Stock. Con un cache
+por proceso (CACHE_BACKEND=locmem) el comando sólo vería su propio proceso,
+así que falla: los workers esperarían el TTL (CACHE_TTL_CATALOGO /
+CACHE_TTL_PAGINAS) sin enterarse.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.cache import TAG_CATALOGO, cache_compartido, invalidar_tags
+
+
+class Command(BaseCommand):
+    help = "Invalida todo lo cacheado que depende del catálogo de Stock."
+
+    def handle(self, *args, **opciones):
+        if not cache_compartido():
+            raise CommandError(
+                f"El cache ({settings.CACHES['default']['BACKEND']}) es por proceso: invalidar desde acá "
+                "no afecta a los workers. Usar CACHE_BACKEND=file o redis."
+            )
+        invalidar_tags(TAG_CATALOGO)
+        self.stdout.write(f"Tag '{TAG_CATALOGO}' invalidado.")
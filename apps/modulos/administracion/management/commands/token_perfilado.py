@@ -0,0 +1,17 @@
+"""Imprime un valor firmado para el header X-Profile.
+
+    curl -H "X-Profile: $(python manage.py token_perfilado)" https://tienda/...
+
+La request queda perfilada aunque no sea de un usuario staff; el token vence
+a las PROFILING_HEADER_MAX_AGE segundos.
+"""
+from django.core.management.base import BaseCommand
+
+from Main.middleware_profiling import firmar_token
+
+
+class Command(BaseCommand):
+    help = "Genera el token firmado del header X-Profile para perfilar una request."
+
+    def handle(self, *args, **opciones):
+        self.stdout.write(firmar_token())
@@ -11,6 +11,14 @@ class Usuario(AbstractUser):
     fecha_nacimiento = models.DateField(blank=True, null=True)
     fecha_registro = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        if self.username or not self._state.adding:
+            return super().save(*args, **kwargs)
+        # el username lo genera login.signals en pre_save, que reintenta si choca
+        from apps.modulos.login.signals import guardar_con_username_generado
+
+        return guardar_con_username_generado(self, lambda: super(Usuario, self).save(*args, **kwargs))
+
     def __str__(self):
         return (
             f"username='{self.username}', "
@@ -26,3 +34,7 @@ class Usuario(AbstractUser):
         db_table = "usuario"
         verbose_name = "Usuario"
         verbose_name_plural = "Usuarios"
+        indexes = [
+            # login y registro buscan por email; username ya es único (indexado)
+            models.Index(fields=["email"], name="usuario_email_idx"),
+        ]
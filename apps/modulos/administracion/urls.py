@@ -10,4 +10,14 @@ urlpatterns = [
     path('reportes/', views.administracion_view, name='admin_reportes'),
     path('configuracion/', views.administracion_view, name='admin_config'),
     path('transacciones/', views.administracion_view, name='admin_transacciones'),
+
+    # Inspección de usuarios (JSON, keyset)
+    path('usuarios/', views.admin_usuarios, name='admin_usuarios'),
+
+    # Métricas de cache (JSON)
+    path('cache/', views.admin_cache, name='admin_cache'),
+
+    # Perfiles de requests
+    path('perfiles/', views.admin_perfiles, name='admin_perfiles'),
+    path('perfiles/<str:perfil_id>/', views.admin_perfil_detalle, name='admin_perfil_detalle'),
 ]
@@ -1,3 +1,7 @@
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required, user_passes_test
@@ -5,6 +9,11 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 
+from utils.cache import metricas as metricas_cache
+from utils.perfilador import cargar_perfil, listar_perfiles
+
+from .models import Usuario
+
 
 # =======================
 #   Función auxiliar
@@ -80,3 +89,94 @@ def admin_transacciones(request):
     ctx = _dashboard_context()
     return render(request, 'inicio_admin.html', ctx)
 
+
+
+# =======================
+#   Perfiles de requests (Main/middleware_profiling.py)
+# =======================
+
+def _es_staff(user):
+    return user.is_authenticated and user.is_staff
+
+
+@user_passes_test(_es_staff, login_url="login:login")
+def admin_perfiles(request):
+    """
+    Índice de los perfiles guardados por ProfilingMiddleware.
+    """
+    perfiles = listar_perfiles(getattr(settings, "PROFILING_DIR", "perfiles"))
+    return render(request, 'perfiles_admin.html', {
+        "perfiles": perfiles,
+        "perfilado_activo": getattr(settings, "PROFILING_ENABLED", False),
+    })
+
+
+@user_passes_test(_es_staff, login_url="login:login")
+def admin_perfil_detalle(request, perfil_id):
+    """
+    Top de funciones de un perfil; con ?formato=colapsado devuelve las pilas
+    en texto plano para flamegraph.pl o speedscope.
+    """
+    perfil = cargar_perfil(getattr(settings, "PROFILING_DIR", "perfiles"), perfil_id)
+    if perfil is None:
+        raise Http404("Perfil inexistente")
+    if request.GET.get("formato") == "colapsado":
+        respuesta = HttpResponse("\n".join(perfil["pilas"]) + "\n", content_type="text/plain; charset=utf-8")
+        respuesta["Content-Disposition"] = f'attachment; filename="{perfil_id}.txt"'
+        return respuesta
+    return render(request, 'perfil_detalle_admin.html', {"perfil": perfil})
+
+
+# =======================
+#   Inspección de usuarios
+# =======================
+
+USUARIOS_POR_PAGINA = 50
+USUARIOS_POR_PAGINA_MAX = 200
+
+
+@user_passes_test(_es_staff, login_url="login:login")
+def admin_usuarios(request):
+    """
+    Listado de usuarios para diagnóstico, paginado por keyset sobre el pk.
+
+    GET ?despues=<id>&limite=50&username=<prefijo>&email=<exacto>
+    Sin COUNT(*) ni OFFSET. Sin filtros o con ``email`` cada página lee sólo
+    sus filas (índice de pk o de email). Con ``username`` se recorre el pk
+    descartando las filas que no empiezan con el prefijo: un prefijo poco
+    común puede leer gran parte de la tabla para llenar una página.
+    """
+    try:
+        despues = int(request.GET.get("despues", 0))
+        limite = min(max(int(request.GET.get("limite", USUARIOS_POR_PAGINA)), 1), USUARIOS_POR_PAGINA_MAX)
+    except ValueError:
+        return JsonResponse({"error": "despues y limite deben ser enteros"}, status=400)
+
+    usuarios = Usuario.objects.filter(pk__gt=despues)
+    if request.GET.get("username"):
+        usuarios = usuarios.filter(username__startswith=request.GET["username"])
+    if request.GET.get("email"):
+        usuarios = usuarios.filter(email=request.GET["email"])
+    filas = list(
+        usuarios.order_by("pk").values(
+            "id", "username", "email", "is_staff", "is_active", "date_joined", "last_login",
+        )[:limite + 1]
+    )
+    siguiente = filas[limite - 1]["id"] if len(filas) > limite else None
+    return JsonResponse({"results": filas[:limite], "siguiente": siguiente})
+
+
+# =======================
+#   Métricas de cache (utils/cache.py)
+# =======================
+
+@user_passes_test(_es_staff, login_url="login:login")
+def admin_cache(request):
+    """
+    Hits, misses, sets e invalidaciones por dominio de cache en este proceso.
+    """
+    return JsonResponse({
+        "backend": settings.CACHES["default"]["BACKEND"],
+        "pid": os.getpid(),
+        "dominios": metricas_cache.resumen(),
+    })
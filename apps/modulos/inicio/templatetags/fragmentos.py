@@ -0,0 +1,40 @@
+"""Cache de fragmentos de la tienda, invalidado junto con el catálogo.
+
+    {% load fragmentos %}
+    {% fragmento_cache "grilla" clave_grilla %} ... {% endfragmento_cache %}
+
+A diferencia de ``{% cache %}`` de Django, los fragmentos quedan en el
+dominio ``paginas`` de :mod:`utils.cache` con el tag del catálogo, así que
+``invalidar_tags("catalogo")`` los descarta junto con los listados. El
+contenido no puede depender del usuario: se comparte entre todos. Si una
+variable de la clave es ``None`` el fragmento se renderiza sin cachear.
+"""
+from django import template
+
+from utils.cache import TAG_CATALOGO, dominio
+
+register = template.Library()
+
+
+class FragmentoCacheNode(template.Node):
+    def __init__(self, nodelist, nombre, partes):
+        self.nodelist = nodelist
+        self.nombre = nombre
+        self.partes = partes
+
+    def render(self, context):
+        partes = [parte.resolve(context) for parte in self.partes]
+        if any(parte is None for parte in partes):
+            return self.nodelist.render(context)
+        clave = ("fragmento", self.nombre.resolve(context), partes)
+        return dominio("paginas").get_or_set(clave, lambda: self.nodelist.render(context), tags=[TAG_CATALOGO])
+
+
+@register.tag("fragmento_cache")
+def fragmento_cache(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' necesita un nombre y al menos una variable de la clave.")
+    nodelist = parser.parse(("endfragmento_cache",))
+    parser.delete_first_token()
+    return FragmentoCacheNode(nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(b) for b in bits[2:]])
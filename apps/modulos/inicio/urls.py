@@ -1,9 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from apps.modulos.inicio import views
 
 urlpatterns = [
    # path('QR/', views.AnalisisQR, name='AnalizarQR'),
 
-    path('', views.inicio_view, name='inicio'),
+    path('', views.inicio_view_async if settings.ASYNC_VIEWS else views.inicio_view, name='inicio'),
     
 ]
@@ -1,8 +1,12 @@
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
 import logging
+from urllib.parse import urlencode
 from time import perf_counter
-from apps.apis.productoApi.client import ProductoAPIClient
+from asgiref.sync import sync_to_async
+from apps.apis.productoApi.client import AsyncProductoAPIClient, ProductoAPIClient
 import unicodedata
+from utils.cache import TAG_CATALOGO, dominio, pagina_anonima
 
 logger = logging.getLogger(__name__)
 
@@ -37,89 +41,169 @@ def normalize(text):
     return text
 
 
-def inicio_view(request):
-    """Obtiene productos desde la API de Stock (sin datos hardcodeados)."""
-    logger.info("inicio_view llamada: user=%s path=%s", getattr(request, "user", None), request.get_full_path())
+# parámetros de la tienda: la página depende sólo de estos (el resto se ignora)
+PARAMETROS_FILTRO = ("busqueda", "categoria", "marca", "precio_minimo", "precio_maximo")
 
-    # parámetros de filtros y paginación
-    termino_busqueda = request.GET.get("busqueda", "").strip()
-    categoria_filtrada = request.GET.get("categoria", "").strip()
-    marca_filtrada = request.GET.get("marca", "").strip()
-    precio_minimo = request.GET.get("precio_minimo", "").strip()
-    precio_maximo = request.GET.get("precio_maximo", "").strip()
-    try:
-        page = int(request.GET.get("page", 1))
-        if page < 1:
-            page = 1
-    except Exception:
-        page = 1
+
+def _entero_positivo(valor, defecto):
     try:
-        limit = int(request.GET.get("limit", 18))
-        if limit < 1:
-            limit = 18
+        numero = int(valor if valor is not None else defecto)
     except Exception:
-        limit = 18
+        return defecto
+    return numero if numero >= 1 else defecto
 
-    productos = []
-    pagination_context = {}
+
+def filtros_desde_request(request):
+    """Filtros y paginación normalizados; también son la clave de cache de la página."""
+    filtros = {nombre: request.GET.get(nombre, "").strip() for nombre in PARAMETROS_FILTRO}
+    filtros["page"] = _entero_positivo(request.GET.get("page"), 1)
+    filtros["limit"] = _entero_positivo(request.GET.get("limit"), 18)
+    return filtros
+
+
+def url_canonica(request, filtros):
+    """URL absoluta de la página armada sólo con los filtros normalizados.
+
+    Va en og:url de la página cacheada: con ``build_absolute_uri`` quedaría
+    la URL del primer visitante (utm_*, parámetros repetidos) para todos.
+    """
+    parametros = {nombre: filtros[nombre] for nombre in PARAMETROS_FILTRO if filtros[nombre]}
+    if filtros["page"] != 1:
+        parametros["page"] = filtros["page"]
+    if filtros["limit"] != 18:
+        parametros["limit"] = filtros["limit"]
+    url = request.build_absolute_uri(request.path)
+    return f"{url}?{urlencode(parametros)}" if parametros else url
+
+
+def _consultar_productos(termino_busqueda):
+    """Trae y normaliza los productos de Stock; los errores se propagan (y no se cachean)."""
     start = perf_counter()
-    try:
-        client = ProductoAPIClient(base_url="http://localhost:8000")
-        
-        logger.debug("Llamando a StockClient.listar_productos con limit=5000 para obtener todos los resultados filtrados=%s", {
-            "busqueda": termino_busqueda,
-            "categoria": categoria_filtrada,
-            "marca": marca_filtrada,
-        })
-        
-        # Una sola llamada: traer muchos productos para aplicar filtros y paginar localmente
-        resultado = client.listar_productos(
-            page=1, 
-            limit=5000,
-            search=termino_busqueda,
-        )
-        
+    client = ProductoAPIClient(base_url="http://localhost:8000")
 
-        elapsed = perf_counter() - start
-        logger.info("Stock API listar_productos respondió en %.3fs", elapsed)
-        if isinstance(resultado, dict) and "data" in resultado:
-            productos_raw = resultado.get("data") or []
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Llamando a StockClient.listar_productos con limit=5000 para obtener todos los resultados busqueda=%s", termino_busqueda)
+
+    # Una sola llamada: traer muchos productos para aplicar filtros y paginar localmente
+    resultado = client.listar_productos(
+        page=1,
+        limit=5000,
+        search=termino_busqueda,
+    )
+
+    logger.info("Stock API listar_productos respondió en %.3fs", perf_counter() - start)
+    return _normalizar_productos(resultado)
+
+
+async def _consultar_productos_async(termino_busqueda):
+    """Como :func:`_consultar_productos`, sin ocupar un hilo mientras Stock responde."""
+    start = perf_counter()
+    client = AsyncProductoAPIClient(base_url="http://localhost:8000")
+    resultado = await client.listar_productos(page=1, limit=5000, search=termino_busqueda)
+    logger.info("Stock API listar_productos (async) respondió en %.3fs", perf_counter() - start)
+    return _normalizar_productos(resultado)
+
+
+def _normalizar_productos(resultado):
+    if isinstance(resultado, dict) and "data" in resultado:
+        productos_raw = resultado.get("data") or []
+    else:
+        if resultado is None:
+            logger.warning("Stock API devolvió None en listar_productos")
+        elif not isinstance(resultado, list):
+            logger.warning("Formato inesperado de respuesta de Stock API: %s", type(resultado))
+        productos_raw = resultado or []
+
+    productos = []
+    for p in productos_raw:
+        categoria = None
+        if isinstance(p.get("categoria"), dict):
+            categoria = p["categoria"].get("nombre")
         else:
-            if resultado is None:
-                logger.warning("Stock API devolvió None en listar_productos")
-            elif not isinstance(resultado, list):
-                logger.warning("Formato inesperado de respuesta de Stock API: %s", type(resultado))
-            productos_raw = resultado or []
-
-        for p in productos_raw:
-            categoria = None
-            if isinstance(p.get("categoria"), dict):
-                categoria = p["categoria"].get("nombre")
-            else:
-                categoria = p.get("categoria_nombre") or p.get("categoria")
-
-            imagen = p.get("imagen_url") or p.get("imagen") or p.get("imagenUrl")
-
-            precio = p.get("precio")
-            try:
-                precio = float(precio) if precio is not None else 0.0
-            except Exception:
-                logger.debug("Precio inválido para producto id=%s precio_raw=%s", p.get("id") or p.get("pk"), p.get("precio"))
-                precio = 0.0
-
-            productos.append({
-                "id": p.get("id") or p.get("pk"),
-                "nombre": p.get("nombre") or p.get("title") or "",
-                "descripcion": p.get("descripcion") or p.get("description") or "",
-                "precio": precio,
-                "categoria": categoria or "",
-                "marca": p.get("marca") or "",
-                "imagen": imagen or "",
-            })
-        logger.info("Obtenidos %d productos (raw=%d) desde Stock API", len(productos), len(productos_raw))
+            categoria = p.get("categoria_nombre") or p.get("categoria")
+
+        imagen = p.get("imagen_url") or p.get("imagen") or p.get("imagenUrl")
+
+        precio = p.get("precio")
+        try:
+            precio = float(precio) if precio is not None else 0.0
+        except Exception:
+            logger.debug("Precio inválido para producto id=%s precio_raw=%s", p.get("id") or p.get("pk"), p.get("precio"))
+            precio = 0.0
+
+        productos.append({
+            "id": p.get("id") or p.get("pk"),
+            "nombre": p.get("nombre") or p.get("title") or "",
+            "descripcion": p.get("descripcion") or p.get("description") or "",
+            "precio": precio,
+            "categoria": categoria or "",
+            "marca": p.get("marca") or "",
+            "imagen": imagen or "",
+        })
+    logger.info("Obtenidos %d productos (raw=%d) desde Stock API", len(productos), len(productos_raw))
+    return productos
+
+
+@pagina_anonima(filtros_desde_request, tags=[TAG_CATALOGO])
+def inicio_view(request):
+    """Obtiene productos desde la API de Stock (sin datos hardcodeados).
+
+    Los anónimos reciben la página cacheada por filtros; el listado de Stock
+    se cachea por término de búsqueda y la grilla y la barra de filtros como
+    fragmentos. Todo lleva el tag del catálogo.
+    """
+    logger.info("inicio_view llamada: user=%s path=%s", getattr(request, "user", None), request.get_full_path())
+    filtros = filtros_desde_request(request)
+    termino_busqueda = filtros["busqueda"]
+
+    # sin respuesta de Stock la página sale vacía: no se cachea
+    stock_ok = True
+    try:
+        productos = dominio("catalogo").get_or_set(
+            ("inicio", termino_busqueda),
+            lambda: _consultar_productos(termino_busqueda),
+            tags=[TAG_CATALOGO],
+        )
     except Exception as e:
         logger.exception("Error obteniendo productos desde Stock API para path=%s user=%s: %s", request.get_full_path(), getattr(request, "user", None), e)
         productos = []
+        stock_ok = False
+    return _responder(request, filtros, productos, stock_ok)
+
+
+@pagina_anonima(filtros_desde_request, tags=[TAG_CATALOGO])
+async def inicio_view_async(request):
+    """:func:`inicio_view` para ASGI (``ASYNC_VIEWS``): espera a Stock en el event loop.
+
+    Comparte la clave de cache con la versión sync; el filtrado y el render
+    corren en un hilo.
+    """
+    filtros = filtros_desde_request(request)
+    termino_busqueda = filtros["busqueda"]
+
+    stock_ok = True
+    try:
+        productos = await dominio("catalogo").aget_or_set(
+            ("inicio", termino_busqueda),
+            lambda: _consultar_productos_async(termino_busqueda),
+            tags=[TAG_CATALOGO],
+        )
+    except Exception as e:
+        logger.exception("Error obteniendo productos desde Stock API para path=%s: %s", request.get_full_path(), e)
+        productos = []
+        stock_ok = False
+    return await sync_to_async(_responder)(request, filtros, productos, stock_ok)
+
+
+def _responder(request, filtros, productos, stock_ok):
+    """Filtra, pagina y renderiza inicio.html con los productos ya obtenidos."""
+    termino_busqueda = filtros["busqueda"]
+    categoria_filtrada = filtros["categoria"]
+    marca_filtrada = filtros["marca"]
+    precio_minimo = filtros["precio_minimo"]
+    precio_maximo = filtros["precio_maximo"]
+    page = filtros["page"]
+    limit = filtros["limit"]
 
     # Extraer categorías y marcas disponibles ANTES de filtrar
     categorias_disponibles = sorted({p.get("categoria", "") for p in productos if p.get("categoria", "")})
@@ -214,7 +298,14 @@ def inicio_view(request):
         "carrito": carrito,
         "total_carrito": total_carrito,
         "pagination": pagination_context,
+        "og_url": url_canonica(request, filtros),
+        # claves de los fragmentos cacheados en inicio.html
+        "clave_filtros": [filtros[nombre] for nombre in PARAMETROS_FILTRO] if stock_ok else None,
+        "clave_grilla": [filtros[nombre] for nombre in PARAMETROS_FILTRO] + [page, limit] if stock_ok else None,
     }
 
     logger.info("Renderizando inicio.html con %d productos de %d totales (página %d de %d)", len(productos_pagina), total_resultados, page, total_pages)
-    return render(request, "inicio.html", context)
+    response = render(request, "inicio.html", context)
+    if not stock_ok:
+        patch_cache_control(response, no_store=True)
+    return response
@@ -1,27 +1,81 @@
 # login/signals.py
 
+from django.db import IntegrityError, transaction
+from django.db.models import Case, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Cast, Substr
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+import random
 import re
 
 User = get_user_model()
 
+# sufijo numérico máximo que se considera (evita desbordar el CAST con usernames raros)
+DIGITOS_SUFIJO = 9
+# altas que se intentan si un alta concurrente toma el mismo username
+INTENTOS_USERNAME = 3
+
+
+def siguiente_username(base_username):
+    """
+    Devuelve `base_username` si está libre o `base_username<N>` con N = mayor
+    sufijo numérico en uso + 1, resuelto con una sola consulta agregada en
+    lugar de probar base1, base2, ... de a una.
+    """
+    largo = len(base_username)
+    maximo = (
+        User.objects
+        .filter(username__startswith=base_username)
+        .filter(Q(username=base_username) |
+                Q(username__regex=rf"^{re.escape(base_username)}[0-9]{{1,{DIGITOS_SUFIJO}}}$"))
+        .aggregate(maximo=Max(Case(
+            When(username=base_username, then=Value(0)),
+            default=Cast(Substr("username", largo + 1), IntegerField()),
+            output_field=IntegerField(),
+        )))["maximo"]
+    )
+    if maximo is None:
+        return base_username
+    siguiente = maximo + 1
+    if len(str(siguiente)) > DIGITOS_SUFIJO:
+        # la consulta no vería ese sufijo y lo volvería a proponer: se elige
+        # uno al azar dentro del rango (si choca, el alta reintenta)
+        siguiente = random.randint(10 ** (DIGITOS_SUFIJO - 1), 10 ** DIGITOS_SUFIJO - 1)
+    return f"{base_username}{siguiente}"
+
+
+def guardar_con_username_generado(instance, guardar):
+    """
+    Ejecuta `guardar()` (el save del modelo) para un alta sin username.
+
+    El username se genera en `ensure_unique_username` (pre_save); si un alta
+    concurrente tomó el mismo, el INSERT viola la restricción única y se
+    reintenta con uno nuevo. Cualquier otro IntegrityError sube sin reintentar.
+    """
+    for intento in range(INTENTOS_USERNAME):
+        try:
+            with transaction.atomic():
+                return guardar()
+        except IntegrityError:
+            choco_el_username = User.objects.filter(username=instance.username).exists()
+            if not choco_el_username or intento == INTENTOS_USERNAME - 1:
+                raise
+            instance.username = ""
+
+
 @receiver(pre_save, sender=User)
 def ensure_unique_username(sender, instance, **kwargs):
     """
     Genera un username único basado en el correo electrónico del usuario
     antes de que se guarde en la base de datos.
+
+    Si otro alta concurrente toma el mismo username, el INSERT falla por la
+    restricción única y `guardar_con_username_generado` reintenta.
     """
     if not instance.username:
         # Generar la base del username a partir del correo electrónico
         base_username = instance.email.split('@')[0].lower()
         # Eliminar caracteres no alfanuméricos
         base_username = re.sub(r'\W+', '', base_username)
-        username = base_username
-        counter = 1
-        # Verificar la unicidad del username
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}{counter}"
-            counter += 1
-        instance.username = username
\ No newline at end of file
+        instance.username = siguiente_username(base_username)
@@ -28,14 +28,7 @@ def login_view (request):
         else:
             log.debug("usuario login: %s", usuario_login)
 
-    #Usuario.objects.all().delete()
-    usuario_existente = Usuario.objects.all()
-
-    
-    log.debug("usuarios:")
-    for i in usuario_existente: 
-        log.debug("%s", i)
-        log.debug("--------------------------")
+    # el listado de usuarios para diagnóstico está en /administracion/usuarios/ (sólo staff)
     context= {'active_tab': 'login'}
 
 
@@ -6,10 +6,15 @@ class PedidosConfig(AppConfig):
     name = 'apps.modulos.pedidos'
 
     def ready(self):
-        """Al iniciar la app, limpiar pedidos previos."""
+        """Al iniciar la app, limpiar pedidos previos (si LIMPIAR_PEDIDOS_AL_INICIAR está activo)."""
+        from django.conf import settings
         from django.db import connection
         from django.db.utils import OperationalError
-        
+
+        # con datos a escala (generar_datos_escala) esto borraría millones de filas en cada arranque
+        if not getattr(settings, "LIMPIAR_PEDIDOS_AL_INICIAR", True):
+            return
+
         try:
             # Verificar si las tablas existen
             with connection.cursor() as cursor:
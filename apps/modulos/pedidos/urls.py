@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views  # Es una buena práctica usar la importación relativa con "."
 
@@ -10,5 +11,5 @@ urlpatterns = [
     path('checkout/', views.checkout_view, name='checkout'),
         path('api/checkout/confirm/', views.api_checkout_confirm, name='api_checkout_confirm'),
     path('admin/', views.listar_pedidos, name='listar_pedidos_admin'),
-    path('', views.mis_pedidos, name='mis_pedidos'),
+    path('', views.mis_pedidos_async if settings.ASYNC_VIEWS else views.mis_pedidos, name='mis_pedidos'),
 ]
\ No newline at end of file
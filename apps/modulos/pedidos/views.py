@@ -10,6 +10,12 @@ from django.conf import settings
 import logging
 import traceback
 
+from asgiref.sync import sync_to_async
+
+from Main.db_router import lectura_en_replica
+from utils.apiCliente import APIError
+from utils.apiCliente.asincrono import AsyncAPIClient
+
 # module logger
 logger = logging.getLogger(__name__)
 
@@ -61,6 +67,7 @@ from django.shortcuts import render, redirect
 from .models import Pedido, DetallePedido
 
 # @login_required
+@lectura_en_replica
 def listar_pedidos(request):
     """
     Muestra una lista de pedidos. En desarrollo, permite sembrar datos de prueba con ?seed=1.
@@ -126,7 +133,8 @@ def pago_fallido(request):
 def mis_pedidos(request):
     """
     Muestra el historial de pedidos del usuario.
-    Consume el endpoint /api/shopcart/history sin autenticación.
+    Consume el endpoint /api/shopcart/history sin autenticación
+    (la lectura en la réplica la decide ese endpoint, no esta vista).
     """
     import requests
     
@@ -149,6 +157,25 @@ def mis_pedidos(request):
     return render(request, 'pedidos/mis_pedidos.html', context)
 
 
+
+async def mis_pedidos_async(request):
+    """:func:`mis_pedidos` para ASGI (``ASYNC_VIEWS``): espera al historial sin ocupar un hilo."""
+    pedidos = []
+    cliente = AsyncAPIClient(base_url=settings.BASE_URL, timeout=5, max_retries=0, bulkhead=False)
+    cookie = request.META.get("HTTP_COOKIE")
+    try:
+        pedidos = await cliente.get("/api/shopcart/history", headers={"Cookie": cookie} if cookie else None)
+    except Exception as e:
+        # como en la versión sync: un status != 2xx deja la lista vacía sin loguear
+        if not (isinstance(e, APIError) and e.status is not None):
+            logger.exception("Error al obtener historial de pedidos desde API: %s", str(e))
+        pedidos = []
+
+    context = {
+        'pedidos': pedidos,
+    }
+    return await sync_to_async(render)(request, 'pedidos/mis_pedidos.html', context)
+
 # --- FUNCIONES AUXILIARES PARA DATOS DE PRUEBA ---
 
 def _ensure_demo_user():
@@ -0,0 +1,107 @@
+"""Micro-benchmarks de los caminos calientes de la app.
+
+Cada caso se registra con :func:`benchmark` como un generador que prepara
+los datos, hace ``yield`` de la función a medir (sin argumentos) y luego
+libera lo que haya creado::
+
+    @benchmark("normalize")
+    def _normalize():
+        textos = [...]
+        yield lambda: [normalize(t) for t in textos]
+
+La medición sigue el esquema de ``timeit``: se calibra la cantidad de loops
+para que cada repetición dure al menos ``tiempo_min`` y se reportan la
+mediana y el mínimo por operación. Los baselines viven en
+``benchmarks/baselines.json``; ver ``python -m benchmarks --help``.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+import timeit
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Caso:
+    nombre: str
+    preparar: Callable[[], Iterator[Callable[[], Any]]]
+    umbral: Optional[float] = None  # tolerancia propia (p. ej. casos con red)
+    descripcion: str = ""
+
+
+CASOS: Dict[str, Caso] = {}
+
+
+def benchmark(nombre: str, umbral: Optional[float] = None):
+    """Registra un caso de benchmark (ver docstring del módulo)."""
+
+    def decorador(fn):
+        CASOS[nombre] = Caso(nombre, fn, umbral, (fn.__doc__ or "").strip().split("\n")[0])
+        return fn
+
+    return decorador
+
+
+def medir(fn: Callable[[], Any], repeticiones: int = 5, tiempo_min: float = 0.2) -> Dict[str, Any]:
+    """Mide ``fn`` y devuelve tiempos por operación en microsegundos."""
+    timer = timeit.Timer(fn, timer=time.perf_counter)
+    loops = 1
+    while True:
+        transcurrido = timer.timeit(loops)
+        if transcurrido >= tiempo_min:
+            break
+        loops = max(loops * 2, int(loops * tiempo_min / max(transcurrido, 1e-9)))
+    tiempos = [transcurrido / loops] + [timer.timeit(loops) / loops for _ in range(repeticiones - 1)]
+    return {
+        "mediana_us": round(statistics.median(tiempos) * 1e6, 3),
+        "min_us": round(min(tiempos) * 1e6, 3),
+        "loops": loops,
+        "repeticiones": len(tiempos),
+    }
+
+
+def ejecutar(nombres: Optional[List[str]] = None, repeticiones: int = 5, tiempo_min: float = 0.2) -> Dict[str, Dict[str, Any]]:
+    """Corre los casos pedidos (o todos) y devuelve los resultados por nombre."""
+    from . import casos  # noqa: F401 - registra los casos
+
+    resultados = {}
+    for nombre in nombres or sorted(CASOS):
+        caso = CASOS[nombre]
+        generador = caso.preparar()
+        fn = next(generador)
+        try:
+            resultados[nombre] = medir(fn, repeticiones, tiempo_min)
+        finally:
+            generador.close()
+    return resultados
+
+
+def comparar(resultados: Dict[str, Dict[str, Any]], baselines: Dict[str, Dict[str, Any]],
+             umbral: float = 0.2) -> List[Dict[str, Any]]:
+    """Compara medianas contra el baseline.
+
+    Devuelve una fila por caso con ``ratio`` (actual / baseline) y ``estado``:
+    ``regresion`` si supera ``1 + umbral``, ``mejora`` si baja de ``1 - umbral``,
+    ``ok`` si no, o ``nuevo`` si el caso no tiene baseline.
+    """
+    filas = []
+    for nombre, actual in sorted(resultados.items()):
+        base = baselines.get(nombre)
+        caso = CASOS.get(nombre)
+        tolerancia = caso.umbral if caso and caso.umbral is not None else umbral
+        fila = {"caso": nombre, "actual_us": actual["mediana_us"], "umbral": tolerancia}
+        if not base:
+            fila.update(baseline_us=None, ratio=None, estado="nuevo")
+        else:
+            ratio = actual["mediana_us"] / base["mediana_us"] if base["mediana_us"] else float("inf")
+            if ratio > 1 + tolerancia:
+                estado = "regresion"
+            elif ratio < 1 - tolerancia:
+                estado = "mejora"
+            else:
+                estado = "ok"
+            fila.update(baseline_us=base["mediana_us"], ratio=round(ratio, 3), estado=estado)
+        filas.append(fila)
+    return filas
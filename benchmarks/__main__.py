@@ -0,0 +1,111 @@
+"""CLI de la suite de micro-benchmarks.
+
+    python -m benchmarks                       # corre todo y compara contra baselines.json
+    python -m benchmarks --caso normalize      # sólo algunos casos (repetible)
+    python -m benchmarks --guardar             # reescribe los baselines con esta corrida
+    python -m benchmarks --umbral 0.1 --json resultados.json
+
+Sale con código 1 si algún caso empeora más que el umbral respecto de su
+baseline. Los baselines dependen de la máquina: regenerarlos (``--guardar``)
+en la misma máquina/CI donde se van a comparar.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+
+def _preparar_django():
+    """Configura Django y crea una base de prueba vacía (como `manage.py test`)."""
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Main.settings")
+    import django
+
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    nombre_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    def destruir():
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+    return destruir
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Micro-benchmarks con control de regresiones")
+    parser.add_argument("--caso", action="append", help="nombre del caso a correr (repetible); por defecto todos")
+    parser.add_argument("--listar", action="store_true", help="mostrar los casos disponibles y salir")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--tiempo-min", type=float, default=0.2, help="segundos mínimos por repetición")
+    parser.add_argument("--umbral", type=float, default=0.2, help="tolerancia relativa antes de marcar regresión")
+    parser.add_argument("--baselines", default=str(RAIZ / "benchmarks" / "baselines.json"))
+    parser.add_argument("--guardar", action="store_true", help="guardar esta corrida como baseline")
+    parser.add_argument("--json", dest="salida_json", help="guardar resultados y comparación en este archivo")
+    args = parser.parse_args(argv)
+
+    destruir = _preparar_django()
+    # medir el código, no la escritura de logs a consola
+    logging.disable(logging.CRITICAL)
+    try:
+        from benchmarks import CASOS, comparar, ejecutar
+        from benchmarks import casos  # noqa: F401 - registra los casos
+
+        if args.listar:
+            for nombre, caso in sorted(CASOS.items()):
+                print(f"{nombre:<36} {caso.descripcion}")
+            return 0
+
+        desconocidos = set(args.caso or []) - set(CASOS)
+        if desconocidos:
+            parser.error(f"Casos desconocidos: {', '.join(sorted(desconocidos))}")
+
+        resultados = ejecutar(args.caso, repeticiones=args.repeticiones, tiempo_min=args.tiempo_min)
+    finally:
+        logging.disable(logging.NOTSET)
+        destruir()
+
+    ruta = Path(args.baselines)
+    documento = json.loads(ruta.read_text(encoding="utf-8")) if ruta.exists() else {"casos": {}}
+    filas = comparar(resultados, documento.get("casos", {}), args.umbral)
+
+    print(f"{'caso':<36}{'actual µs':>14}{'baseline µs':>14}{'ratio':>8}  estado")
+    for fila in filas:
+        baseline = "-" if fila["baseline_us"] is None else fila["baseline_us"]
+        ratio = "-" if fila["ratio"] is None else fila["ratio"]
+        print(f"{fila['caso']:<36}{fila['actual_us']:>14}{baseline:>14}{ratio:>8}  {fila['estado']}")
+
+    if args.guardar:
+        documento["meta"] = {
+            "fecha": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "maquina": platform.platform(),
+        }
+        documento.setdefault("casos", {}).update(resultados)
+        ruta.write_text(json.dumps(documento, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baselines actualizados en {ruta}")
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as fh:
+            json.dump({"resultados": resultados, "comparacion": filas}, fh, ensure_ascii=False, indent=2)
+
+    regresiones = [f["caso"] for f in filas if f["estado"] == "regresion"]
+    if regresiones and not args.guardar:
+        print(f"Regresiones por encima del umbral: {', '.join(regresiones)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Casos de benchmark de los caminos calientes.
+
+Los casos que tocan Django asumen que la app ya está configurada (lo hace
+``python -m benchmarks``) y los que usan la base, que existe una base de
+prueba vacía: cada caso crea sus filas y las borra al terminar.
+"""
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+from unittest.mock import patch
+
+from . import benchmark
+
+CATEGORIAS = ["Remeras", "Pantalones", "Zapatillas", "Abrigos", "Accesorios", "Tecnología"]
+MARCAS = ["UrbanFit", "ProSport", "ClassicLine", "DenimCo", "StepUp", "NorthWind"]
+SIN_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def productos_sinteticos(cantidad: int, semilla: int = 42) -> list[dict]:
+    """Productos con el formato que devuelve /api/product/ (nombres con tildes y espacios raros)."""
+    rng = random.Random(semilla)
+    productos = []
+    for i in range(1, cantidad + 1):
+        categoria = CATEGORIAS[i % len(CATEGORIAS)]
+        productos.append({
+            "id": i,
+            "nombre": f"{categoria} Edición Única  Número {i}",
+            "descripcion": f"Descripción del producto {i} con acentuación y ñandú.",
+            "precio": round(rng.uniform(1000, 90000), 2),
+            "stock": rng.randint(0, 100),
+            "categoria": {"id": i % len(CATEGORIAS) + 1, "nombre": categoria},
+            "marca": rng.choice(MARCAS),
+            "imagen_url": f"/static/imagenes/mock/producto_{i}.webp",
+        })
+    return productos
+
+
+@benchmark("normalize")
+def _normalize():
+    """normalize() sobre 1000 textos con tildes, NBSP y espacios repetidos."""
+    from apps.modulos.inicio.views import normalize
+
+    textos = [p["nombre"] for p in productos_sinteticos(1000)]
+    yield lambda: [normalize(t) for t in textos]
+
+
+@benchmark("inicio_view_filtrado_5000")
+def _inicio_view():
+    """inicio_view con 5000 productos, búsqueda + categoría + precio (incluye render)."""
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory, override_settings
+
+    from apps.modulos.inicio import views
+
+    payload = {"data": productos_sinteticos(5000)}
+    request = RequestFactory().get("/", {"busqueda": "edicion", "categoria": "Zapatillas", "precio_minimo": "5000"})
+    request.user = AnonymousUser()
+    request.session = {}
+
+    # sin cache: se mide el filtrado y el render, no un hit de la página cacheada
+    with override_settings(CACHES=SIN_CACHE), \
+            patch.object(views.ProductoAPIClient, "listar_productos", return_value=payload):
+        yield lambda: views.inicio_view(request)
+
+
+def _request_anonima(path="/"):
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.session = {}
+    return request
+
+
+@benchmark("render_inicio_html")
+def _render_inicio():
+    """render de inicio.html con 18 productos (loader cacheado, sin cache de fragmentos)."""
+    from django.template.loader import render_to_string
+
+    from apps.modulos.inicio import views
+
+    productos = [
+        {"id": p["id"], "nombre": p["nombre"], "descripcion": p["descripcion"], "precio": p["precio"],
+         "categoria": p["categoria"]["nombre"], "marca": p["marca"], "imagen": p["imagen_url"]}
+        for p in productos_sinteticos(18)
+    ]
+    filtros = {nombre: "" for nombre in views.PARAMETROS_FILTRO}
+    contexto = {
+        "productos": productos, "categorias": CATEGORIAS, "marcas": MARCAS, "filtros": filtros,
+        "cantidad_resultados": 90, "carrito": [], "total_carrito": 0.0,
+        "pagination": {"total": 90, "per_page": 18, "current_page": 2, "total_pages": 5,
+                       "has_next": True, "has_prev": True, "next_page": 3, "prev_page": 1},
+        "clave_filtros": None, "clave_grilla": None,
+    }
+    request = _request_anonima()
+    yield lambda: render_to_string("inicio.html", contexto, request)
+
+
+@benchmark("render_checkout_html")
+def _render_checkout():
+    """checkout_view completa (render de checkout.html)."""
+    from apps.modulos.pedidos.views import checkout_view
+
+    request = _request_anonima("/pedidos/checkout/")
+    yield lambda: checkout_view(request)
+
+
+@benchmark("render_allauth_signup")
+def _render_signup():
+    """render de account/signup.html de allauth con su formulario."""
+    from allauth.account.forms import SignupForm
+    from django.template.loader import render_to_string
+
+    request = _request_anonima("/accounts/signup/")
+    yield lambda: render_to_string("account/signup.html", {"form": SignupForm()}, request)
+
+
+@benchmark("producto_viewset_list_mock")
+def _producto_list():
+    """ProductoViewSet.list en modo mock: búsqueda y paginación."""
+    from django.test import override_settings
+    from rest_framework.test import APIRequestFactory
+
+    from apps.apis.productoApi.views import ProductoViewSet
+
+    vista = ProductoViewSet.as_view({"get": "list"})
+    factory = APIRequestFactory()
+    with override_settings(USE_MOCK_APIS=True):
+        yield lambda: vista(factory.get("/api/product/", {"search": "re", "page": 2, "limit": 5}))
+
+
+@benchmark("pedido_serializer_representacion")
+def _pedido_serializer():
+    """PedidoSerializer(many=True) sobre 20 pedidos de 5 detalles cada uno."""
+    from apps.apis.pedidoApi.models import DetallePedido, DireccionEnvio, Pedido
+    from apps.apis.pedidoApi.serializer import PedidoSerializer
+
+    pedidos = []
+    for i in range(20):
+        direccion = DireccionEnvio.objects.create(
+            nombre_receptor=f"Cliente {i}", calle="Av. Siempre Viva 742", ciudad="Resistencia",
+            provincia="Chaco", codigo_postal="3500", telefono="3620000000",
+        )
+        pedido = Pedido.objects.create(direccion_envio=direccion, total=Decimal("0.00"))
+        DetallePedido.objects.bulk_create([
+            DetallePedido(pedido=pedido, producto_id=j, nombre_producto=f"Producto {j}",
+                          cantidad=j, precio_unitario=Decimal("1999.99"))
+            for j in range(1, 6)
+        ])
+        pedidos.append(pedido.pk)
+    queryset = Pedido.objects.filter(pk__in=pedidos)
+    try:
+        yield lambda: PedidoSerializer(list(queryset), many=True).data
+    finally:
+        direcciones = list(queryset.values_list("direccion_envio_id", flat=True))
+        queryset.delete()
+        DireccionEnvio.objects.filter(pk__in=direcciones).delete()
+
+
+@benchmark("api_cliente_request_local", umbral=0.5)
+def _api_cliente():
+    """BaseAPIClient.get contra un servidor local (stub), sin coalescing ni bulkhead."""
+    from tools.stub_services import StubConfig, iniciar_en_hilo
+    from utils.apiCliente.stock import StockClient
+
+    servidor, base_url = iniciar_en_hilo(StubConfig(productos=20))
+    cliente = StockClient(base_url, coalesce=False, bulkhead=False)
+    try:
+        yield lambda: cliente.listar_categorias()
+    finally:
+        cliente.session.close()
+        servidor.shutdown()
+        servidor.server_close()
+
+
+@benchmark("requests_crudo_local", umbral=0.5)
+def _requests_crudo():
+    """Referencia: requests.Session.get al mismo endpoint (la diferencia es el overhead del cliente)."""
+    import requests
+
+    from tools.stub_services import StubConfig, iniciar_en_hilo
+
+    servidor, base_url = iniciar_en_hilo(StubConfig(productos=20))
+    session = requests.Session()
+    try:
+        yield lambda: session.get(f"{base_url}/categorias", timeout=5).json()
+    finally:
+        session.close()
+        servidor.shutdown()
+        servidor.server_close()
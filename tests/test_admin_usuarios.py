@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+
+from apps.modulos.login.views import login_view
+
+
+class TestAdminUsuarios(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Usuario = get_user_model()
+        cls.staff = Usuario.objects.create_user(username="staff", email="staff@example.com", password="x12345678",
+                                                is_staff=True)
+        Usuario.objects.bulk_create([
+            Usuario(username=f"cliente-{n}", email=f"cliente-{n}@example.com") for n in range(7)
+        ])
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.staff)
+
+    def test_paginacion_por_keyset(self):
+        vistos, despues = [], 0
+        while despues is not None:
+            datos = self.client.get("/administracion/usuarios/", {"despues": despues, "limite": 3}).json()
+            self.assertLessEqual(len(datos["results"]), 3)
+            vistos += [u["username"] for u in datos["results"]]
+            despues = datos["siguiente"]
+        self.assertEqual(len(vistos), 8)
+        self.assertEqual(len(set(vistos)), 8)
+
+    def test_filtros(self):
+        datos = self.client.get("/administracion/usuarios/", {"username": "cliente-"}).json()
+        self.assertEqual(len(datos["results"]), 7)
+        datos = self.client.get("/administracion/usuarios/", {"email": "cliente-3@example.com"}).json()
+        self.assertEqual([u["username"] for u in datos["results"]], ["cliente-3"])
+        self.assertNotIn("password", datos["results"][0])
+        self.assertEqual(self.client.get("/administracion/usuarios/", {"limite": "x"}).status_code, 400)
+
+    def test_solo_staff(self):
+        anonimo = Client().get("/administracion/usuarios/")
+        self.assertEqual(anonimo.status_code, 302)
+
+    @patch("apps.modulos.login.views.render", return_value=HttpResponse())
+    def test_login_get_no_recorre_usuarios(self, _render):
+        request = RequestFactory().get("/login/login/")
+        request.user = AnonymousUser()
+        with self.assertNumQueries(0):
+            login_view(request)
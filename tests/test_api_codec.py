@@ -0,0 +1,105 @@
+import json
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Asegurar que el directorio del proyecto esté en sys.path para poder importar `utils` durante tests
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from utils.apiCliente.base import APIError
+from utils.apiCliente.codec import JSONCodec, iter_json_array, obtener_codec
+from utils.apiCliente.stock import StockClient
+
+
+def _trocear(texto, tam):
+    datos = texto.encode("utf-8")
+    return [datos[i:i + tam] for i in range(0, len(datos), tam)]
+
+
+class StreamResponse:
+    def __init__(self, body, status_code=200, chunk=7):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json"}
+        self._body = body
+        self._chunk = chunk
+        self.closed = False
+
+    @property
+    def content(self):
+        return self._body.encode("utf-8")
+
+    @property
+    def text(self):
+        return self._body
+
+    def iter_content(self, chunk_size=1):
+        return iter(_trocear(self._body, self._chunk))
+
+    def close(self):
+        self.closed = True
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_objeto_con_data_en_chunks_chicos(self):
+        productos = [{"id": i, "nombre": f"Remera ñandú {i}", "precio": 1234.5 + i} for i in range(50)]
+        body = json.dumps({"pagination": {"page": 1, "data": "no"}, "data": productos, "total": 50}, ensure_ascii=False)
+        for tam in (1, 3, 64, 10_000):
+            self.assertEqual(list(iter_json_array(_trocear(body, tam))), productos)
+
+    def test_arreglo_en_raiz_y_numeros_cortados(self):
+        body = "[12345, 67.890, true, null, \"x\"]"
+        self.assertEqual(list(iter_json_array(_trocear(body, 2))), [12345, 67.89, True, None, "x"])
+
+    def test_numero_cortado_en_punto_o_exponente(self):
+        self.assertEqual(list(iter_json_array([b"[1234.", b"5, 2]"])), [1234.5, 2])
+        self.assertEqual(list(iter_json_array([b"[1e", b"3, -2", b"E-", b"1]"])), [1000.0, -0.2])
+
+    def test_objeto_sin_clave_y_arreglo_vacio(self):
+        self.assertEqual(list(iter_json_array([b'{"otro": [1, 2]}'])), [])
+        self.assertEqual(list(iter_json_array([b'{"data": [ ]}'])), [])
+
+    def test_json_cortado_levanta_error(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"data": [{"id": 1}, {"id"']))
+
+    def test_codecs_equivalentes(self):
+        payload = b'{"data": [{"id": 1, "nombre": "Jean"}]}'
+        self.assertEqual(JSONCodec().loads(payload), obtener_codec().loads(payload))
+        with self.assertRaises(ValueError):
+            obtener_codec("yaml")
+
+
+class TestStreamingClient(unittest.TestCase):
+    def setUp(self):
+        self.client = StockClient(base_url="https://api.test", codec="json")
+
+    @patch("requests.Session.request")
+    def test_iterar_productos(self, mock_request):
+        productos = [{"id": i} for i in range(10)]
+        resp = StreamResponse(json.dumps({"data": productos, "pagination": {"total": 10}}))
+        mock_request.return_value = resp
+
+        resultado = list(self.client.iterar_productos(limit=5000))
+
+        self.assertEqual(resultado, productos)
+        self.assertTrue(resp.closed)
+        self.assertTrue(mock_request.call_args.kwargs["stream"])
+
+    @patch("requests.Session.request")
+    def test_iterar_productos_status_inesperado(self, mock_request):
+        mock_request.return_value = StreamResponse('{"detail": "caido"}', status_code=503)
+        with self.assertRaises(APIError) as ctx:
+            list(self.client.iterar_productos())
+        self.assertEqual(ctx.exception.status, 503)
+        self.assertEqual(ctx.exception.payload, {"detail": "caido"})
+
+    @patch("requests.Session.request")
+    def test_request_usa_codec(self, mock_request):
+        mock_request.return_value = StreamResponse('{"ok": true}')
+        self.assertEqual(self.client.get("/productos"), {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+
+from apps.apis.pedidoApi.models import DireccionEnvio, Pedido
+from apps.apis.pedidoApi.views import tracking_async
+from apps.apis.productoApi.client import AsyncProductoAPIClient
+from apps.apis.productoApi.views import producto_detail_async
+from apps.modulos.inicio.views import inicio_view_async
+from apps.modulos.pedidos.views import mis_pedidos_async
+from utils.apiCliente import APIError
+from utils.apiCliente.asincrono import AsyncStockClient, cerrar_clientes_http, cliente_http
+from utils.cache import metricas
+
+PRODUCTOS = {"data": [
+    {"id": 1, "nombre": "Remera básica", "precio": "1000", "categoria": "Ropa", "marca": "Acme"},
+]}
+
+
+def _transporte(*respuestas):
+    """``httpx.AsyncClient`` que devuelve (o levanta) las respuestas en orden y guarda las requests."""
+    pendientes = list(respuestas)
+    recibidas = []
+
+    def manejar(request):
+        recibidas.append(request)
+        respuesta = pendientes.pop(0)
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(manejar)), recibidas
+
+
+def _con_usuario(request, usuario=None):
+    usuario = usuario or AnonymousUser()
+    request.user = usuario
+
+    async def auser():
+        return usuario
+
+    request.auser = auser
+    return request
+
+
+class TestClienteAsync(SimpleTestCase):
+    async def test_reintenta_errores_de_conexion(self):
+        cliente_http, recibidas = _transporte(
+            httpx.ConnectError("caído"),
+            httpx.Response(200, json={"id": 7}),
+        )
+        with patch("utils.apiCliente.asincrono.cliente_http", return_value=cliente_http):
+            producto = await AsyncStockClient(base_url="http://stock", bulkhead=False).obtener_producto(7)
+        self.assertEqual(producto, {"id": 7})
+        self.assertEqual([str(r.url) for r in recibidas], ["http://stock/productos/7"] * 2)
+
+    async def test_status_inesperado_levanta_api_error(self):
+        cliente_http, _ = _transporte(httpx.Response(404, json={"error": "no existe"}))
+        with patch("utils.apiCliente.asincrono.cliente_http", return_value=cliente_http):
+            with self.assertRaises(APIError) as ctx:
+                await AsyncStockClient(base_url="http://stock", bulkhead=False).obtener_producto(7)
+        self.assertEqual((ctx.exception.status, ctx.exception.payload), (404, {"error": "no existe"}))
+
+    def test_sin_metodos_de_streaming(self):
+        cliente = AsyncStockClient(base_url="http://stock", bulkhead=False)
+        for nombre in ("stream_items", "iter_get", "iterar_productos"):
+            self.assertFalse(hasattr(cliente, nombre), nombre)
+        self.assertFalse(hasattr(AsyncProductoAPIClient, "iterar_productos"))
+
+    async def test_lifespan_cierra_los_pools_al_apagar(self):
+        from Main.asgi import application
+
+        pool = cliente_http("http://stock")
+        mensajes = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        enviados = []
+
+        async def receive():
+            return next(mensajes)
+
+        async def send(mensaje):
+            enviados.append(mensaje["type"])
+
+        await application({"type": "lifespan"}, receive, send)
+        self.assertEqual(enviados, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertTrue(pool.is_closed)
+        self.assertIsNot(cliente_http("http://stock"), pool)
+        await cerrar_clientes_http()
+
+    @override_settings(USE_MOCK_APIS=False, STOCK_API_BASE_URL="http://stock")
+    async def test_detalle_de_producto_async(self):
+        cliente_http, _ = _transporte(httpx.Response(200, json={"id": 7, "nombre": "Gorra"}))
+        with patch("utils.apiCliente.asincrono.cliente_http", return_value=cliente_http):
+            response = await producto_detail_async(AsyncRequestFactory().get("/api/product/7/"), pk="7")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"id": 7, "nombre": "Gorra"}')
+
+
+class TestInicioAsync(TestCase):
+    def setUp(self):
+        cache.clear()
+        metricas.reiniciar()
+        parche = patch("apps.modulos.inicio.views.AsyncProductoAPIClient")
+        self.cliente_api = parche.start().return_value
+        self.cliente_api.listar_productos = AsyncMock(return_value=PRODUCTOS)
+        self.addCleanup(parche.stop)
+
+    async def test_pagina_anonima_cacheada(self):
+        factory = AsyncRequestFactory()
+        primera = await inicio_view_async(_con_usuario(factory.get("/", {"categoria": "Ropa"})))
+        self.assertEqual(primera["X-Cache"], "MISS")
+        self.assertIn("Remera básica", primera.content.decode())
+
+        segunda = await inicio_view_async(_con_usuario(factory.get("/", {"categoria": " Ropa "})))
+        self.assertEqual(segunda["X-Cache"], "HIT")
+        self.assertEqual(segunda.content, primera.content)
+        self.cliente_api.listar_productos.assert_awaited_once()
+
+    async def test_sin_stock_no_se_cachea(self):
+        self.cliente_api.listar_productos.side_effect = APIError("Timeout/Conexión a http://stock falló")
+        response = await inicio_view_async(_con_usuario(AsyncRequestFactory().get("/")))
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertFalse(response.has_header("X-Cache"))
+
+
+class TestTrackingAsync(TestCase):
+    def setUp(self):
+        self.usuario = get_user_model().objects.create_user(username="tracking", password="x12345678")
+        direccion = DireccionEnvio.objects.create(usuario=self.usuario, nombre_receptor="Ana", calle="Mitre 1",
+                                                  ciudad="Resistencia", codigo_postal="3500")
+        self.pedido = Pedido.objects.create(usuario=self.usuario, direccion_envio=direccion, referencia_envio="55")
+        parche = patch("apps.apis.pedidoApi.views.obtener_cliente_logistica_async")
+        self.logistica = parche.start().return_value
+        self.addCleanup(parche.stop)
+
+    async def test_fallback_a_shipment(self):
+        self.logistica.get_tracking = AsyncMock(side_effect=APIError("HTTP 404", status=404))
+        self.logistica.get_shipment = AsyncMock(return_value={"estado": "en_camino"})
+        request = _con_usuario(AsyncRequestFactory().get("/"), self.usuario)
+        response = await tracking_async(request, pk=str(self.pedido.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content, {"tracking": {"estado": "en_camino"}, "pedido_id": self.pedido.pk})
+        self.logistica.get_shipment.assert_awaited_once_with(55)
+
+    async def test_pedido_de_otro_usuario(self):
+        otro = await get_user_model().objects.acreate_user(username="otro", password="x12345678")
+        response = await tracking_async(_con_usuario(AsyncRequestFactory().get("/"), otro), pk=str(self.pedido.pk))
+        self.assertEqual(response.status_code, 404)
+
+
+class TestMisPedidosAsync(TestCase):
+    async def test_cualquier_error_deja_la_lista_vacia(self):
+        with patch("apps.modulos.pedidos.views.AsyncAPIClient") as cliente:
+            cliente.return_value.get = AsyncMock(side_effect=ValueError("JSON inválido"))
+            with self.assertLogs("apps.modulos.pedidos.views", "ERROR"):
+                response = await mis_pedidos_async(_con_usuario(AsyncRequestFactory().get("/pedidos/")))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,41 @@
+from django.test import TestCase
+
+from benchmarks import CASOS, comparar, ejecutar, medir
+
+
+class TestBenchmarks(TestCase):
+    def test_comparar_marca_regresiones_y_casos_nuevos(self):
+        resultados = {
+            "lento": {"mediana_us": 130.0},
+            "igual": {"mediana_us": 105.0},
+            "rapido": {"mediana_us": 50.0},
+            "sin_baseline": {"mediana_us": 1.0},
+        }
+        baselines = {n: {"mediana_us": 100.0} for n in ("lento", "igual", "rapido")}
+        estados = {f["caso"]: f["estado"] for f in comparar(resultados, baselines, umbral=0.2)}
+
+        self.assertEqual(estados, {
+            "lento": "regresion",
+            "igual": "ok",
+            "rapido": "mejora",
+            "sin_baseline": "nuevo",
+        })
+
+    def test_umbral_propio_del_caso(self):
+        ejecutar(["normalize"], repeticiones=1, tiempo_min=0.0)  # registra los casos
+        self.assertEqual(CASOS["api_cliente_request_local"].umbral, 0.5)
+        filas = comparar({"api_cliente_request_local": {"mediana_us": 140.0}},
+                         {"api_cliente_request_local": {"mediana_us": 100.0}}, umbral=0.2)
+        self.assertEqual(filas[0]["estado"], "ok")
+
+    def test_medir_calibra_loops(self):
+        resultado = medir(lambda: sum(range(100)), repeticiones=3, tiempo_min=0.01)
+        self.assertGreater(resultado["loops"], 1)
+        self.assertEqual(resultado["repeticiones"], 3)
+        self.assertLessEqual(resultado["min_us"], resultado["mediana_us"])
+
+    def test_todos_los_casos_corren(self):
+        resultados = ejecutar(repeticiones=1, tiempo_min=0.0)
+        self.assertEqual(set(resultados), set(CASOS))
+        for resultado in resultados.values():
+            self.assertGreater(resultado["mediana_us"], 0)
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Asegurar que el directorio del proyecto esté en sys.path para poder importar `utils` durante tests
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+import requests
+from django.test import override_settings
+
+from utils.apiCliente.base import APIError
+from utils.apiCliente import bulkhead as modulo_bulkhead
+from utils.apiCliente.bulkhead import AdaptiveBulkhead, BulkheadLleno, configurar_bulkhead, obtener_bulkhead
+from utils.apiCliente.logistica import LogisticsClient
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self._json = json_data or {}
+        self.headers = {"Content-Type": "application/json"}
+        self.text = ""
+
+    def json(self):
+        return self._json
+
+
+class TestAdaptiveBulkhead(unittest.TestCase):
+    def test_rechaza_al_superar_el_limite(self):
+        bulkhead = AdaptiveBulkhead("logistica", limite_inicial=2, limite_minimo=1, limite_maximo=4)
+        bulkhead.adquirir()
+        bulkhead.adquirir()
+        with self.assertRaises(BulkheadLleno):
+            bulkhead.adquirir()
+        self.assertEqual(bulkhead.rechazadas, 1)
+        bulkhead.liberar(0.01)
+        bulkhead.adquirir()
+
+    def test_limite_baja_con_latencia_y_sube_cuando_se_recupera(self):
+        bulkhead = AdaptiveBulkhead("stock", limite_inicial=20, limite_minimo=2, limite_maximo=50)
+        for _ in range(20):
+            bulkhead.adquirir()
+            bulkhead.liberar(0.010)
+        sano = bulkhead.limite
+
+        for _ in range(50):
+            bulkhead.adquirir()
+            bulkhead.liberar(0.500)
+        self.assertLess(bulkhead.limite, sano)
+        self.assertGreaterEqual(bulkhead.limite, 2)
+
+        lento = bulkhead.limite
+        for _ in range(50):
+            bulkhead.adquirir()
+            bulkhead.liberar(0.010)
+        self.assertGreater(bulkhead.limite, lento)
+
+    def test_caidas_recortan_el_limite(self):
+        bulkhead = AdaptiveBulkhead("logistica", limite_inicial=10, limite_minimo=2, limite_maximo=10)
+        for _ in range(3):
+            bulkhead.adquirir()
+            bulkhead.liberar(8.0, caida=True)
+        self.assertEqual(bulkhead.limite, 3)
+
+
+class TestRegistroBulkheads(unittest.TestCase):
+    def setUp(self):
+        # registro limpio para este test, restaurado al terminar
+        for nombre in ("_registro", "_config"):
+            parche = patch.dict(getattr(modulo_bulkhead, nombre), clear=True)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def test_lee_settings_en_el_primer_uso(self):
+        with override_settings(UPSTREAM_BULKHEADS={"stock": {"limite_inicial": 7, "limite_maximo": 9}}):
+            bulkhead = obtener_bulkhead("stock")
+        self.assertEqual((bulkhead.limite, bulkhead.limite_maximo), (7, 9))
+        self.assertEqual(obtener_bulkhead("otro").limite, 20)
+
+    def test_configurar_tiene_prioridad(self):
+        configurar_bulkhead("stock", limite_inicial=3, limite_minimo=1)
+        with override_settings(UPSTREAM_BULKHEADS={"stock": {"limite_inicial": 7}}):
+            self.assertEqual(obtener_bulkhead("stock").limite, 3)
+
+
+class TestBulkheadEnCliente(unittest.TestCase):
+    def setUp(self):
+        self.client = LogisticsClient(base_url="https://api.test", max_retries=0)
+        self.client.bulkhead = AdaptiveBulkhead("logistica", limite_inicial=1, limite_minimo=1, limite_maximo=1)
+
+    @patch("requests.Session.request")
+    def test_rechazo_rapido_como_api_error(self, mock_request):
+        self.client.bulkhead.adquirir()  # otra request ocupa el único lugar
+        with self.assertRaises(APIError) as ctx:
+            self.client.get_transport_methods()
+        self.assertEqual(ctx.exception.status, 503)
+        self.assertEqual(ctx.exception.payload["code"], "UPSTREAM_SATURADO")
+        mock_request.assert_not_called()
+
+    @patch("requests.Session.request")
+    def test_libera_el_lugar_ante_errores(self, mock_request):
+        mock_request.side_effect = requests.Timeout("lento")
+        with self.assertRaises(APIError):
+            self.client.get_transport_methods()
+        self.assertEqual(self.client.bulkhead.en_vuelo, 0)
+
+        mock_request.side_effect = None
+        mock_request.return_value = DummyResponse(json_data={"transport_methods": []})
+        self.assertIn("transport_methods", self.client.get_transport_methods())
+        self.assertEqual(self.client.bulkhead.en_vuelo, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
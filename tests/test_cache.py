@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from utils.cache import CacheDominio, dominio, invalidar_tags, metricas, normalizar_clave
+
+
+class TestCacheDominio(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        metricas.reiniciar()
+
+    def test_get_or_set_y_metricas(self):
+        catalogo = dominio("catalogo")
+        llamadas = []
+
+        def calcular():
+            llamadas.append(1)
+            return [{"id": 1}]
+
+        self.assertEqual(catalogo.get_or_set({"q": "remera", "page": 1}, calcular), [{"id": 1}])
+        self.assertEqual(catalogo.get_or_set({"page": 1, "q": "remera"}, calcular), [{"id": 1}])
+        self.assertEqual(len(llamadas), 1)
+        resumen = metricas.resumen()["catalogo"]
+        self.assertEqual((resumen["hits"], resumen["misses"], resumen["sets"]), (1, 1, 1))
+        self.assertEqual(resumen["tasa_hits"], 0.5)
+
+    def test_claves_con_namespace_y_version(self):
+        self.assertEqual(dominio("categorias").clave("todas"), "categorias:v1:todas")
+        self.assertNotEqual(dominio("catalogo").clave("x"), dominio("pedidos").clave("x"))
+        self.assertEqual(len(normalizar_clave("a b " * 200)), 40)
+        with self.assertRaises(ValueError):
+            CacheDominio("inexistente")
+
+    def test_invalidacion_por_tag(self):
+        catalogo, pedidos = dominio("catalogo"), dominio("pedidos")
+        catalogo.set("p1", "producto 1", tags=["producto:1"])
+        catalogo.set("p2", "producto 2", tags=["producto:2"])
+        pedidos.set("resumen", "con producto 1", tags=["producto:1"])
+
+        invalidar_tags("producto:1")
+        self.assertIsNone(catalogo.get("p1"))
+        self.assertIsNone(pedidos.get("resumen"))
+        self.assertEqual(catalogo.get("p2"), "producto 2")
+
+        catalogo.invalidar_todo()
+        self.assertIsNone(catalogo.get("p2"))
+
+    def test_invalidar_mientras_se_calcula_no_deja_datos_viejos(self):
+        catalogo = dominio("catalogo")
+
+        def calcular():
+            invalidar_tags("productos")  # llega un cambio mientras se consulta el upstream
+            return "viejo"
+
+        self.assertEqual(catalogo.get_or_set("listado", calcular, tags=["productos"]), "viejo")
+        self.assertIsNone(catalogo.get("listado"))
+
+    @override_settings(CACHE_TTLS={"catalogo": 123})
+    def test_ttl_desde_settings(self):
+        self.assertEqual(dominio("catalogo").ttl, 123)
+        self.assertEqual(CacheDominio("catalogo", ttl=5).ttl, 5)
+
+
+class TestAdminCache(TestCase):
+    def test_metricas_solo_staff(self):
+        staff = get_user_model().objects.create_user(username="staff", password="x12345678", is_staff=True)
+        client = Client()
+        self.assertEqual(client.get("/administracion/cache/").status_code, 302)
+        client.force_login(staff)
+        self.assertIn("dominios", client.get("/administracion/cache/").json())
@@ -0,0 +1,70 @@
+import gzip
+import json
+from unittest import skipIf
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from Main.middleware_compression import CompressionMiddleware, brotli, sin_compresion
+
+
+def _vista_grande(request):
+    return JsonResponse({"data": [{"id": i, "nombre": "Remera básica blanca"} for i in range(200)]})
+
+
+def _vista_chica(request):
+    return JsonResponse({"ok": True})
+
+
+@override_settings(COMPRESSION_ENABLED=True, COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _procesar(self, vista, accept="gzip"):
+        request = self.factory.get("/api/product/", HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(vista)(request)
+
+    def test_comprime_json_grande(self):
+        response = self._procesar(_vista_grande)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        datos = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(datos["data"]), 200)
+
+    @skipIf(brotli is None, "brotli no está instalado")
+    def test_comprime_json_con_brotli(self):
+        response = self._procesar(_vista_grande, accept="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        datos = json.loads(brotli.decompress(response.content))
+        self.assertEqual(len(datos["data"]), 200)
+
+    def test_html_siempre_con_gzip(self):
+        # brotli no tiene el relleno aleatorio contra BREACH de GZipMiddleware
+        def _pagina(request):
+            return HttpResponse("<p>csrf</p>" * 500, content_type="text/html; charset=utf-8")
+
+        response = self._procesar(_pagina, accept="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), b"<p>csrf</p>" * 500)
+
+    def test_no_comprime_debajo_del_umbral(self):
+        response = self._procesar(_vista_chica)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_no_comprime_si_el_cliente_no_acepta(self):
+        response = self._procesar(_vista_grande, accept="identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_respeta_sin_compresion_y_tipos_binarios(self):
+        self.assertFalse(self._procesar(sin_compresion(_vista_grande)).has_header("Content-Encoding"))
+
+        def _imagen(request):
+            return HttpResponse(b"\x89PNG" + b"0" * 5000, content_type="image/png")
+
+        self.assertFalse(self._procesar(_imagen).has_header("Content-Encoding"))
+
+    @override_settings(COMPRESSION_ENABLED=False)
+    def test_desactivado_por_settings(self):
+        self.assertFalse(self._procesar(_vista_grande).has_header("Content-Encoding"))
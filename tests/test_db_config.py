@@ -0,0 +1,38 @@
+import unittest
+from pathlib import Path
+
+from Main.db_config import configuracion_db, parsear_url
+
+
+class TestConfiguracionDB(unittest.TestCase):
+    def test_sqlite_por_defecto_con_wal(self):
+        config = configuracion_db({}, Path("/app"))
+        self.assertEqual(config["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(config["NAME"], Path("/app/db.sqlite3"))
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertIn("journal_mode=WAL", config["OPTIONS"]["init_command"])
+
+        config = configuracion_db({"DB_SQLITE_WAL": "0", "DB_CONN_MAX_AGE": "0"}, Path("/app"))
+        self.assertEqual(config["OPTIONS"], {})
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+
+    def test_postgres_con_timeouts(self):
+        config = configuracion_db({"DATABASE_URL": "postgres://tienda:cl%40ve@db:5433/tienda?sslmode=require"}, Path("/app"))
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual((config["USER"], config["PASSWORD"], config["HOST"], config["PORT"], config["NAME"]),
+                         ("tienda", "cl@ve", "db", "5433", "tienda"))
+        self.assertEqual(config["OPTIONS"]["sslmode"], "require")
+        self.assertEqual(config["OPTIONS"]["options"], "-c statement_timeout=5000")
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    def test_pool_desactiva_conn_max_age(self):
+        config = configuracion_db({"DATABASE_URL": "postgresql://u:p@db/tienda", "DB_POOL_MAX": "20"}, Path("/app"))
+        self.assertEqual(config["OPTIONS"]["pool"], {"min_size": 2, "max_size": 20, "timeout": 10})
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+
+    def test_urls_sqlite_y_motor_desconocido(self):
+        self.assertEqual(parsear_url("sqlite:///datos/db.sqlite3")["NAME"], "datos/db.sqlite3")
+        self.assertEqual(parsear_url("sqlite:////var/db.sqlite3")["NAME"], "/var/db.sqlite3")
+        with self.assertRaises(ValueError):
+            parsear_url("mysql://u:p@h/db")
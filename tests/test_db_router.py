@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from apps.apis.pedidoApi.models import DireccionEnvio, Pedido
+from Main.db_router import (
+    ALIAS_REPLICA, COOKIE_STICKY, ReplicaRouter, ReplicaStickinessMiddleware, fijar_a_primaria, lectura_en_replica,
+)
+
+# réplica espejo de la base de test (TEST.MIRROR): el runner arma las conexiones
+# de test antes de setUpClass, así que el alias se registra al importar
+REPLICA_ESPEJO = {**settings.DATABASES["default"], "TEST": {"MIRROR": "default"}}
+if ALIAS_REPLICA not in connections.settings:
+    connections.settings[ALIAS_REPLICA] = connections.configure_settings(
+        {"default": dict(settings.DATABASES["default"]), ALIAS_REPLICA: dict(REPLICA_ESPEJO)}
+    )[ALIAS_REPLICA]
+
+
+@patch("Main.db_router.replica_configurada", return_value=True)
+class TestReplicaRouter(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def _leer(self):
+        return self.router.db_for_read(Pedido)
+
+    def test_solo_vistas_marcadas_leen_de_la_replica(self, _):
+        with fijar_a_primaria(False):
+            self.assertIsNone(self._leer())
+            self.assertEqual(lectura_en_replica(self._leer)(), ALIAS_REPLICA)
+
+    def test_despues_de_escribir_lee_de_la_primaria(self, _):
+        @lectura_en_replica
+        def vista():
+            antes = self._leer()
+            self.assertEqual(self.router.db_for_write(Pedido), "default")
+            return antes, self._leer()
+
+        with fijar_a_primaria(False):
+            self.assertEqual(vista(), (ALIAS_REPLICA, None))
+
+    def test_cookie_fija_al_cliente_en_la_primaria(self, _):
+        usuarios = get_user_model().objects
+
+        def escribe(request):
+            usuarios.create_user(username="nuevo", password="x12345678")
+            return HttpResponse()
+
+        def lee(request):
+            return HttpResponse(str(lectura_en_replica(self._leer)()))
+
+        factory = RequestFactory()
+        response = ReplicaStickinessMiddleware(escribe)(factory.post("/"))
+        self.assertIn(COOKIE_STICKY, response.cookies)
+
+        request = factory.get("/")
+        request.COOKIES[COOKIE_STICKY] = response.cookies[COOKIE_STICKY].value
+        self.assertEqual(ReplicaStickinessMiddleware(lee)(request).content, b"None")
+        respuesta_sin_cookie = ReplicaStickinessMiddleware(lee)(factory.get("/"))
+        self.assertEqual(respuesta_sin_cookie.content, ALIAS_REPLICA.encode())
+        self.assertNotIn(COOKIE_STICKY, respuesta_sin_cookie.cookies)
+
+    async def test_middleware_en_modo_async(self, _):
+        async def escribe(request):
+            self.router.db_for_write(Pedido)
+            return HttpResponse()
+
+        middleware = ReplicaStickinessMiddleware(escribe)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().post("/"))
+        self.assertIn(COOKIE_STICKY, response.cookies)
+
+
+class TestHistorialSinReplica(TestCase):
+    # con réplica real el TestCase no ve sus datos desde otra conexión; acá se prueba la vista
+    @patch("Main.db_router.replica_configurada", return_value=False)
+    def test_history_sigue_usando_default(self, _):
+        usuario = get_user_model().objects.create_user(username="historial", password="x12345678")
+        direccion = DireccionEnvio.objects.create(usuario=usuario, nombre_receptor="Ana", calle="Mitre 1",
+                                                  ciudad="Resistencia", codigo_postal="3500")
+        Pedido.objects.create(usuario=usuario, direccion_envio=direccion)
+        client = Client()
+        client.force_login(usuario)
+        response = client.get("/api/shopcart/history")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+        self.assertNotIn(COOKIE_STICKY, response.cookies)
+
+
+@override_settings(DATABASES={**settings.DATABASES, ALIAS_REPLICA: REPLICA_ESPEJO})
+class TestHistorialConReplicaEspejo(TransactionTestCase):
+    # TransactionTestCase: la réplica es otra conexión y sólo ve datos confirmados
+    databases = {"default", ALIAS_REPLICA}
+
+    def test_history_lee_de_la_replica(self):
+        usuario = get_user_model().objects.create_user(username="espejo", password="x12345678")
+        direccion = DireccionEnvio.objects.create(usuario=usuario, nombre_receptor="Ana", calle="Mitre 1",
+                                                  ciudad="Resistencia", codigo_postal="3500")
+        Pedido.objects.create(usuario=usuario, direccion_envio=direccion)
+        client = Client()
+        client.force_login(usuario)
+
+        # pedidos y su prefetch de detalles; sesión y usuario siguen en default
+        with self.assertNumQueries(2, using=ALIAS_REPLICA):
+            response = client.get("/api/shopcart/history")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
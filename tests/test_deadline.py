@@ -0,0 +1,96 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from Main.middleware_deadline import DeadlineMiddleware
+from utils.apiCliente.base import APIError, DeadlineExcedido
+from utils.apiCliente.deadline import HEADER_DEADLINE, deadline, tiempo_restante
+from utils.apiCliente.logistica import LogisticsClient
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self._json = json_data or {}
+        self.headers = {"Content-Type": "application/json"}
+        self.text = ""
+
+    def json(self):
+        return self._json
+
+
+class TestDeadline(unittest.TestCase):
+    def test_deadline_anidado_solo_acorta(self):
+        self.assertIsNone(tiempo_restante())
+        with deadline(1.0):
+            with deadline(30):
+                self.assertLessEqual(tiempo_restante(), 1.0)
+            with deadline(0.2):
+                self.assertLessEqual(tiempo_restante(), 0.2)
+            self.assertGreater(tiempo_restante(), 0.2)
+        self.assertIsNone(tiempo_restante())
+
+
+class TestTimeoutsDelCliente(unittest.TestCase):
+    def setUp(self):
+        self.client = LogisticsClient(base_url="https://api.test", timeout=8.0, bulkhead=False, coalesce=False)
+
+    @patch("requests.Session.request")
+    def test_connect_read_y_overrides_por_operacion(self, mock_request):
+        mock_request.return_value = DummyResponse(json_data={"transport_methods": []})
+        self.client.get_transport_methods()
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (1.0, 2.0))
+
+        self.client.list_shipments()
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (3.05, 8.0))
+
+        client = LogisticsClient(base_url="https://api.test", bulkhead=False, timeouts={"get_transport_methods": 0.5})
+        client.get_transport_methods()
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (0.5, 0.5))
+
+    @patch("requests.Session.request")
+    def test_deadline_recorta_timeout_y_se_propaga(self, mock_request):
+        mock_request.return_value = DummyResponse(status_code=201, json_data={"id": 1})
+        with deadline(1.5):
+            self.client.create_shipment(1, 1, {}, "road", [])
+        connect, read = mock_request.call_args.kwargs["timeout"]
+        self.assertLessEqual(read, 1.5)
+        self.assertLessEqual(int(mock_request.call_args.kwargs["headers"][HEADER_DEADLINE]), 1500)
+
+    @patch("requests.Session.request")
+    def test_deadline_vencido_no_llama_ni_reintenta(self, mock_request):
+        with deadline(0):
+            with self.assertRaises(DeadlineExcedido):
+                self.client.get_transport_methods()
+        mock_request.assert_not_called()
+
+        def lento(*args, **kwargs):
+            time.sleep(0.06)
+            raise requests.Timeout("lento")
+
+        mock_request.side_effect = lento
+        with deadline(0.05):
+            with self.assertRaises(APIError) as ctx:
+                self.client.get_transport_methods()
+        self.assertIsInstance(ctx.exception, DeadlineExcedido)
+        self.assertEqual(mock_request.call_count, 1)
+
+
+@override_settings(REQUEST_DEADLINE_SECONDS=10, REQUEST_DEADLINES={})
+class TestDeadlineMiddleware(SimpleTestCase):
+    def test_fija_y_restaura_el_deadline(self):
+        visto = {}
+
+        def vista(request):
+            visto["restante"] = tiempo_restante()
+            return HttpResponse("ok")
+
+        request = RequestFactory().get("/", HTTP_X_REQUEST_DEADLINE_MS="2000")
+        DeadlineMiddleware(vista)(request)
+
+        self.assertLessEqual(visto["restante"], 2.0)
+        self.assertIsNone(tiempo_restante())
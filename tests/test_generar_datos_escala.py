@@ -0,0 +1,53 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.apis.carritoApi.models import Carrito, ItemCarrito
+from apps.apis.pedidoApi.models import DetallePedido, DireccionEnvio, Pedido
+
+
+class TestGenerarDatosEscala(TestCase):
+    def _generar(self, **opciones):
+        parametros = dict(usuarios=30, pedidos=120, carritos=10, productos=50, lote=25, semilla=7)
+        parametros.update(opciones)
+        call_command("generar_datos_escala", stdout=io.StringIO(), stderr=io.StringIO(), **parametros)
+
+    def test_genera_filas_en_lotes(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            catalogo = Path(directorio) / "catalogo.json"
+            self._generar(catalogo_salida=str(catalogo))
+            productos = json.loads(catalogo.read_text(encoding="utf-8"))
+
+        self.assertEqual(len(productos), 50)
+        self.assertEqual(get_user_model().objects.filter(username__startswith="escala-").count(), 30)
+        self.assertEqual(Pedido.objects.count(), 120)
+        self.assertEqual(DireccionEnvio.objects.count(), 120)
+        self.assertEqual(Carrito.objects.count(), 10)
+        self.assertTrue(ItemCarrito.objects.exists())
+
+        pedido = Pedido.objects.prefetch_related("detalles").first()
+        self.assertTrue(1 <= pedido.detalles.count() <= 5)
+        self.assertEqual(pedido.total, sum(d.precio_total for d in pedido.detalles.all()))
+        ids_catalogo = {p["id"] for p in productos}
+        self.assertTrue(set(DetallePedido.objects.values_list("producto_id", flat=True)) <= ids_catalogo)
+        # las fechas se reparten en el pasado en lugar de quedar todas en "ahora"
+        self.assertGreater(Pedido.objects.values("creado_en").distinct().count(), 100)
+
+    def test_misma_semilla_mismos_datos(self):
+        self._generar(prefijo="a")
+        totales_a = list(Pedido.objects.order_by("pk").values_list("total", "estado"))
+        Pedido.objects.all().delete()
+        self._generar(prefijo="b")
+        totales_b = list(Pedido.objects.order_by("pk").values_list("total", "estado"))
+        self.assertEqual(totales_a, totales_b)
+
+    def test_rechaza_prefijo_existente(self):
+        self._generar(pedidos=1, usuarios=1, carritos=0)
+        with self.assertRaises(CommandError):
+            self._generar(pedidos=1, usuarios=1, carritos=0)
@@ -0,0 +1,84 @@
+import importlib
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from tools.bench_workers import comparar
+
+
+def _cargar_conf(**entorno):
+    from Main import gunicorn_conf
+
+    limpio = {k: v for k, v in os.environ.items() if not k.startswith("GUNICORN_")}
+    with patch.dict(os.environ, {**limpio, **entorno}, clear=True), \
+            patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+        return importlib.reload(gunicorn_conf)
+
+
+class TestGunicornConf(SimpleTestCase):
+    def tearDown(self):
+        _cargar_conf()
+
+    def test_gthread_por_defecto_segun_cpus(self):
+        conf = _cargar_conf()
+        self.assertEqual((conf.worker_class, conf.workers, conf.threads), ("gthread", 5, 8))
+        self.assertTrue(conf.preload_app)
+        self.assertEqual((conf.max_requests, conf.max_requests_jitter, conf.keepalive), (1000, 100, 5))
+
+    def test_modelos_y_variables(self):
+        conf = _cargar_conf(GUNICORN_WORKER_CLASS="sync")
+        self.assertEqual((conf.workers, conf.threads), (9, 1))
+
+        conf = _cargar_conf(GUNICORN_WORKER_CLASS="gevent", GUNICORN_WORKERS="2")
+        self.assertEqual(conf.workers, 2)
+        self.assertFalse(conf.preload_app)  # el monkey-patching va antes de importar la app
+
+        with self.assertRaises(ValueError):
+            _cargar_conf(GUNICORN_WORKER_CLASS="eventlet")
+
+    def test_uvicorn_sirve_asgi_con_vistas_async(self):
+        conf = _cargar_conf()
+        self.assertEqual(conf.wsgi_app, "Main.wsgi:application")
+
+        from Main import gunicorn_conf
+
+        limpio = {k: v for k, v in os.environ.items() if not k.startswith("GUNICORN_") and k != "ASYNC_VIEWS"}
+        with patch.dict(os.environ, {**limpio, "GUNICORN_WORKER_CLASS": "uvicorn"}, clear=True), \
+                patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+            conf = importlib.reload(gunicorn_conf)
+            self.assertEqual(os.environ["ASYNC_VIEWS"], "1")
+        self.assertEqual((conf.worker_class, conf.wsgi_app), ("uvicorn_worker.UvicornWorker", "Main.asgi:application"))
+        self.assertEqual((conf.workers, conf.threads), (4, 1))
+
+    def test_asgi_sin_conexiones_persistentes(self):
+        entorno = {**os.environ, "DB_CONN_MAX_AGE": "60", "LIMPIAR_PEDIDOS_AL_INICIAR": "0", "WARMUP_ENABLED": "0"}
+        salida = subprocess.run(
+            [sys.executable, "-c", "import Main.asgi; from django.conf import settings; "
+                                   "print(settings.DATABASES['default']['CONN_MAX_AGE'])"],
+            env=entorno, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(salida.stdout.strip().splitlines()[-1], "0")
+
+    def test_hooks(self):
+        conf = _cargar_conf()
+        servidor = SimpleNamespace(cfg=SimpleNamespace(preload_app=True))
+        with patch("django.db.connections.close_all") as cerrar:
+            conf.pre_fork(servidor, None)
+        cerrar.assert_called_once()
+
+        with override_settings(WARMUP_ENABLED=True), patch("Main.warmup.calentar_worker") as calentar_worker:
+            conf.post_worker_init(None)
+        calentar_worker.assert_called_once()
+
+
+class TestBenchWorkers(SimpleTestCase):
+    def test_comparar_relativo_al_primer_modelo(self):
+        def resumen(rps):
+            return {"total": {"rps": rps, "p50_ms": 1, "p95_ms": 2, "p99_ms": 3, "tasa_error": 0.0}}
+
+        filas = comparar({"sync": resumen(20.0), "gthread": resumen(120.0)})
+        self.assertEqual([(f["modelo"], f["vs_primero"]) for f in filas], [("sync", 1.0), ("gthread", 6.0)])
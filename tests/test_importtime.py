@@ -0,0 +1,25 @@
+import unittest
+
+from tools.importtime import parsear_importtime, por_paquete
+
+SALIDA = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 |     django.utils.functional
+import time:      1500 |       1800 |   django.urls
+import time:       900 |       2820 | Main.wsgi
+algo que no es de importtime
+"""
+
+
+class TestImporttime(unittest.TestCase):
+    def test_parsea_niveles_y_tiempos(self):
+        registros = parsear_importtime(SALIDA)
+        self.assertEqual([r["modulo"] for r in registros], ["_io", "django.utils.functional", "django.urls", "Main.wsgi"])
+        self.assertEqual(registros[1], {"modulo": "django.utils.functional", "propio_us": 300,
+                                        "acumulado_us": 300, "nivel": 2})
+        self.assertEqual([r["nivel"] for r in registros], [1, 2, 1, 0])
+
+    def test_por_paquete_suma_tiempo_propio(self):
+        self.assertEqual(list(por_paquete(parsear_importtime(SALIDA)).items()),
+                         [("django", 1800), ("Main", 900), ("_io", 120)])
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase
+
+from apps.apis.productoApi.models import Categoria
+from utils.cache import metricas
+
+PRODUCTOS = {"data": [
+    {"id": 1, "nombre": "Remera básica", "precio": "1000", "categoria": "Ropa", "marca": "Acme"},
+    {"id": 2, "nombre": "Zapatilla", "precio": "5000", "categoria": "Calzado", "marca": "ProSport"},
+]}
+
+
+class TestCacheInicio(TestCase):
+    def setUp(self):
+        cache.clear()
+        metricas.reiniciar()
+        parche = patch("apps.modulos.inicio.views.ProductoAPIClient")
+        self.cliente_api = parche.start().return_value
+        self.cliente_api.listar_productos.return_value = PRODUCTOS
+        self.addCleanup(parche.stop)
+
+    def test_anonimo_hit_con_filtros_normalizados(self):
+        primera = self.client.get("/", {"categoria": "Ropa", "page": "1"})
+        self.assertEqual(primera["X-Cache"], "MISS")
+        self.assertContains(primera, "Remera básica")
+
+        # otro orden, espacios, page por defecto y un parámetro ajeno: misma página
+        segunda = self.client.get("/?utm_source=x&categoria=%20Ropa%20")
+        self.assertEqual(segunda["X-Cache"], "HIT")
+        self.assertEqual(segunda.content, primera.content)
+        self.assertEqual(self.cliente_api.listar_productos.call_count, 1)
+
+        otra = self.client.get("/", {"categoria": "Calzado"})
+        self.assertEqual(otra["X-Cache"], "MISS")
+        self.assertContains(otra, "Zapatilla")
+        # mismo término de búsqueda: el listado de Stock sale del cache
+        self.assertEqual(self.cliente_api.listar_productos.call_count, 1)
+
+    def test_og_url_sin_parametros_del_primer_visitante(self):
+        self.client.get("/?utm_source=campania&categoria=Ropa&page=1")
+        cacheada = self.client.get("/?categoria=Ropa")
+        self.assertEqual(cacheada["X-Cache"], "HIT")
+        self.assertContains(cacheada, '<meta property="og:url" content="http://testserver/?categoria=Ropa">', html=False)
+        self.assertNotContains(cacheada, "utm_source")
+
+    def test_logueado_no_usa_la_pagina_cacheada(self):
+        self.client.get("/")
+        usuario = get_user_model().objects.create_user(username="cliente", password="x12345678")
+        client = Client()
+        client.force_login(usuario)
+        response = client.get("/")
+        self.assertFalse(response.has_header("X-Cache"))
+        self.assertContains(response, "Hola, cliente")
+        self.assertContains(response, "Remera básica")
+        self.assertGreater(metricas.resumen()["paginas"]["hits"], 0)  # fragmentos compartidos
+
+    def test_invalidacion_por_cambios_de_catalogo(self):
+        self.client.get("/")
+        Categoria.objects.create(nombre="Nueva")
+        self.assertEqual(self.client.get("/")["X-Cache"], "MISS")
+        self.assertEqual(self.cliente_api.listar_productos.call_count, 2)
+
+        # locmem no es compartido: en los tests se simula un backend que sí
+        with patch("apps.modulos.administracion.management.commands.invalidar_catalogo.cache_compartido",
+                   return_value=True):
+            call_command("invalidar_catalogo", stdout=open("/dev/null", "w"))
+        self.assertEqual(self.client.get("/")["X-Cache"], "MISS")
+        self.assertEqual(self.cliente_api.listar_productos.call_count, 3)
+
+    def test_comando_falla_con_cache_por_proceso(self):
+        with self.assertRaises(CommandError):
+            call_command("invalidar_catalogo", stdout=open("/dev/null", "w"))
+
+    def test_error_de_stock_no_se_cachea(self):
+        self.cliente_api.listar_productos.side_effect = ConnectionError("caído")
+        with self.assertLogs("apps.modulos.inicio.views", level="ERROR"):
+            response = self.client.get("/")
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertFalse(response.has_header("X-Cache"))
+
+        self.cliente_api.listar_productos.side_effect = None
+        self.assertContains(self.client.get("/"), "Remera básica")
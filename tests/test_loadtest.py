@@ -0,0 +1,48 @@
+import unittest
+
+from django.test import LiveServerTestCase
+
+from tools.loadtest import LoadConfig, Metricas, ejecutar_carga, elegir_journey, percentil
+
+
+class TestMetricasCarga(unittest.TestCase):
+    def test_percentil_interpola(self):
+        valores = [0.1, 0.2, 0.3, 0.4]
+        self.assertAlmostEqual(percentil(valores, 50), 0.25)
+        self.assertEqual(percentil(valores, 100), 0.4)
+        self.assertEqual(percentil([], 95), 0.0)
+
+    def test_resumen_por_paso_y_total(self):
+        metricas = Metricas()
+        for ms in (10, 20, 30):
+            metricas.registrar("inicio", ms / 1000)
+        metricas.registrar("checkout_confirmar", 0.5, "HTTP 502")
+        resumen = metricas.resumen(duracion=2.0)
+
+        self.assertEqual(resumen["pasos"]["inicio"]["requests"], 3)
+        self.assertEqual(resumen["pasos"]["inicio"]["p50_ms"], 20.0)
+        self.assertEqual(resumen["pasos"]["checkout_confirmar"]["detalle_errores"], {"HTTP 502": 1})
+        self.assertEqual(resumen["total"]["requests"], 4)
+        self.assertEqual(resumen["total"]["tasa_error"], 0.25)
+        self.assertEqual(resumen["total"]["rps"], 2.0)
+
+    def test_mezcla_ignora_pesos_en_cero(self):
+        import random
+        rng = random.Random(1)
+        elegidos = {elegir_journey({"navegacion": 0, "catalogo": 1}, rng) for _ in range(20)}
+        self.assertEqual(elegidos, {"catalogo"})
+
+
+class TestCargaContraServidor(LiveServerTestCase):
+    def test_journey_catalogo(self):
+        config = LoadConfig(base_url=self.live_server_url, usuarios=2, iteraciones=2,
+                            mezcla={"catalogo": 1}, semilla=7)
+        resumen = ejecutar_carga(config)
+
+        self.assertEqual(resumen["journeys"], {"catalogo": 4})
+        self.assertEqual(resumen["pasos"]["api_productos"]["requests"], 4)
+        self.assertEqual(resumen["pasos"]["api_productos"]["errores"], 0)
+
+    def test_mezcla_desconocida(self):
+        with self.assertRaises(ValueError):
+            ejecutar_carga(LoadConfig(base_url=self.live_server_url, mezcla={"pagar": 1}), productos=[])
@@ -0,0 +1,72 @@
+import io
+import logging
+import threading
+import unittest
+
+from utils.logging_async import HandlerAsincrono
+
+
+class StreamLento(io.StringIO):
+    """Stream que cuenta escrituras y tarda en cada una, como una consola o un pipe lleno."""
+
+    def __init__(self):
+        super().__init__()
+        self.escrituras = 0
+        self.liberar = threading.Event()
+
+    def write(self, texto):
+        self.liberar.wait(2)
+        self.escrituras += 1
+        return super().write(texto)
+
+
+class TestHandlerAsincrono(unittest.TestCase):
+    def _logger(self, handler):
+        logger = logging.getLogger(f"test.logging_async.{id(handler)}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_no_bloquea_y_escribe_por_lotes(self):
+        stream = StreamLento()
+        handler = HandlerAsincrono(stream=stream, tamano_lote=100, intervalo=0.01)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        logger = self._logger(handler)
+
+        datos = {"n": 1}
+        for n in range(50):
+            logger.info("registro %s %s", n, datos)
+        datos["n"] = 2  # los args se resuelven al loguear, no al escribir
+        # el stream todavía no escribió nada y el hilo que loguea ya terminó
+        self.assertEqual(stream.escrituras, 0)
+
+        stream.liberar.set()
+        handler.close()
+        lineas = stream.getvalue().splitlines()
+        self.assertEqual(len(lineas), 50)
+        self.assertEqual(lineas[0], "INFO registro 0 {'n': 1}")
+        self.assertLess(stream.escrituras, 50)
+
+    def test_cola_llena_descarta_sin_bloquear(self):
+        stream = StreamLento()
+        handler = HandlerAsincrono(stream=stream, capacidad=5, tamano_lote=1, intervalo=0.01)
+        logger = self._logger(handler)
+        for n in range(50):
+            logger.info("registro %s", n)
+        self.assertGreater(handler.descartados, 0)
+        stream.liberar.set()
+        handler.close()
+        self.assertIn("registros descartados", stream.getvalue())
+
+    def test_traceback_en_segundo_plano(self):
+        stream = io.StringIO()
+        handler = HandlerAsincrono(stream=stream, intervalo=0.01)
+        logger = self._logger(handler)
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("falló")
+        handler.close()
+        self.assertIn("ZeroDivisionError", stream.getvalue())
@@ -0,0 +1,108 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+
+from Main.middleware_profiling import HEADER_PERFIL, ProfilingMiddleware, firmar_token
+from utils.perfilador import PerfiladorMuestreo, cargar_perfil, guardar_perfil, listar_perfiles
+
+
+def _trabajo_lento():
+    fin = time.perf_counter() + 0.1
+    while time.perf_counter() < fin:
+        sum(range(100))
+
+
+class TestPerfiladorMuestreo(unittest.TestCase):
+    def test_muestrea_el_hilo_actual(self):
+        with PerfiladorMuestreo(intervalo=0.002) as perfilador:
+            _trabajo_lento()
+        self.assertGreater(perfilador.muestras, 5)
+        top = {f["funcion"].split(" ")[0]: f for f in perfilador.top()}
+        self.assertGreater(top["_trabajo_lento"]["acumulado_pct"], 50)
+
+    def test_guardar_listar_y_rotar(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            with PerfiladorMuestreo(intervalo=0.002) as perfilador:
+                _trabajo_lento()
+            for _ in range(3):
+                ruta = guardar_perfil(directorio, perfilador, {"path": "/x/"}, maximo=2)
+            perfiles = listar_perfiles(directorio)
+            self.assertEqual(len(perfiles), 2)
+            self.assertNotIn("pilas", perfiles[0])
+            completo = cargar_perfil(directorio, ruta.stem)
+            self.assertEqual(completo["muestras"], perfilador.muestras)
+            self.assertTrue(completo["top"])
+            self.assertIsNone(cargar_perfil(directorio, "../secreto"))
+
+
+class TestProfilingMiddleware(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ajustes = override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0.0,
+                                         PROFILING_DIR=self.directorio.name, PROFILING_INTERVAL_MS=1)
+        self.ajustes.enable()
+        Usuario = get_user_model()
+        self.staff = Usuario.objects.create_user(username="staff", password="x12345678", is_staff=True)
+        self.cliente = Usuario.objects.create_user(username="cliente", password="x12345678")
+
+    def tearDown(self):
+        self.ajustes.disable()
+        self.directorio.cleanup()
+
+    def _cantidad(self):
+        return len(list(Path(self.directorio.name).glob("*.json")))
+
+    def test_header_firmado(self):
+        Client().get("/api/product/", HTTP_X_PROFILE="falso")
+        self.assertEqual(self._cantidad(), 0)
+        response = Client().get("/api/product/", HTTP_X_PROFILE=firmar_token())
+        self.assertEqual(self._cantidad(), 1)
+        self.assertTrue(response.has_header(HEADER_PERFIL))
+
+    def test_parametro_solo_para_staff(self):
+        client = Client()
+        client.force_login(self.cliente)
+        client.get("/api/product/", {"_perfil": "1"})
+        self.assertEqual(self._cantidad(), 0)
+
+        client.force_login(self.staff)
+        client.get("/api/product/", {"_perfil": "1"})
+        self.assertEqual(self._cantidad(), 1)
+
+        # índice y detalle en el panel de administración
+        indice = client.get("/administracion/perfiles/")
+        self.assertContains(indice, "/api/product/")
+        perfil_id = listar_perfiles(self.directorio.name)[0]["id"]
+        colapsado = client.get(f"/administracion/perfiles/{perfil_id}/", {"formato": "colapsado"})
+        self.assertEqual(colapsado["Content-Type"], "text/plain; charset=utf-8")
+
+    def test_indice_solo_staff(self):
+        client = Client()
+        client.force_login(self.cliente)
+        self.assertEqual(client.get("/administracion/perfiles/").status_code, 302)
+
+    def test_async_muestrea_el_hilo_del_event_loop(self):
+        async def vista_async(request):
+            _trabajo_lento()
+            return HttpResponse("ok")
+
+        middleware = ProfilingMiddleware(vista_async)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get("/async/", HTTP_X_PROFILE=firmar_token())
+        response = asyncio.run(middleware(request))
+
+        perfil = cargar_perfil(self.directorio.name, response[HEADER_PERFIL])
+        top = {f["funcion"].split(" ")[0]: f for f in perfil["top"]}
+        self.assertGreater(top["_trabajo_lento"]["acumulado_pct"], 50)
+
+    def test_muestreo(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1.0):
+            Client().get("/api/product/")
+        self.assertEqual(listar_perfiles(self.directorio.name)[0]["motivo"], "muestreo")
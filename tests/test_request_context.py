@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import unittest
+from unittest.mock import patch
+
+from django.test import Client, TestCase
+
+from Main.logging_filters import RequestContextFilter
+from utils.apiCliente.logistica import LogisticsClient
+from utils.contexto_request import (
+    HEADER_REQUEST_ID, establecer_contexto, request_id_actual, request_id_entrante,
+    restablecer_contexto,
+)
+
+
+class DummyResponse:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+    text = ""
+
+    def json(self):
+        return {"transport_methods": []}
+
+
+class TestContextoRequest(unittest.TestCase):
+    def test_tareas_async_no_se_mezclan(self):
+        async def atender(request_id):
+            tokens = establecer_contexto(request_id)
+            await asyncio.sleep(0.01)  # otras tareas corren en el mismo hilo mientras tanto
+            visto = request_id_actual()
+            restablecer_contexto(tokens)
+            return visto
+
+        async def principal():
+            return await asyncio.gather(*(atender(f"req-{n}") for n in range(5)))
+
+        self.assertEqual(asyncio.run(principal()), [f"req-{n}" for n in range(5)])
+        self.assertIsNone(request_id_actual())
+
+    def test_filtro_de_logging(self):
+        registro = logging.LogRecord("app", logging.INFO, __file__, 1, "hola", (), None)
+        tokens = establecer_contexto("req-log", "3")
+        try:
+            RequestContextFilter().filter(registro)
+        finally:
+            restablecer_contexto(tokens)
+        self.assertEqual((registro.request_id, registro.user_id), ("req-log", "3"))
+
+    def test_id_entrante(self):
+        self.assertEqual(request_id_entrante("abc-123"), "abc-123")
+        self.assertIsNone(request_id_entrante("con espacios\ny saltos"))
+        self.assertIsNone(request_id_entrante("x" * 65))
+        self.assertIsNone(request_id_entrante("abc-123\n"))
+
+    @patch("requests.Session.request")
+    def test_cliente_reenvia_el_request_id(self, mock_request):
+        mock_request.return_value = DummyResponse()
+        cliente = LogisticsClient(base_url="https://api.test", bulkhead=False, coalesce=False)
+        tokens = establecer_contexto("req-upstream")
+        try:
+            cliente.get_transport_methods()
+        finally:
+            restablecer_contexto(tokens)
+        self.assertEqual(mock_request.call_args.kwargs["headers"][HEADER_REQUEST_ID], "req-upstream")
+
+        cliente.get_transport_methods()
+        self.assertNotIn(HEADER_REQUEST_ID, mock_request.call_args.kwargs["headers"])
+
+
+class TestMiddlewareRequestId(TestCase):
+    def test_devuelve_y_continua_el_request_id(self):
+        response = Client().get("/api/product/")
+        self.assertTrue(response[HEADER_REQUEST_ID])
+        response = Client().get("/api/product/", HTTP_X_REQUEST_ID="desde-otro-servicio")
+        self.assertEqual(response[HEADER_REQUEST_ID], "desde-otro-servicio")
+        # fuera de la request el contexto vuelve a quedar vacío
+        self.assertIsNone(request_id_actual())
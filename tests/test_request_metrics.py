@@ -0,0 +1,82 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, Client, TestCase, override_settings
+
+from Main.middleware_request_id import RequestContextMiddleware, presupuesto_excedido, server_timing
+from tools.stub_services import StubConfig, iniciar_en_hilo
+from utils.apiCliente.stock import StockClient
+from utils.metricas_request import finalizar_metricas, iniciar_metricas, metricas_actuales, registrar_sql
+
+
+class TestMetricasRequest(unittest.TestCase):
+    def test_fuera_de_request_no_registra(self):
+        self.assertIsNone(metricas_actuales())
+        registrar_sql(5.0)  # no debe fallar
+        self.assertIsNone(metricas_actuales())
+
+    def test_cuenta_llamadas_a_upstream(self):
+        servidor, base_url = iniciar_en_hilo(StubConfig(productos=5))
+        token = iniciar_metricas()
+        try:
+            cliente = StockClient(base_url=base_url, bulkhead=False, coalesce=False)
+            cliente.listar_categorias()
+            cliente.listar_categorias()
+            metricas = metricas_actuales()
+        finally:
+            finalizar_metricas(token)
+            servidor.shutdown()
+            servidor.server_close()
+        self.assertEqual(metricas.upstream_llamadas, 2)
+        self.assertGreater(metricas.upstream_ms, 0)
+
+    def test_presupuesto_y_header(self):
+        resumen = {"sql_consultas": 12, "sql_ms": 3.5, "upstream_llamadas": 1, "upstream_ms": 40.0,
+                   "app_ms": 6.5, "cpu_ms": 5.0, "total_ms": 50.0}
+        self.assertEqual(presupuesto_excedido(resumen, {"sql_consultas": 10, "total_ms": 100}),
+                         [("sql_consultas", 12, 10)])
+        self.assertIn('db;dur=3.5;desc="12 consultas"', server_timing(resumen))
+        self.assertIn("cpu;dur=5.0", server_timing(resumen))
+
+    def test_sin_cpu_bajo_asgi(self):
+        token = iniciar_metricas(medir_cpu=False)
+        try:
+            resumen = metricas_actuales().resumen()
+        finally:
+            finalizar_metricas(token)
+        self.assertIsNone(resumen["cpu_ms"])
+        self.assertNotIn("cpu;", server_timing(resumen))
+
+
+class TestMiddlewareMetricas(TestCase):
+    def setUp(self):
+        self.usuario = get_user_model().objects.create_user(username="metricas", password="x12345678")
+
+    @override_settings(SERVER_TIMING_ENABLED=True, REQUEST_BUDGETS={"inicio": {"sql_consultas": 0}})
+    def test_server_timing_y_presupuesto(self):
+        client = Client()
+        client.force_login(self.usuario)
+        with self.assertLogs("app", level="INFO") as logs:
+            response = client.get("/")
+
+        header = response["Server-Timing"]
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="[1-9]\d* consultas"')
+        self.assertIn("total;dur=", header)
+        cierre = [r for r in logs.records if r.getMessage().startswith("✅")][0]
+        self.assertGreaterEqual(cierre.metricas["sql_consultas"], 1)
+        self.assertTrue(any("excedió el presupuesto de sql_consultas" in r.getMessage() for r in logs.records))
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_sin_server_timing(self):
+        response = Client().get("/api/product/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_asgi_sin_cpu_en_server_timing(self):
+        middleware = RequestContextMiddleware(lambda request: HttpResponse())
+        request = AsyncRequestFactory().get("/")
+        response = middleware(request)
+        self.assertIsNone(request._metricas.cpu_inicio)
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertNotIn("cpu;", response["Server-Timing"])
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Asegurar que el directorio del proyecto esté en sys.path para poder importar `utils` durante tests
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from utils.apiCliente.base import APIError, DeadlineExcedido
+from utils.apiCliente.deadline import deadline
+from utils.apiCliente.singleflight import SingleFlight, clave_request
+from utils.apiCliente.stock import StockClient
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self._json = json_data or {}
+        self.headers = {"Content-Type": "application/json"}
+        self.text = ""
+
+    def json(self):
+        return self._json
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_llamadas_concurrentes_comparten_resultado(self):
+        grupo = SingleFlight()
+        liberar = threading.Event()
+        llamadas = []
+
+        def lento():
+            llamadas.append(1)
+            liberar.wait(2)
+            return {"data": [1, 2, 3]}
+
+        resultados = []
+        hilos = [threading.Thread(target=lambda: resultados.append(grupo.do("k", lento))) for _ in range(8)]
+        for h in hilos:
+            h.start()
+        while grupo.compartidas < 7:
+            time.sleep(0.005)
+        liberar.set()
+        for h in hilos:
+            h.join()
+
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(len(resultados), 8)
+        # cada seguidor recibe su copia: mutarla no afecta a los demás
+        self.assertTrue(all(r == {"data": [1, 2, 3]} for r in resultados))
+        self.assertEqual(len({id(r) for r in resultados}), 8)
+        self.assertEqual(grupo.en_vuelo(), 0)
+
+    def test_seguidor_respeta_su_deadline(self):
+        grupo = SingleFlight()
+        liberar = threading.Event()
+
+        def lento():
+            liberar.wait(2)
+            return "ok"
+
+        lider = threading.Thread(target=grupo.do, args=("k", lento))
+        lider.start()
+        while grupo.en_vuelo() == 0:
+            time.sleep(0.005)
+        inicio = time.monotonic()
+        with deadline(0.05), self.assertRaises(DeadlineExcedido):
+            grupo.do("k", lento)
+        self.assertLess(time.monotonic() - inicio, 1)
+        liberar.set()
+        lider.join()
+
+    def test_errores_se_propagan_y_la_clave_se_libera(self):
+        grupo = SingleFlight()
+
+        def falla():
+            raise APIError("caido", status=503)
+
+        with self.assertRaises(APIError):
+            grupo.do("k", falla)
+        self.assertEqual(grupo.do("k", lambda: "ok"), "ok")
+
+
+class TestCoalescenciaEnCliente(unittest.TestCase):
+    @patch("requests.Session.request")
+    def test_gets_identicos_salen_una_sola_vez(self, mock_request):
+        liberar = threading.Event()
+
+        def responder(*args, **kwargs):
+            liberar.wait(2)
+            return DummyResponse(json_data={"data": []})
+
+        mock_request.side_effect = responder
+        client = StockClient(base_url="https://api.test")
+        client.single_flight = grupo = SingleFlight()
+
+        hilos = [threading.Thread(target=client.listar_productos, kwargs={"page": 1, "limit": 5000}) for _ in range(5)]
+        for h in hilos:
+            h.start()
+        while grupo.compartidas < 4:
+            time.sleep(0.005)
+        liberar.set()
+        for h in hilos:
+            h.join()
+
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_la_clave_incluye_todos_los_headers(self):
+        base = clave_request("GET", "https://api.test/historial", None, {"Cookie": "sessionid=a"})
+        self.assertNotEqual(base, clave_request("GET", "https://api.test/historial", None, {"Cookie": "sessionid=b"}))
+        self.assertEqual(base, clave_request("get", "https://api.test/historial", {}, {"cookie": "sessionid=a"}))
+
+    @patch("requests.Session.request")
+    def test_params_distintos_o_sin_coalescer(self, mock_request):
+        mock_request.return_value = DummyResponse(json_data={"data": []})
+        client = StockClient(base_url="https://api.test", coalesce=False)
+        client.listar_productos(page=1)
+        client.listar_productos(page=1)
+        self.assertEqual(mock_request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from utils import static_storage
+
+CSS = "body { background: url('img/fondo.png'); }\n" + ".grilla { display: grid; }\n" * 40
+
+
+class TestManifestComprimido(SimpleTestCase):
+    def setUp(self):
+        origen = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.destino = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (origen / "css" / "img").mkdir(parents=True)
+        (origen / "css" / "inicio.css").write_text(CSS)
+        (origen / "css" / "img" / "fondo.png").write_bytes(b"\x89PNG" + b"\x00" * 600)
+        (origen / "css" / "chico.css").write_text("a{}")
+        self.enterContext(override_settings(
+            STATICFILES_DIRS=[origen],
+            # sin los estáticos de admin/DRF/allauth
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_ROOT=self.destino,
+            STORAGES={"staticfiles": {"BACKEND": "utils.static_storage.ManifestComprimido"}},
+        ))
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_nombres_con_hash_y_variantes(self):
+        manifest = json.loads((self.destino / "staticfiles.json").read_text())["paths"]
+        hasheado = self.destino / manifest["css/inicio.css"]
+        self.assertRegex(hasheado.name, r"^inicio\.[0-9a-f]{12}\.css$")
+        # la referencia del CSS apunta al nombre con hash de la imagen
+        self.assertIn(manifest["css/img/fondo.png"].split("/", 1)[1], hasheado.read_text())
+
+        for archivo in (hasheado, self.destino / "css" / "inicio.css"):
+            self.assertEqual(gzip.decompress(Path(f"{archivo}.gz").read_bytes()), archivo.read_bytes())
+            if static_storage.brotli is not None:
+                brotli = static_storage.brotli
+                self.assertEqual(brotli.decompress(Path(f"{archivo}.br").read_bytes()), archivo.read_bytes())
+
+        # ni imágenes ni archivos que no ganan nada comprimidos
+        self.assertFalse((self.destino / "css" / "img" / "fondo.png.gz").exists())
+        self.assertFalse((self.destino / "css" / "chico.css.gz").exists())
+
+    @override_settings(DEBUG=True)
+    def test_url_usa_el_manifest_tambien_con_debug(self):
+        self.assertRegex(staticfiles_storage.url("css/inicio.css"), r"^/static/css/inicio\.[0-9a-f]{12}\.css$")
+        self.assertEqual(staticfiles_storage.url("css/no_existe.css"), "/static/css/no_existe.css")
@@ -0,0 +1,83 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Asegurar que el directorio del proyecto esté en sys.path para poder importar `utils` y `tools` durante tests
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from tools.stub_services import StubConfig, generar_catalogo, iniciar_en_hilo, parsear_latencia
+from utils.apiCliente.base import APIError
+from utils.apiCliente.logistica import LogisticsClient
+from utils.apiCliente.stock import StockClient
+
+
+class TestStubServices(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor, cls.base_url = iniciar_en_hilo(StubConfig(productos=50))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def setUp(self):
+        self.servidor.RequestHandlerClass.estado.reset()
+        self.stock = StockClient(self.base_url, coalesce=False, bulkhead=False)
+        self.logistica = LogisticsClient(self.base_url, bulkhead=False)
+
+    def test_listado_paginado_y_streaming(self):
+        pagina = self.stock.listar_productos(page=2, limit=20)
+        self.assertEqual(pagina["pagination"]["total"], 50)
+        self.assertEqual([p["id"] for p in pagina["data"]][:2], [21, 22])
+        self.assertEqual(len(list(self.stock.iterar_productos(limit=100))), 50)
+
+    def test_reserva_idempotente_y_sin_stock(self):
+        producto = next(p for p in self.stock.iterar_productos(limit=100) if p["stock"] > 0)
+        items = [{"idProducto": producto["id"], "cantidad": 1}]
+        primera = self.stock.reservar_stock("C-1", 7, items)
+        segunda = self.stock.reservar_stock("C-1", 7, items)
+        self.assertEqual(primera["idReserva"], segunda["idReserva"])
+        self.assertEqual(self.stock.obtener_producto(producto["id"])["stock"], producto["stock"] - 1)
+
+        with self.assertRaises(APIError) as ctx:
+            self.stock.reservar_stock("C-2", 7, [{"idProducto": producto["id"], "cantidad": 10_000}])
+        self.assertEqual(ctx.exception.status, 409)
+
+    def test_envio_y_tracking(self):
+        metodos = self.logistica.get_transport_methods()
+        self.assertIn("road", [m["type"] for m in metodos["transport_methods"]])
+        envio = self.logistica.create_shipment(
+            order_id=1,
+            user_id=7,
+            delivery_address={"street": "Calle 1", "city": "Resistencia"},
+            transport_type="road",
+            products=[{"id": 1, "quantity": 2}],
+        )
+        self.assertEqual(self.logistica.get_shipment(envio["shipping_id"])["status"], "created")
+
+    def test_catalogo_deterministico_y_latencias(self):
+        self.assertEqual(generar_catalogo(10, 1), generar_catalogo(10, 1))
+        self.assertNotEqual(generar_catalogo(10, 1), generar_catalogo(10, 2))
+        import random
+        self.assertAlmostEqual(parsear_latencia("fija:250")(random.Random()), 0.25)
+        with self.assertRaises(Exception):
+            parsear_latencia("gamma:1")
+
+
+class TestStubServicesFallas(unittest.TestCase):
+    def test_tasa_error_total_devuelve_5xx(self):
+        servidor, base_url = iniciar_en_hilo(StubConfig(productos=5, tasa_error=1.0))
+        try:
+            cliente = StockClient(base_url, max_retries=0, coalesce=False, bulkhead=False)
+            with self.assertRaises(APIError) as ctx:
+                cliente.obtener_producto(1)
+            self.assertIn(ctx.exception.status, (500, 503))
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
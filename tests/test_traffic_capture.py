@@ -0,0 +1,127 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+
+from Main.middleware_capture import TrafficCaptureMiddleware, path_sanitizado
+
+from tools.replay_traffic import Replay, clave_endpoint, comparar, leer_capturas, planificar, sintetizar
+from tools.stub_services import StubConfig, iniciar_en_hilo
+
+
+class TestTrafficCaptureMiddleware(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = Path(self.directorio.name) / "trafico.jsonl"
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _registros(self):
+        return [json.loads(linea) for linea in self.ruta.read_text(encoding="utf-8").splitlines()]
+
+    def test_async_no_pasa_la_cadena_a_un_hilo(self):
+        async def vista_async(request):
+            return JsonResponse({"ok": True})
+
+        async def auser():
+            return AnonymousUser()
+
+        with override_settings(TRAFFIC_CAPTURE_ENABLED=True, TRAFFIC_CAPTURE_PATH=str(self.ruta)):
+            middleware = TrafficCaptureMiddleware(vista_async)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get("/api/product/", {"token": "abc"})
+        request.auser = auser
+        response = asyncio.run(middleware(request))
+
+        self.assertEqual(response.status_code, 200)
+        (registro,) = self._registros()
+        self.assertEqual(registro["query"], {"token": ["***"]})
+        self.assertFalse(registro["autenticado"])
+
+    def test_registra_requests_sanitizadas(self):
+        with override_settings(TRAFFIC_CAPTURE_ENABLED=True, TRAFFIC_CAPTURE_PATH=str(self.ruta)):
+            client = Client()
+            client.get("/api/product/", {"search": "remera", "token": "abc"})
+            client.get("/api/product/3/")
+            client.post(
+                "/pedidos/api/checkout/confirm/",
+                data=json.dumps({"password": "s3creta", "products": [{"productId": 3, "quantity": 2}]}),
+                content_type="application/json",
+            )
+            client.get("/static/css/estilos.css")
+
+        lectura, detalle, escritura = self._registros()
+        self.assertEqual(detalle["route"], "api/product/{pk}/")
+        self.assertEqual(detalle["path"], "/api/product/3/")
+        self.assertEqual(lectura["method"], "GET")
+        self.assertEqual(lectura["route"], "api/product/")
+        self.assertEqual(lectura["query"], {"search": ["remera"], "token": ["***"]})
+        self.assertEqual(lectura["status"], 200)
+        self.assertGreater(lectura["duracion_ms"], 0)
+
+        self.assertEqual(escritura["status"], 401)
+        self.assertEqual(escritura["body"], {
+            "tipo": "json",
+            "forma": {"password": "str", "products": [{"productId": "int", "quantity": "int"}]},
+        })
+        self.assertNotIn("s3creta", self.ruta.read_text(encoding="utf-8"))
+
+    def test_tokens_del_path_no_se_guardan(self):
+        for path, esperado in [
+            ("/accounts/confirm-email/MTk:1t2x3y:s3creto/", "/accounts/confirm-email/{key}/"),
+            ("/accounts/password/reset/key/1-abc-s3creto/", "/accounts/password/reset/key/1-{key}/"),
+            ("/api/product/3/", "/api/product/3/"),
+        ]:
+            request = RequestFactory().get(path)
+            request.resolver_match = resolve(path)
+            self.assertEqual(path_sanitizado(request), esperado)
+
+    def test_apagado_no_escribe(self):
+        with override_settings(TRAFFIC_CAPTURE_ENABLED=False, TRAFFIC_CAPTURE_PATH=str(self.ruta)):
+            Client().get("/api/product/")
+        self.assertFalse(self.ruta.exists())
+
+
+class TestReplayTraffic(SimpleTestCase):
+    def test_helpers(self):
+        self.assertEqual(sintetizar({"a": "int", "b": ["str"], "c": None}), {"a": 1, "b": ["x"], "c": None})
+        self.assertEqual(clave_endpoint({"method": "GET", "path": "/api/product/7/", "route": None}),
+                         "GET /api/product/{id}/")
+        registros = [{"ts": 100.0}, {"ts": 101.0}, {"ts": 103.0}]
+        self.assertEqual(planificar(registros, velocidad=2), [0.0, 0.5, 1.5])
+        self.assertEqual(planificar(registros, rps=10), [0.0, 0.1, 0.2])
+
+    def test_descarta_lineas_que_no_son_capturas(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as fh:
+            fh.write('{"request_id": "x", "title": "no es tráfico"}\n')
+            fh.write('{"ts": 1.0, "method": "GET", "path": "/"}\n')
+        registros, descartadas = leer_capturas([fh.name])
+        Path(fh.name).unlink()
+        self.assertEqual((len(registros), descartadas), (1, 1))
+
+    def test_replay_contra_servidor_local(self):
+        servidor, base_url = iniciar_en_hilo(StubConfig(productos=5))
+        try:
+            registros = [
+                {"ts": 10.0 + i / 100, "method": "GET", "path": "/categorias", "route": None,
+                 "query": {}, "status": 200, "duracion_ms": 5.0}
+                for i in range(5)
+            ]
+            replay = Replay(base_url, concurrencia=2)
+            replay.ejecutar(registros, planificar(registros, velocidad=10))
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        resumen = comparar(replay.resultados)["GET /categorias"]
+        self.assertEqual(resumen["requests"], 5)
+        self.assertEqual(resumen["errores"], 0)
+        self.assertEqual(resumen["status_distinto"], 0)
+        self.assertEqual(resumen["original_p50_ms"], 5.0)
@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+
+from apps.modulos.login import signals
+
+
+class TestUsernameUnico(TestCase):
+    def _crear(self, email):
+        return get_user_model().objects.create(email=email)
+
+    def test_sufijos_con_una_consulta(self):
+        Usuario = get_user_model()
+        self.assertEqual(self._crear("juan@example.com").username, "juan")
+        self.assertEqual(self._crear("juan@otro.com").username, "juan1")
+        Usuario.objects.create(username="juan41", email="x@example.com")
+        Usuario.objects.create(username="juanita", email="y@example.com")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(signals.siguiente_username("juan"), "juan42")
+        self.assertEqual(signals.siguiente_username("pedro"), "pedro")
+
+    def test_reintenta_si_el_username_se_ocupa_en_paralelo(self):
+        get_user_model().objects.create(username="ana", email="otra@example.com")
+        reales = signals.siguiente_username
+        respuestas = iter(["ana"])  # el primer cálculo "pierde la carrera" contra el alta de arriba
+
+        def siguiente(base):
+            return next(respuestas, None) or reales(base)
+
+        with patch.object(signals, "siguiente_username", side_effect=siguiente):
+            usuario = self._crear("ana@example.com")
+        self.assertEqual(usuario.username, "ana1")
+
+    def test_sufijo_fuera_de_rango_no_se_repite(self):
+        Usuario = get_user_model()
+        Usuario.objects.create(username="juan", email="a@example.com")
+        Usuario.objects.create(username="juan999999999", email="b@example.com")
+        nuevo = signals.siguiente_username("juan")
+        # queda dentro de lo que la consulta cuenta, así el próximo cálculo lo ve
+        self.assertRegex(nuevo, rf"^juan[0-9]{{1,{signals.DIGITOS_SUFIJO}}}$")
+        self.assertFalse(Usuario.objects.filter(username=nuevo).exists())
+
+    def test_no_reintenta_otros_errores_de_integridad(self):
+        usuario = get_user_model()(email="luz@example.com", username="luz")
+        guardar = Mock(side_effect=IntegrityError("NOT NULL constraint failed: usuario.password"))
+        with self.assertRaises(IntegrityError):
+            signals.guardar_con_username_generado(usuario, guardar)
+        guardar.assert_called_once()
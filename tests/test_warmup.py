@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.template import engines
+from django.template.loaders.cached import Loader as LoaderCacheado
+from django.test import SimpleTestCase, override_settings
+
+from Main import warmup
+
+SIN_LOADER_CACHEADO = [{
+    "BACKEND": "django.template.backends.django.DjangoTemplates",
+    "OPTIONS": {"loaders": ["django.template.loaders.app_directories.Loader"]},
+}]
+
+
+class TestWarmup(SimpleTestCase):
+    def _loader_cacheado(self):
+        engine = engines["django"].engine
+        return next(loader for loader in engine.template_loaders if isinstance(loader, LoaderCacheado))
+
+    def test_precarga_templates_en_el_loader_cacheado(self):
+        loader = self._loader_cacheado()
+        loader.reset()
+        resultados = warmup.calentar()
+
+        self.assertGreater(resultados["templates"]["templates"], 0)
+        self.assertIn("ms", resultados["templates"])
+        self.assertIn("inicio.html", loader.get_template_cache)
+        self.assertIn("account/signup.html", loader.get_template_cache)
+
+        # después del warm-up el render no vuelve a leer el archivo
+        with patch.object(loader.loaders[0], "get_contents", side_effect=AssertionError("leyó el archivo")), \
+                patch.object(loader.loaders[1], "get_contents", side_effect=AssertionError("leyó el archivo")):
+            engines["django"].get_template("checkout.html")
+
+    @override_settings(TEMPLATES=SIN_LOADER_CACHEADO)
+    def test_sin_loader_cacheado_no_precarga(self):
+        self.assertEqual(warmup.precargar_templates(), {"templates": 0, "errores": 0})
+
+    def test_paso_que_falla_no_impide_arrancar(self):
+        def roto():
+            raise RuntimeError("boom")
+
+        with patch.object(warmup, "PASOS", [("roto", roto)]), self.assertLogs("Main.warmup", level="ERROR"):
+            resultados = warmup.calentar()
+        self.assertTrue(resultados["roto"]["error"])
+
+    def test_pasos_de_memoria_y_del_worker(self):
+        resultados = warmup.calentar()
+        self.assertGreater(resultados["urls"]["patrones"], 0)
+        self.assertGreaterEqual(resultados["clientes"]["bulkheads"], 1)
+
+        with patch("django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection") as conectar, \
+                patch("django.db.connections.close_all") as cerrar:
+            resultados = warmup.calentar_worker()
+        self.assertEqual(resultados["cache"]["backend"], "LocMemCache")
+        self.assertIn("default", resultados["db"]["alias"])
+        conectar.assert_called()
+        # la conexión del hilo principal no queda ocupando el pool
+        cerrar.assert_called_once()
+
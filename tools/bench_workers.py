@@ -0,0 +1,149 @@
+"""Compara modelos de workers de gunicorn bajo la misma carga.
+
+Para cada modelo levanta gunicorn con Main/gunicorn_conf.py
+(``GUNICORN_WORKER_CLASS``) apuntando a Stock/Logística simulados por
+`tools/stub_services.py` con latencia, corre `tools/loadtest.py` contra él y
+al final compara throughput, percentiles y errores.
+
+    python tools/bench_workers.py --modelos sync,gthread,uvicorn --workers 3 --threads 8 \\
+        --usuarios 50 --duracion 30 --latencia lognormal:80,0.5 --json workers.json
+
+La mezcla por defecto es ``catalogo``: /api/product/ llama a Stock en cada
+request, que es el caso que más depende del modelo de workers (la página de
+inicio tiene cache de página). Con el mismo número de procesos, sync atiende
+``workers`` requests a la vez, gthread ``workers x threads`` y uvicorn
+(Main.asgi con ``ASYNC_VIEWS``) no tiene un tope fijo: cada request en
+espera es una corutina.
+
+Con muchas requests concurrentes parte de los errores pueden ser rechazos
+del bulkhead de Stock (utils/apiCliente/bulkhead.py): son intencionales y
+cuentan en ``tasa_error``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.loadtest import LoadConfig, _parsear_mezcla, ejecutar_carga  # noqa: E402
+from tools.stub_services import StubConfig, iniciar_en_hilo, parsear_latencia  # noqa: E402
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+
+def entorno_gunicorn(modelo: str, puerto: int, stub_url: str, workers: int, threads: int) -> Dict[str, str]:
+    """Variables para un gunicorn aislado: modelo, bind y upstreams apuntando al stub."""
+    return dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=modelo,
+        GUNICORN_BIND=f"127.0.0.1:{puerto}",
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_THREADS=str(threads),
+        USE_MOCK_APIS="0",
+        STOCK_API_BASE_URL=stub_url,
+        LOGISTICA_API_BASE_URL=stub_url,
+        # sin logs por request en la consola: se mide la app, no la terminal
+        LOG_LEVEL="WARNING",
+    )
+
+
+def esperar_listo(base_url: str, proceso: subprocess.Popen, timeout: float = 60.0) -> None:
+    fin = time.monotonic() + timeout
+    while time.monotonic() < fin:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"gunicorn terminó al arrancar (código {proceso.returncode})")
+        try:
+            requests.get(f"{base_url}/api/product/", params={"limit": 1}, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn no respondió en {timeout:.0f} s")
+
+
+def medir_modelo(modelo: str, args: argparse.Namespace, stub_url: str) -> Dict[str, Any]:
+    base_url = f"http://127.0.0.1:{args.puerto}"
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "python:Main.gunicorn_conf"],
+        cwd=RAIZ, env=entorno_gunicorn(modelo, args.puerto, stub_url, args.workers, args.threads),
+    )
+    try:
+        esperar_listo(base_url, proceso)
+        config = LoadConfig(base_url=base_url, usuarios=args.usuarios, duracion=args.duracion,
+                            mezcla=_parsear_mezcla(args.mezcla), timeout=args.timeout, semilla=42)
+        return ejecutar_carga(config)
+    finally:
+        proceso.send_signal(signal.SIGTERM)
+        try:
+            proceso.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+
+
+def comparar(resultados: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Una fila por modelo con los totales; ``vs_primero`` es el rps relativo al primer modelo."""
+    filas = []
+    base_rps = None
+    for modelo, resumen in resultados.items():
+        total = resumen["total"]
+        base_rps = base_rps or total["rps"] or None
+        filas.append({
+            "modelo": modelo,
+            "rps": total["rps"],
+            "p50_ms": total["p50_ms"],
+            "p95_ms": total["p95_ms"],
+            "p99_ms": total["p99_ms"],
+            "tasa_error": total["tasa_error"],
+            "vs_primero": round(total["rps"] / base_rps, 2) if base_rps else None,
+        })
+    return filas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modelos", default="sync,gthread", help="lista separada por coma: sync, gthread, gevent, uvicorn")
+    parser.add_argument("--workers", type=int, default=3, help="mismos procesos en todos los modelos")
+    parser.add_argument("--threads", type=int, default=8, help="hilos por worker en gthread")
+    parser.add_argument("--usuarios", type=int, default=50)
+    parser.add_argument("--duracion", type=float, default=30.0)
+    parser.add_argument("--mezcla", default="catalogo=1")
+    parser.add_argument("--latencia", default="lognormal:80,0.5", help="latencia del stub (ver stub_services.py)")
+    parser.add_argument("--puerto", type=int, default=8090)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", dest="salida_json")
+    args = parser.parse_args(argv)
+
+    servidor, stub_url = iniciar_en_hilo(StubConfig(productos=500, latencias={"*": parsear_latencia(args.latencia)}))
+    resultados = {}
+    try:
+        for modelo in [m.strip() for m in args.modelos.split(",") if m.strip()]:
+            print(f"== {modelo}: {args.workers} workers, {args.usuarios} usuarios, {args.duracion:.0f} s", flush=True)
+            resultados[modelo] = medir_modelo(modelo, args, stub_url)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    filas = comparar(resultados)
+    columnas = ("rps", "p50_ms", "p95_ms", "p99_ms", "tasa_error", "vs_primero")
+    print(f"{'modelo':<10}" + "".join(f"{c:>12}" for c in columnas))
+    for fila in filas:
+        print(f"{fila['modelo']:<10}" + "".join(f"{str(fila[c]):>12}" for c in columnas))
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as fh:
+            json.dump({"config": vars(args), "comparacion": filas, "resultados": resultados},
+                      fh, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Tiempo de import por módulo al arrancar la app (``python -X importtime``).
+
+Arranca un intérprete nuevo que importa ``Main.wsgi`` (django.setup(), apps,
+middlewares y, con ``--con-warmup``, el warm-up de Main/warmup.py) y resume
+la salida de ``-X importtime``: los módulos con más tiempo acumulado y el
+tiempo propio sumado por paquete de primer nivel (django, allauth,
+rest_framework, apps...).
+
+    python tools/importtime.py                      # top 25 módulos y paquetes
+    python tools/importtime.py --top 50 --json importtime.json
+    python tools/importtime.py --objetivo Main.asgi --con-warmup
+
+Los tiempos incluyen el código que corre al importar (``AppConfig.ready``,
+settings), no sólo la lectura de los .pyc. Conviene correrlo dos veces: la
+primera también compila los .pyc.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# "import time:       123 |       4567 |     paquete.modulo"
+_LINEA = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def parsear_importtime(texto: str) -> List[Dict[str, Any]]:
+    """Registros de ``-X importtime``: módulo, tiempos en µs y nivel de anidamiento (0 = import directo)."""
+    registros = []
+    for linea in texto.splitlines():
+        m = _LINEA.match(linea)
+        if m is None:
+            continue
+        propio, acumulado, sangria, modulo = m.groups()
+        registros.append({
+            "modulo": modulo,
+            "propio_us": int(propio),
+            "acumulado_us": int(acumulado),
+            "nivel": (len(sangria) - 1) // 2,
+        })
+    return registros
+
+
+def por_paquete(registros: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Tiempo propio (µs) sumado por paquete de primer nivel, de mayor a menor."""
+    totales: Dict[str, int] = defaultdict(int)
+    for registro in registros:
+        totales[registro["modulo"].split(".", 1)[0]] += registro["propio_us"]
+    return dict(sorted(totales.items(), key=lambda item: item[1], reverse=True))
+
+
+def medir(objetivo: str = "Main.wsgi", con_warmup: bool = False) -> Dict[str, Any]:
+    """Importa ``objetivo`` en un proceso nuevo y devuelve registros, total y tiempo de pared."""
+    entorno = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "Main.settings"),
+                   WARMUP_ENABLED="1" if con_warmup else "0")
+    inicio = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {objetivo}"],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True,
+    )
+    pared_ms = (time.perf_counter() - inicio) * 1000
+    if proceso.returncode != 0:
+        raise RuntimeError(f"falló el import de {objetivo}:\n{proceso.stderr[-2000:]}")
+    registros = parsear_importtime(proceso.stderr)
+    return {
+        "objetivo": objetivo,
+        "registros": registros,
+        "import_ms": round(sum(r["propio_us"] for r in registros) / 1000, 1),
+        "pared_ms": round(pared_ms, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--objetivo", default="Main.wsgi", help="módulo a importar (por defecto Main.wsgi)")
+    parser.add_argument("--con-warmup", action="store_true", help="incluir el warm-up (WARMUP_ENABLED=1)")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", dest="salida_json")
+    args = parser.parse_args(argv)
+
+    resultado = medir(args.objetivo, args.con_warmup)
+    registros = resultado["registros"]
+    paquetes = por_paquete(registros)
+
+    print(f"{args.objetivo}: {len(registros)} módulos, {resultado['import_ms']:.1f} ms importando, "
+          f"{resultado['pared_ms']:.1f} ms de arranque total")
+    print(f"\n{'módulo':<56} {'acumulado ms':>13} {'propio ms':>10}")
+    for registro in sorted(registros, key=lambda r: r["acumulado_us"], reverse=True)[:args.top]:
+        print(f"{registro['modulo']:<56} {registro['acumulado_us'] / 1000:>13.1f} {registro['propio_us'] / 1000:>10.1f}")
+    print(f"\n{'paquete':<56} {'propio ms':>13}")
+    for paquete, propio in list(paquetes.items())[:args.top]:
+        print(f"{paquete:<56} {propio / 1000:>13.1f}")
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as fh:
+            json.dump({**resultado, "paquetes_us": paquetes}, fh, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
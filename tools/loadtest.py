@@ -0,0 +1,426 @@
+"""Generador de carga de punta a punta para la tienda (navegación, carrito y checkout).
+
+Recorre journeys de usuario realistas contra un servidor levantado (idealmente
+con Stock/Logística reemplazados por `tools/stub_services.py`) y reporta, por
+paso y en total: throughput, percentiles de latencia y tasa de errores.
+
+    # 1) servicios stand-in
+    python tools/stub_services.py --port 8081 --productos 5000 --latencia lognormal:40,0.5
+    # 2) la app apuntando al stub
+    USE_MOCK_APIS=0 STOCK_API_BASE_URL=http://127.0.0.1:8081 \\
+    LOGISTICA_API_BASE_URL=http://127.0.0.1:8081 python manage.py runserver --noreload
+    # 3) la carga
+    python tools/loadtest.py --base-url http://127.0.0.1:8000 --usuarios 20 --duracion 60 \\
+        --mezcla navegacion=6,catalogo=3,compra=1 --json resultados/carga.json
+
+Journeys:
+    navegacion  GET /, búsqueda (?busqueda=), página siguiente
+    catalogo    GET /api/product/ con búsqueda y paginado, detalle de un producto
+    compra      GET /, agregar al carrito, /api/shopcart/checkout y
+                /pedidos/api/checkout/confirm/ con un usuario autenticado
+
+Para el journey de compra cada usuario virtual recibe un usuario propio
+(`carga-<corrida>-<n>`) con una sesión creada por ORM antes de arrancar, por
+eso la herramienta tiene que correr contra la misma base que el servidor.
+El JSON de salida incluye la configuración y el commit para poder comparar
+corridas entre releases.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import requests
+
+TERMINOS_BUSQUEDA = ["remera", "zapatillas", "jean", "campera", "gorra", "buzo", "urbana", "negro"]
+JOURNEYS = ("navegacion", "catalogo", "compra")
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = "http://127.0.0.1:8000"
+    usuarios: int = 10
+    duracion: float = 30.0
+    iteraciones: Optional[int] = None  # por usuario; si se indica, tiene prioridad sobre la duración
+    rampa: float = 0.0
+    pausa_min_ms: float = 0.0
+    pausa_max_ms: float = 0.0
+    mezcla: Dict[str, float] = field(default_factory=lambda: {"navegacion": 6, "catalogo": 3, "compra": 1})
+    timeout: float = 30.0
+    password: str = "Carga.12345"
+    semilla: Optional[int] = None
+
+
+# ----------------------------------------------------------------------
+# Métricas
+# ----------------------------------------------------------------------
+def percentil(ordenados: Sequence[float], p: float) -> float:
+    """Percentil con interpolación lineal sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    if len(ordenados) == 1:
+        return ordenados[0]
+    posicion = (len(ordenados) - 1) * p / 100
+    abajo = math.floor(posicion)
+    arriba = math.ceil(posicion)
+    if abajo == arriba:
+        return ordenados[abajo]
+    return ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+
+
+class Metricas:
+    """Acumula latencias y resultados por paso (thread-safe)."""
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, Counter] = defaultdict(Counter)
+        self.journeys: Counter = Counter()
+
+    def registrar(self, paso: str, segundos: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.latencias[paso].append(segundos)
+            if error:
+                self.errores[paso][error] += 1
+
+    def contar_journey(self, nombre: str) -> None:
+        with self._lock:
+            self.journeys[nombre] += 1
+
+    def _resumen_paso(self, latencias: List[float], errores: Counter, duracion: float) -> Dict[str, Any]:
+        ordenadas = sorted(latencias)
+        total = len(ordenadas)
+        cantidad_errores = sum(errores.values())
+        resumen = {
+            "requests": total,
+            "errores": cantidad_errores,
+            "tasa_error": round(cantidad_errores / total, 4) if total else 0.0,
+            "rps": round(total / duracion, 2) if duracion > 0 else 0.0,
+            "media_ms": round(1000 * sum(ordenadas) / total, 1) if total else 0.0,
+            "max_ms": round(1000 * ordenadas[-1], 1) if total else 0.0,
+        }
+        for p in self.PERCENTILES:
+            resumen[f"p{p}_ms"] = round(1000 * percentil(ordenadas, p), 1)
+        if errores:
+            resumen["detalle_errores"] = dict(errores.most_common())
+        return resumen
+
+    def resumen(self, duracion: float) -> Dict[str, Any]:
+        with self._lock:
+            pasos = {
+                paso: self._resumen_paso(lat, self.errores.get(paso, Counter()), duracion)
+                for paso, lat in sorted(self.latencias.items())
+            }
+            todas = [v for lat in self.latencias.values() for v in lat]
+            errores_totales: Counter = Counter()
+            for errores in self.errores.values():
+                errores_totales.update(errores)
+            total = self._resumen_paso(todas, errores_totales, duracion)
+            journeys = dict(self.journeys)
+        return {"duracion_s": round(duracion, 2), "journeys": journeys, "total": total, "pasos": pasos}
+
+
+# ----------------------------------------------------------------------
+# Usuarios virtuales
+# ----------------------------------------------------------------------
+class UsuarioVirtual:
+    def __init__(self, numero: int, corrida: str, config: LoadConfig, metricas: Metricas,
+                 productos: List[Dict[str, Any]], rng: random.Random) -> None:
+        self.numero = numero
+        self.corrida = corrida
+        self.config = config
+        self.metricas = metricas
+        self.productos = productos or [{"id": i, "nombre": f"Producto {i}", "precio": 0} for i in range(1, 21)]
+        self.rng = rng
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "tienda-loadtest/1.0"
+        self.autenticado = False
+
+    # --- helpers --------------------------------------------------------
+    def paso(self, nombre: str, metodo: str, path: str, esperado: Iterable[int] = (200,),
+             **kwargs: Any) -> Optional[requests.Response]:
+        headers = kwargs.pop("headers", {})
+        if metodo != "GET":
+            token = self.session.cookies.get("csrftoken")
+            if token:
+                headers.setdefault("X-CSRFToken", token)
+            headers.setdefault("Referer", self.config.base_url + path)
+        inicio = time.perf_counter()
+        try:
+            resp = self.session.request(metodo, self.config.base_url + path, headers=headers,
+                                        timeout=self.config.timeout, allow_redirects=False, **kwargs)
+        except requests.RequestException as exc:
+            self.metricas.registrar(nombre, time.perf_counter() - inicio, type(exc).__name__)
+            return None
+        # leer el cuerpo completo para medir la respuesta entera, no sólo los headers
+        _ = resp.content
+        error = None if resp.status_code in tuple(esperado) else f"HTTP {resp.status_code}"
+        self.metricas.registrar(nombre, time.perf_counter() - inicio, error)
+        return resp if error is None else None
+
+    def pausa(self) -> None:
+        if self.config.pausa_max_ms > 0:
+            time.sleep(self.rng.uniform(self.config.pausa_min_ms, self.config.pausa_max_ms) / 1000)
+
+    def producto_al_azar(self) -> Dict[str, Any]:
+        return self.rng.choice(self.productos)
+
+    # --- journeys -------------------------------------------------------
+    def navegacion(self) -> None:
+        self.paso("inicio", "GET", "/")
+        self.pausa()
+        self.paso("busqueda", "GET", "/", params={"busqueda": self.rng.choice(TERMINOS_BUSQUEDA)})
+        self.pausa()
+        self.paso("inicio_pagina", "GET", "/", params={"page": self.rng.randint(2, 5)})
+
+    def catalogo(self) -> None:
+        self.paso("api_productos", "GET", "/api/product/",
+                  params={"search": self.rng.choice(TERMINOS_BUSQUEDA), "page": 1})
+        self.pausa()
+        self.paso("api_productos_pagina", "GET", "/api/product/", params={"page": self.rng.randint(1, 5)})
+        self.pausa()
+        self.paso("api_producto_detalle", "GET", f"/api/product/{self.producto_al_azar()['id']}/")
+
+    def iniciar_sesion(self, session_key: str) -> None:
+        """Adopta una sesión ya autenticada (ver `crear_sesiones`) y fija un token CSRF propio."""
+        self.session.cookies.set("sessionid", session_key)
+        self.session.cookies.set("csrftoken", secrets.token_hex(16))
+        self.autenticado = True
+
+    def compra(self) -> None:
+        if not self.autenticado:
+            self.metricas.registrar("sin_sesion", 0.0, "sin sesión autenticada")
+            return
+        self.paso("inicio", "GET", "/")
+        self.pausa()
+        elegidos = [(self.producto_al_azar(), self.rng.randint(1, 2)) for _ in range(self.rng.randint(1, 3))]
+        items = [{"productId": p["id"], "quantity": cantidad} for p, cantidad in elegidos]
+        for item in items:
+            self.paso("carrito_agregar", "POST", "/api/shopcart/", esperado=(201,), json=item)
+        self.pausa()
+        self.paso("carrito_checkout", "POST", "/api/shopcart/checkout", esperado=(200, 201), json={
+            "items": [{"id": p["id"], "nombre": p["nombre"], "precio": p["precio"], "cantidad": cantidad}
+                      for p, cantidad in elegidos],
+            "nombre_receptor": "Usuario Carga",
+            "calle": "Av. Siempre Viva 742",
+            "ciudad": "Resistencia",
+            "cp": "3500",
+            "tipo_transporte": "domicilio",
+        })
+        self.pausa()
+        self.paso("checkout_confirmar", "POST", "/pedidos/api/checkout/confirm/", esperado=(201,), json={
+            "deliveryAddress": {
+                "nombre_receptor": "Usuario Carga",
+                "calle": "Av. Siempre Viva 742",
+                "ciudad": "Resistencia",
+                "provincia": "Chaco",
+                "codigo_postal": "3500",
+                "pais": "Argentina",
+                "telefono": "3620000000",
+            },
+            "products": items,
+            "transport_type": "road",
+            "payment_method": "card",
+            "idCompra": f"carga-{uuid.uuid4()}",
+        })
+
+    def ejecutar(self, nombre: str) -> None:
+        getattr(self, nombre)()
+        self.metricas.contar_journey(nombre)
+
+
+# ----------------------------------------------------------------------
+# Ejecución
+# ----------------------------------------------------------------------
+def elegir_journey(mezcla: Dict[str, float], rng: random.Random) -> str:
+    nombres = [n for n, peso in mezcla.items() if peso > 0]
+    return rng.choices(nombres, weights=[mezcla[n] for n in nombres])[0]
+
+
+def descubrir_productos(config: LoadConfig, limite: int = 200) -> List[Dict[str, Any]]:
+    """Toma productos reales de /api/product/ para que los journeys no pidan ids inexistentes."""
+    try:
+        resp = requests.get(f"{config.base_url}/api/product/", params={"page": 1, "limit": limite},
+                            timeout=config.timeout)
+        resp.raise_for_status()
+        datos = resp.json()
+    except (requests.RequestException, ValueError):
+        return []
+    items = (datos.get("data") or datos.get("results") or []) if isinstance(datos, dict) else datos
+    return [
+        {"id": p["id"], "nombre": p.get("nombre") or p.get("name") or f"Producto {p['id']}",
+         "precio": p.get("precio") or p.get("price") or 0}
+        for p in items if isinstance(p, dict) and "id" in p
+    ]
+
+
+def crear_sesiones(cantidad: int, corrida: str, password: str = LoadConfig.password) -> List[str]:
+    """Crea usuarios `carga-<corrida>-<n>` y una sesión autenticada para cada uno.
+
+    Se hace por ORM (como `tools/probe_checkout.py`) y no por el formulario de
+    login, así el journey de compra no depende del HTML ni de allauth. Requiere
+    apuntar a la misma base de datos que usa el servidor bajo prueba.
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Main.settings")
+        django.setup()
+
+    from importlib import import_module
+
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+
+    SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+    Usuario = get_user_model()
+    claves = []
+    for numero in range(cantidad):
+        alias = f"carga-{corrida}-{numero}"
+        usuario = Usuario.objects.filter(username=alias).first()
+        if usuario is None:
+            usuario = Usuario.objects.create_user(username=alias, email=f"{alias}@carga.local", password=password)
+        sesion = SessionStore()
+        sesion[SESSION_KEY] = str(usuario.pk)
+        sesion[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        sesion[HASH_SESSION_KEY] = usuario.get_session_auth_hash()
+        sesion.create()
+        claves.append(sesion.session_key)
+    return claves
+
+
+def ejecutar_carga(config: LoadConfig, productos: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Corre la carga y devuelve el resumen (ver `Metricas.resumen`)."""
+    desconocidos = set(config.mezcla) - set(JOURNEYS)
+    if desconocidos:
+        raise ValueError(f"Journeys desconocidos: {', '.join(sorted(desconocidos))}")
+
+    metricas = Metricas()
+    corrida = uuid.uuid4().hex[:8]
+    productos = productos if productos is not None else descubrir_productos(config)
+    semillas = random.Random(config.semilla)
+    sesiones = crear_sesiones(config.usuarios, corrida, config.password) if config.mezcla.get("compra") else []
+    fin = time.monotonic() + config.rampa + config.duracion
+
+    def trabajar(numero: int, rng: random.Random) -> None:
+        if config.rampa and config.usuarios > 1:
+            time.sleep(config.rampa * numero / config.usuarios)
+        usuario = UsuarioVirtual(numero, corrida, config, metricas, productos, rng)
+        if sesiones:
+            usuario.iniciar_sesion(sesiones[numero])
+        hechas = 0
+        while True:
+            if config.iteraciones is not None:
+                if hechas >= config.iteraciones:
+                    break
+            elif time.monotonic() >= fin:
+                break
+            usuario.ejecutar(elegir_journey(config.mezcla, rng))
+            hechas += 1
+            usuario.pausa()
+
+    hilos = [
+        threading.Thread(target=trabajar, args=(n, random.Random(semillas.random())), name=f"vu-{n}", daemon=True)
+        for n in range(config.usuarios)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return metricas.resumen(time.perf_counter() - inicio)
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def imprimir_resumen(resumen: Dict[str, Any], salida=sys.stdout) -> None:
+    columnas = ("requests", "rps", "tasa_error", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+    print(f"Duración: {resumen['duracion_s']} s  Journeys: {resumen['journeys']}", file=salida)
+    print(f"{'paso':<24}" + "".join(f"{c:>12}" for c in columnas), file=salida)
+    filas = list(resumen["pasos"].items()) + [("TOTAL", resumen["total"])]
+    for paso, datos in filas:
+        print(f"{paso:<24}" + "".join(f"{datos[c]:>12}" for c in columnas), file=salida)
+    for paso, datos in resumen["pasos"].items():
+        if datos.get("detalle_errores"):
+            print(f"  errores en {paso}: {datos['detalle_errores']}", file=salida)
+
+
+def _parsear_mezcla(valor: str) -> Dict[str, float]:
+    mezcla = {}
+    for parte in valor.split(","):
+        nombre, _, peso = parte.partition("=")
+        mezcla[nombre.strip()] = float(peso or 1)
+    return mezcla
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--base-url", default=LoadConfig.base_url)
+    parser.add_argument("--usuarios", type=int, default=LoadConfig.usuarios, help="usuarios virtuales concurrentes")
+    parser.add_argument("--duracion", type=float, default=LoadConfig.duracion, help="segundos de carga sostenida")
+    parser.add_argument("--iteraciones", type=int, help="journeys por usuario (reemplaza a --duracion)")
+    parser.add_argument("--rampa", type=float, default=0.0, help="segundos para arrancar todos los usuarios")
+    parser.add_argument("--pausa", default="0", help="think time en ms: FIJO o MIN,MAX")
+    parser.add_argument("--mezcla", default="navegacion=6,catalogo=3,compra=1",
+                        help="pesos por journey, p. ej. navegacion=6,catalogo=3,compra=1")
+    parser.add_argument("--timeout", type=float, default=LoadConfig.timeout)
+    parser.add_argument("--semilla", type=int)
+    parser.add_argument("--json", dest="salida_json", help="guardar el resumen (con metadatos) en este archivo")
+    args = parser.parse_args(argv)
+
+    pausa = [float(v) for v in args.pausa.split(",")]
+    config = LoadConfig(
+        base_url=args.base_url.rstrip("/"),
+        usuarios=args.usuarios,
+        duracion=args.duracion,
+        iteraciones=args.iteraciones,
+        rampa=args.rampa,
+        pausa_min_ms=pausa[0],
+        pausa_max_ms=pausa[-1],
+        mezcla=_parsear_mezcla(args.mezcla),
+        timeout=args.timeout,
+        semilla=args.semilla,
+    )
+    try:
+        resumen = ejecutar_carga(config)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    imprimir_resumen(resumen)
+    if args.salida_json:
+        documento = {
+            "fecha": datetime.now(timezone.utc).isoformat(),
+            "commit": _commit_actual(),
+            "config": asdict(config),
+            **resumen,
+        }
+        with open(args.salida_json, "w", encoding="utf-8") as fh:
+            json.dump(documento, fh, ensure_ascii=False, indent=2)
+    return 0 if resumen["total"]["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""Reproduce tráfico capturado por `Main.middleware_capture` y compara latencias.
+
+Lee uno o más JSONL de captura (TRAFFIC_CAPTURE_PATH, uno por proceso), los
+ordena por timestamp y reenvía cada request contra `--base-url` respetando
+los intervalos originales (escalados con `--velocidad`) o a un ritmo fijo
+(`--rps`). Al final compara, por endpoint, la latencia original contra la
+obtenida en el replay.
+
+    python tools/replay_traffic.py capturas/trafico-*.jsonl --base-url http://127.0.0.1:8000 \\
+        --velocidad 2 --concurrencia 32 --json replay.json
+
+Como la captura sólo guarda la *forma* de los bodies, los POST/PUT se
+reenvían con valores sintéticos (y pueden fallar validaciones): por eso las
+escrituras sólo se reproducen con `--incluir-escrituras`. Las requests que
+eran autenticadas se envían anónimas salvo que se pase `--cookie sessionid=...`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tools.loadtest import percentil  # noqa: E402
+
+METODOS_SEGUROS = ("GET", "HEAD", "OPTIONS")
+VALORES_SINTETICOS = {"str": "x", "int": 1, "float": 1.0, "bool": True, "Decimal": "1.00"}
+
+
+def leer_capturas(rutas: Iterable[str]) -> tuple[List[Dict[str, Any]], int]:
+    """Devuelve (registros ordenados por ts, cantidad de líneas descartadas)."""
+    registros, descartadas = [], 0
+    for ruta in rutas:
+        with open(ruta, encoding="utf-8") as fh:
+            for linea in fh:
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    descartadas += 1
+                    continue
+                if not isinstance(registro, dict) or not {"method", "path", "ts"} <= registro.keys():
+                    descartadas += 1
+                    continue
+                registros.append(registro)
+    registros.sort(key=lambda r: r["ts"])
+    return registros, descartadas
+
+
+def sintetizar(forma: Any) -> Any:
+    """Arma un valor concreto a partir de la forma guardada por la captura."""
+    if isinstance(forma, dict):
+        return {k: sintetizar(v) for k, v in forma.items()}
+    if isinstance(forma, list):
+        return [sintetizar(v) for v in forma]
+    if forma is None:
+        return None
+    return VALORES_SINTETICOS.get(forma, "x")
+
+
+def clave_endpoint(registro: Dict[str, Any]) -> str:
+    """Agrupa por ruta resuelta; si no hay, reemplaza segmentos numéricos por {id}."""
+    ruta = registro.get("route")
+    if ruta is not None:
+        ruta = "/" + ruta.lstrip("/")
+    else:
+        ruta = re.sub(r"/\d+(?=/|$)", "/{id}", registro["path"])
+    return f"{registro['method']} {ruta}"
+
+
+def planificar(registros: List[Dict[str, Any]], velocidad: float = 1.0, rps: Optional[float] = None) -> List[float]:
+    """Offset (segundos desde el inicio del replay) en el que sale cada request."""
+    if not registros:
+        return []
+    if rps:
+        return [i / rps for i in range(len(registros))]
+    inicio = registros[0]["ts"]
+    return [(r["ts"] - inicio) / velocidad for r in registros]
+
+
+class Replay:
+    def __init__(self, base_url: str, concurrencia: int = 16, timeout: float = 30.0,
+                 cookies: Optional[Dict[str, str]] = None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = cookies or {}
+        self.pool = ThreadPoolExecutor(max_workers=concurrencia, thread_name_prefix="replay")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.resultados: List[Dict[str, Any]] = []
+        self.atraso_max = 0.0  # cuánto se retrasó el envío respecto del plan (saturación del cliente)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["User-Agent"] = "tienda-replay/1.0"
+            session.cookies.update(self.cookies)
+        return session
+
+    def _enviar(self, registro: Dict[str, Any]) -> None:
+        kwargs: Dict[str, Any] = {"params": [(k, v) for k, vs in (registro.get("query") or {}).items() for v in vs]}
+        body = registro.get("body") or {}
+        if body.get("tipo") == "json":
+            kwargs["json"] = sintetizar(body.get("forma"))
+        elif body.get("tipo") == "form":
+            kwargs["data"] = sintetizar(body.get("forma"))
+        inicio = time.perf_counter()
+        try:
+            resp = self._session().request(registro["method"], self.base_url + registro["path"],
+                                           timeout=self.timeout, allow_redirects=False, **kwargs)
+            _ = resp.content
+            status, error = resp.status_code, None
+        except requests.RequestException as exc:
+            status, error = None, type(exc).__name__
+        with self._lock:
+            self.resultados.append({
+                "endpoint": clave_endpoint(registro),
+                "original_ms": registro.get("duracion_ms"),
+                "replay_ms": (time.perf_counter() - inicio) * 1000,
+                "status_original": registro.get("status"),
+                "status": status,
+                "error": error,
+            })
+
+    def ejecutar(self, registros: List[Dict[str, Any]], offsets: List[float]) -> float:
+        inicio = time.perf_counter()
+        for registro, offset in zip(registros, offsets):
+            espera = offset - (time.perf_counter() - inicio)
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                self.atraso_max = max(self.atraso_max, -espera)
+            self.pool.submit(self._enviar, registro)
+        self.pool.shutdown(wait=True)
+        return time.perf_counter() - inicio
+
+
+def comparar(resultados: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Resumen por endpoint: percentiles originales vs replay y diferencias de status."""
+    grupos: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for r in resultados:
+        grupos[r["endpoint"]].append(r)
+    resumen = {}
+    for endpoint, filas in sorted(grupos.items()):
+        originales = sorted(f["original_ms"] for f in filas if f["original_ms"] is not None)
+        replay = sorted(f["replay_ms"] for f in filas)
+        p50_original = percentil(originales, 50)
+        p50_replay = percentil(replay, 50)
+        resumen[endpoint] = {
+            "requests": len(filas),
+            "original_p50_ms": round(p50_original, 1),
+            "original_p95_ms": round(percentil(originales, 95), 1),
+            "replay_p50_ms": round(p50_replay, 1),
+            "replay_p95_ms": round(percentil(replay, 95), 1),
+            "ratio_p50": round(p50_replay / p50_original, 2) if p50_original else None,
+            "errores": sum(1 for f in filas if f["error"] or (f["status"] or 0) >= 500),
+            "status_distinto": sum(1 for f in filas if f["status"] != f["status_original"]),
+        }
+    return resumen
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("capturas", nargs="+", help="archivos JSONL generados por TrafficCaptureMiddleware")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--velocidad", type=float, default=1.0, help="factor sobre el ritmo original (2 = el doble de rápido)")
+    parser.add_argument("--rps", type=float, help="ritmo fijo en requests/s (ignora los intervalos originales)")
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--limite", type=int, help="reproducir sólo las primeras N requests")
+    parser.add_argument("--incluir-escrituras", action="store_true", help="reenviar también POST/PUT/PATCH/DELETE")
+    parser.add_argument("--cookie", action="append", default=[], help="NOMBRE=VALOR (repetible), p. ej. sessionid=...")
+    parser.add_argument("--json", dest="salida_json")
+    args = parser.parse_args(argv)
+
+    if args.velocidad <= 0:
+        parser.error("--velocidad tiene que ser mayor que 0")
+
+    registros, descartadas = leer_capturas(args.capturas)
+    if not args.incluir_escrituras:
+        registros = [r for r in registros if r["method"] in METODOS_SEGUROS]
+    if args.limite:
+        registros = registros[:args.limite]
+    if descartadas:
+        print(f"Se descartaron {descartadas} líneas que no son registros de captura", file=sys.stderr)
+    if not registros:
+        print("No hay requests para reproducir", file=sys.stderr)
+        return 1
+
+    cookies = dict(c.split("=", 1) for c in args.cookie)
+    replay = Replay(args.base_url, args.concurrencia, args.timeout, cookies)
+    duracion = replay.ejecutar(registros, planificar(registros, args.velocidad, args.rps))
+    resumen = comparar(replay.resultados)
+
+    print(f"{len(registros)} requests en {duracion:.1f} s ({len(registros) / duracion:.1f} rps); "
+          f"atraso máximo del planificador {replay.atraso_max * 1000:.0f} ms")
+    columnas = ("requests", "original_p50_ms", "replay_p50_ms", "original_p95_ms", "replay_p95_ms",
+                "ratio_p50", "errores", "status_distinto")
+    print(f"{'endpoint':<40}" + "".join(f"{c:>16}" for c in columnas))
+    for endpoint, datos in resumen.items():
+        print(f"{endpoint:<40}" + "".join(f"{str(datos[c]):>16}" for c in columnas))
+
+    if args.salida_json:
+        with open(args.salida_json, "w", encoding="utf-8") as fh:
+            json.dump({"duracion_s": round(duracion, 2), "requests": len(registros), "endpoints": resumen},
+                      fh, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
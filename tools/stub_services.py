@@ -0,0 +1,586 @@
+"""Servicios stand-in de Stock y Logística para pruebas de carga y benchmarks.
+
+Levanta un servidor HTTP local (proceso aparte, sin Django) que implementa
+los contratos que consumen `StockClient` y `LogisticsClient`
+(`utils/apiCliente`), con latencia, errores y timeouts configurables.
+
+Uso típico (los dos servicios en el mismo puerto, las rutas no se pisan):
+
+    python tools/stub_services.py --port 8081 --productos 5000 \\
+        --latencia stock=lognormal:30,0.4 --latencia logistica=lognormal:180,0.8 \\
+        --tasa-error 0.01 --tasa-timeout 0.002
+
+y en la app:
+
+    USE_MOCK_APIS=0 STOCK_API_BASE_URL=http://127.0.0.1:8081 \\
+    LOGISTICA_API_BASE_URL=http://127.0.0.1:8081 python manage.py runserver
+
+Distribuciones de latencia (en milisegundos):
+    fija:MS | uniforme:MIN,MAX | normal:MEDIA,DESVIO | lognormal:MEDIANA,SIGMA | exponencial:MEDIA
+
+Fallas inyectadas (por request, independientes):
+    --tasa-error    responde 500/503 con un cuerpo de error
+    --tasa-timeout  se queda colgado `--duracion-timeout` segundos antes de responder
+    --tasa-corte    cierra la conexión sin responder
+
+`GET /__stub__/estado` devuelve contadores (requests, errores inyectados,
+reservas, envíos) y `POST /__stub__/reset` limpia el estado en memoria.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SERVICIOS = ("stock", "logistica")
+
+CATEGORIAS = ["Remeras", "Pantalones", "Zapatillas", "Abrigos", "Accesorios", "Tecnología"]
+MARCAS = ["UrbanFit", "ProSport", "ClassicLine", "DenimCo", "StepUp", "NorthWind"]
+ADJETIVOS = ["básica", "oversize", "vintage", "dry-fit", "slim", "retro", "urbana", "térmica"]
+COLORES = ["blanco", "negro", "azul", "gris", "verde", "rojo", "beige"]
+
+METODOS_TRANSPORTE = [
+    {"type": "road", "name": "Transporte terrestre", "estimated_days": "3-5"},
+    {"type": "air", "name": "Transporte aéreo", "estimated_days": "1-2"},
+    {"type": "rail", "name": "Transporte ferroviario", "estimated_days": "5-7"},
+    {"type": "sea", "name": "Transporte marítimo", "estimated_days": "15-30"},
+]
+COSTO_POR_UNIDAD = {"road": 1200.0, "air": 3500.0, "rail": 800.0, "sea": 500.0}
+
+
+# ----------------------------------------------------------------------
+# Latencias
+# ----------------------------------------------------------------------
+def parsear_latencia(spec: str) -> Callable[[random.Random], float]:
+    """Convierte 'lognormal:30,0.4' en una función que devuelve segundos."""
+    nombre, _, args = spec.partition(":")
+    valores = [float(v) for v in args.split(",") if v.strip()] if args else []
+    nombre = nombre.strip().lower()
+
+    if nombre == "fija" and len(valores) == 1:
+        ms = valores[0]
+        return lambda rng: ms / 1000
+    if nombre == "uniforme" and len(valores) == 2:
+        return lambda rng: rng.uniform(*valores) / 1000
+    if nombre == "normal" and len(valores) == 2:
+        return lambda rng: max(0.0, rng.gauss(*valores)) / 1000
+    if nombre == "lognormal" and len(valores) == 2:
+        mu = math.log(max(valores[0], 1e-3))
+        return lambda rng: rng.lognormvariate(mu, valores[1]) / 1000
+    if nombre == "exponencial" and len(valores) == 1:
+        return lambda rng: rng.expovariate(1 / max(valores[0], 1e-3)) / 1000
+    raise argparse.ArgumentTypeError(f"Distribución de latencia inválida: {spec!r}")
+
+
+# ----------------------------------------------------------------------
+# Configuración y estado
+# ----------------------------------------------------------------------
+@dataclass
+class StubConfig:
+    servicios: Tuple[str, ...] = SERVICIOS
+    productos: int = 200
+    semilla: int = 42
+    catalogo: Optional[List[Dict[str, Any]]] = None
+    # latencia por servicio ("*" aplica a todos los que no tengan una propia)
+    latencias: Dict[str, Callable[[random.Random], float]] = field(default_factory=dict)
+    tasa_error: float = 0.0
+    tasa_timeout: float = 0.0
+    tasa_corte: float = 0.0
+    duracion_timeout: float = 30.0
+    compresion_min_bytes: int = 1024
+
+    def latencia(self, servicio: str) -> Optional[Callable[[random.Random], float]]:
+        return self.latencias.get(servicio) or self.latencias.get("*")
+
+
+def generar_catalogo(cantidad: int, semilla: int) -> List[Dict[str, Any]]:
+    """Catálogo determinístico: misma semilla y cantidad, mismos productos."""
+    rng = random.Random(semilla)
+    productos = []
+    for i in range(1, cantidad + 1):
+        categoria = CATEGORIAS[(i - 1) % len(CATEGORIAS)]
+        marca = rng.choice(MARCAS)
+        nombre = f"{categoria[:-1] if categoria.endswith('s') else categoria} {rng.choice(ADJETIVOS)} {rng.choice(COLORES)} #{i}"
+        precio = round(rng.uniform(2500, 60000), 2)
+        productos.append({
+            "id": i,
+            "nombre": nombre,
+            "name": nombre,
+            "descripcion": f"{nombre} de la marca {marca}.",
+            "precio": precio,
+            "price": precio,
+            "stock": rng.randint(0, 200),
+            "categoria": {"id": CATEGORIAS.index(categoria) + 1, "nombre": categoria},
+            "marca": marca,
+            "imagen_url": f"/static/imagenes/mock/producto_{i}.webp",
+        })
+    return productos
+
+
+class EstadoStub:
+    """Estado en memoria de los servicios (reservas, envíos, stock)."""
+
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.semilla)
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            productos = self.config.catalogo or generar_catalogo(self.config.productos, self.config.semilla)
+            self.productos = {p["id"]: dict(p) for p in productos}
+            self.lista_productos = list(self.productos.values())
+            self.categorias = [{"id": i + 1, "nombre": c} for i, c in enumerate(CATEGORIAS)]
+            self.reservas: Dict[int, Dict[str, Any]] = {}
+            self.reservas_por_compra: Dict[str, int] = {}
+            self.envios: Dict[int, Dict[str, Any]] = {}
+            self.contadores = {"requests": 0, "errores": 0, "timeouts": 0, "cortes": 0}
+
+    def sortear(self, tasa: float) -> bool:
+        if tasa <= 0:
+            return False
+        with self.lock:
+            return self.rng.random() < tasa
+
+    def demora(self, servicio: str) -> float:
+        distribucion = self.config.latencia(servicio)
+        if distribucion is None:
+            return 0.0
+        with self.lock:
+            return distribucion(self.rng)
+
+
+# ----------------------------------------------------------------------
+# Rutas
+# ----------------------------------------------------------------------
+class Respuesta(Exception):
+    """Permite cortar el handler devolviendo (status, cuerpo)."""
+
+    def __init__(self, status: int, cuerpo: Any):
+        self.status = status
+        self.cuerpo = cuerpo
+
+
+def _entero(valor: Any, defecto: int) -> int:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return defecto
+
+
+def _ahora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _paginar(items: List[Any], query: Dict[str, str], por_defecto: int = 20) -> Dict[str, Any]:
+    page = max(1, _entero(query.get("page"), 1))
+    limit = max(1, _entero(query.get("limit"), por_defecto))
+    total = len(items)
+    inicio = (page - 1) * limit
+    return {
+        "data": items[inicio:inicio + limit],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": max(1, math.ceil(total / limit)),
+        },
+    }
+
+
+def stock_productos(estado: EstadoStub, query, cuerpo, params):
+    productos = estado.lista_productos
+    q = (query.get("q") or query.get("search") or "").strip().lower()
+    categoria_id = _entero(query.get("categoriaId"), 0)
+    if q or categoria_id:
+        productos = [
+            p for p in productos
+            if (not q or q in p["nombre"].lower() or q in p["descripcion"].lower())
+            and (not categoria_id or p["categoria"]["id"] == categoria_id)
+        ]
+    return 200, _paginar(productos, query)
+
+
+def stock_producto(estado: EstadoStub, query, cuerpo, params):
+    producto = estado.productos.get(_entero(params[0], -1))
+    if producto is None:
+        raise Respuesta(404, {"error": "Producto no encontrado", "code": "PRODUCT_NOT_FOUND"})
+    return 200, producto
+
+
+def stock_categorias(estado: EstadoStub, query, cuerpo, params):
+    return 200, estado.categorias
+
+
+def stock_categoria(estado: EstadoStub, query, cuerpo, params):
+    for categoria in estado.categorias:
+        if categoria["id"] == _entero(params[0], -1):
+            return 200, categoria
+    raise Respuesta(404, {"error": "Categoría no encontrada"})
+
+
+def stock_reservar(estado: EstadoStub, query, cuerpo, params):
+    cuerpo = cuerpo or {}
+    id_compra = str(cuerpo.get("idCompra") or "")
+    items = cuerpo.get("productos") or cuerpo.get("products") or []
+    if not id_compra or not items:
+        raise Respuesta(400, {"error": "Faltan idCompra o productos"})
+
+    with estado.lock:
+        # idCompra funciona como clave de idempotencia
+        existente = estado.reservas_por_compra.get(id_compra)
+        if existente is not None:
+            return 200, estado.reservas[existente]
+
+        pedidos = []
+        for item in items:
+            pid = _entero(item.get("idProducto", item.get("productId")), -1)
+            cantidad = _entero(item.get("cantidad", item.get("quantity")), 0)
+            producto = estado.productos.get(pid)
+            if producto is None:
+                raise Respuesta(404, {"error": "Producto no encontrado", "detail": {"productId": pid}})
+            if cantidad < 1 or producto["stock"] < cantidad:
+                raise Respuesta(409, {
+                    "error": "Insufficient stock",
+                    "detail": {"productId": pid, "available": producto["stock"], "requested": cantidad},
+                })
+            pedidos.append((producto, cantidad))
+
+        for producto, cantidad in pedidos:
+            producto["stock"] -= cantidad
+        id_reserva = len(estado.reservas) + 1
+        reserva = {
+            "idReserva": id_reserva,
+            "id": id_reserva,
+            "idCompra": id_compra,
+            "usuarioId": cuerpo.get("usuarioId"),
+            "estado": "confirmado",
+            "productos": [{"idProducto": p["id"], "cantidad": c} for p, c in pedidos],
+            "expiresAt": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            "fechaCreacion": _ahora(),
+        }
+        estado.reservas[id_reserva] = reserva
+        estado.reservas_por_compra[id_compra] = id_reserva
+    return 200, reserva
+
+
+def stock_liberar(estado: EstadoStub, query, cuerpo, params):
+    id_reserva = _entero((cuerpo or {}).get("idReserva"), -1)
+    with estado.lock:
+        reserva = estado.reservas.get(id_reserva)
+        if reserva is None:
+            raise Respuesta(404, {"error": "Reserva no encontrada"})
+        if reserva["estado"] != "liberado":
+            for item in reserva["productos"]:
+                estado.productos[item["idProducto"]]["stock"] += item["cantidad"]
+            reserva["estado"] = "liberado"
+            reserva["motivo"] = (cuerpo or {}).get("motivo")
+    return 200, {"mensaje": "Stock liberado correctamente", "idReserva": id_reserva}
+
+
+def stock_reservas(estado: EstadoStub, query, cuerpo, params):
+    usuario = _entero(query.get("usuarioId"), -1)
+    reservas = [r for r in estado.reservas.values() if r.get("usuarioId") == usuario]
+    if query.get("estado"):
+        reservas = [r for r in reservas if r["estado"] == query["estado"]]
+    return 200, _paginar(reservas, query)
+
+
+def stock_reserva(estado: EstadoStub, query, cuerpo, params):
+    reserva = estado.reservas.get(_entero(params[0], -1))
+    if reserva is None:
+        raise Respuesta(404, {"error": "Reserva no encontrada"})
+    return 200, reserva
+
+
+def _costo_envio(cuerpo: Dict[str, Any]) -> Dict[str, Any]:
+    transporte = cuerpo.get("transport_type") or "road"
+    unidades = sum(_entero(p.get("quantity"), 1) for p in cuerpo.get("products") or [])
+    costo = round(COSTO_POR_UNIDAD.get(transporte, 1500.0) * max(unidades, 1), 2)
+    return {"currency": "ARS", "total_cost": costo, "transport_type": transporte}
+
+
+def logistica_costo(estado: EstadoStub, query, cuerpo, params):
+    cuerpo = cuerpo or {}
+    if not cuerpo.get("delivery_address") or not cuerpo.get("products"):
+        raise Respuesta(400, {"error": "Faltan delivery_address o products"})
+    return 200, _costo_envio(cuerpo)
+
+
+def logistica_metodos(estado: EstadoStub, query, cuerpo, params):
+    return 200, {"transport_methods": METODOS_TRANSPORTE}
+
+
+def logistica_crear_envio(estado: EstadoStub, query, cuerpo, params):
+    cuerpo = cuerpo or {}
+    if not cuerpo.get("order_id") or not cuerpo.get("products"):
+        raise Respuesta(400, {"error": "Faltan order_id o products"})
+    with estado.lock:
+        id_envio = len(estado.envios) + 1
+        envio = {
+            "id": id_envio,
+            "shipping_id": id_envio,
+            "tracking_id": id_envio,
+            "trackingId": f"TRK-{id_envio}",
+            "order_id": cuerpo.get("order_id"),
+            "user_id": cuerpo.get("user_id"),
+            "delivery_address": cuerpo.get("delivery_address"),
+            "transport_type": cuerpo.get("transport_type"),
+            "products": cuerpo.get("products"),
+            "status": "created",
+            "estimated_delivery_at": (datetime.now(timezone.utc) + timedelta(days=4)).isoformat(),
+            "created_at": _ahora(),
+            **_costo_envio(cuerpo),
+        }
+        estado.envios[id_envio] = envio
+    return 201, envio
+
+
+def logistica_envios(estado: EstadoStub, query, cuerpo, params):
+    envios = list(estado.envios.values())
+    if query.get("user_id"):
+        envios = [e for e in envios if str(e.get("user_id")) == query["user_id"]]
+    if query.get("status"):
+        envios = [e for e in envios if e["status"] == query["status"]]
+    pagina = _paginar(envios, query)
+    return 200, {"shipments": pagina["data"], "pagination": pagina["pagination"]}
+
+
+def logistica_envio(estado: EstadoStub, query, cuerpo, params):
+    envio = estado.envios.get(_entero(params[0], -1))
+    if envio is None:
+        raise Respuesta(404, {"error": "Envío no encontrado"})
+    return 200, envio
+
+
+def logistica_cancelar(estado: EstadoStub, query, cuerpo, params):
+    with estado.lock:
+        envio = estado.envios.get(_entero(params[0], -1))
+        if envio is None:
+            raise Respuesta(404, {"error": "Envío no encontrado"})
+        if envio["status"] not in ("created", "reserved"):
+            raise Respuesta(400, {"error": "El envío ya no se puede cancelar"})
+        envio["status"] = "cancelled"
+    return 200, envio
+
+
+RUTAS: List[Tuple[str, str, "re.Pattern[str]", Callable]] = [
+    ("stock", "GET", re.compile(r"^/productos/?$"), stock_productos),
+    ("stock", "GET", re.compile(r"^/productos/(\d+)/?$"), stock_producto),
+    ("stock", "GET", re.compile(r"^/categorias/?$"), stock_categorias),
+    ("stock", "GET", re.compile(r"^/categorias/(\d+)/?$"), stock_categoria),
+    ("stock", "POST", re.compile(r"^/stock/reservar/?$"), stock_reservar),
+    ("stock", "POST", re.compile(r"^/stock/liberar/?$"), stock_liberar),
+    ("stock", "GET", re.compile(r"^/reservas/?$"), stock_reservas),
+    ("stock", "GET", re.compile(r"^/reservas/(\d+)/?$"), stock_reserva),
+    ("logistica", "POST", re.compile(r"^/shipping/cost/?$"), logistica_costo),
+    ("logistica", "GET", re.compile(r"^/shipping/transport-methods/?$"), logistica_metodos),
+    ("logistica", "POST", re.compile(r"^/shipping/?$"), logistica_crear_envio),
+    ("logistica", "GET", re.compile(r"^/shipping/?$"), logistica_envios),
+    ("logistica", "GET", re.compile(r"^/shipping/(\d+)/?$"), logistica_envio),
+    ("logistica", "POST", re.compile(r"^/shipping/(\d+)/cancel/?$"), logistica_cancelar),
+    ("logistica", "POST", re.compile(r"^/logistics/tracking/?$"), logistica_crear_envio),
+    ("logistica", "GET", re.compile(r"^/logistics/tracking/(\d+)/?$"), logistica_envio),
+]
+
+
+# ----------------------------------------------------------------------
+# Servidor HTTP
+# ----------------------------------------------------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como un upstream real
+    # headers y cuerpo salen en dos writes: sin esto Nagle + delayed ACK suman ~40 ms por respuesta
+    disable_nagle_algorithm = True
+    server_version = "StubServices/1.0"
+    estado: EstadoStub  # lo fija crear_servidor
+
+    def log_message(self, format, *args):  # noqa: A002 - firma de BaseHTTPRequestHandler
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def _atender(self, metodo: str) -> None:
+        partes = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        largo = _entero(self.headers.get("Content-Length"), 0)
+        crudo = self.rfile.read(largo) if largo else b""
+
+        if partes.path.startswith("/__stub__/"):
+            return self._control(metodo, partes.path)
+
+        estado = self.estado
+        with estado.lock:
+            estado.contadores["requests"] += 1
+
+        for servicio, metodo_ruta, patron, handler in RUTAS:
+            if servicio not in estado.config.servicios or metodo_ruta != metodo:
+                continue
+            match = patron.match(partes.path)
+            if match:
+                break
+        else:
+            return self._responder(404, {"error": "Ruta no encontrada", "path": partes.path})
+
+        demora = estado.demora(servicio)
+        if demora:
+            time.sleep(demora)
+
+        if estado.sortear(estado.config.tasa_corte):
+            with estado.lock:
+                estado.contadores["cortes"] += 1
+            self.close_connection = True
+            return
+        if estado.sortear(estado.config.tasa_timeout):
+            with estado.lock:
+                estado.contadores["timeouts"] += 1
+            time.sleep(estado.config.duracion_timeout)
+            return self._responder(504, {"error": "Timeout simulado"})
+        if estado.sortear(estado.config.tasa_error):
+            with estado.lock:
+                estado.contadores["errores"] += 1
+            status = 503 if estado.sortear(0.5) else 500
+            return self._responder(status, {"error": "Error simulado", "code": "STUB_FAULT"})
+
+        try:
+            cuerpo = json.loads(crudo) if crudo else None
+        except ValueError:
+            return self._responder(400, {"error": "JSON inválido"})
+        try:
+            status, payload = handler(estado, query, cuerpo, match.groups())
+        except Respuesta as resp:
+            status, payload = resp.status, resp.cuerpo
+        self._responder(status, payload)
+
+    def _control(self, metodo: str, path: str) -> None:
+        estado = self.estado
+        if metodo == "POST" and path.rstrip("/") == "/__stub__/reset":
+            estado.reset()
+            return self._responder(200, {"ok": True})
+        with estado.lock:
+            resumen = dict(estado.contadores, reservas=len(estado.reservas), envios=len(estado.envios),
+                           productos=len(estado.productos))
+        self._responder(200, resumen)
+
+    def _responder(self, status: int, payload: Any) -> None:
+        cuerpo = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        min_bytes = self.estado.config.compresion_min_bytes
+        if "gzip" in self.headers.get("Accept-Encoding", "") and len(cuerpo) >= min_bytes:
+            cuerpo = gzip.compress(cuerpo, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+    verbose = False
+
+
+def crear_servidor(config: StubConfig, host: str = "127.0.0.1", port: int = 8081) -> StubServer:
+    """Crea el servidor (sin arrancarlo). Con port=0 elige un puerto libre."""
+    handler = type("Handler", (StubHandler,), {"estado": EstadoStub(config)})
+    return StubServer((host, port), handler)
+
+
+def iniciar_en_hilo(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[StubServer, str]:
+    """Arranca el servidor en un hilo daemon; devuelve (servidor, base_url)."""
+    servidor = crear_servidor(config, host, port)
+    threading.Thread(target=servidor.serve_forever, name="stub-services", daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def _parsear_latencias(valores: List[str]) -> Dict[str, Callable[[random.Random], float]]:
+    latencias = {}
+    for valor in valores or []:
+        servicio, sep, spec = valor.partition("=")
+        if not sep:
+            servicio, spec = "*", valor
+        if servicio != "*" and servicio not in SERVICIOS:
+            raise argparse.ArgumentTypeError(f"Servicio desconocido en --latencia: {servicio}")
+        latencias[servicio] = parsear_latencia(spec)
+    return latencias
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--servicios", default="stock,logistica", help="stock, logistica o ambos separados por coma")
+    parser.add_argument("--productos", type=int, default=200, help="tamaño del catálogo generado")
+    parser.add_argument("--catalogo", help="archivo JSON con la lista de productos (reemplaza al generado)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--latencia", action="append", default=[],
+                        help="[servicio=]distribucion, p. ej. logistica=lognormal:180,0.8 (repetible)")
+    parser.add_argument("--tasa-error", type=float, default=0.0)
+    parser.add_argument("--tasa-timeout", type=float, default=0.0)
+    parser.add_argument("--tasa-corte", type=float, default=0.0)
+    parser.add_argument("--duracion-timeout", type=float, default=30.0, help="segundos colgado en un timeout simulado")
+    parser.add_argument("--verbose", action="store_true", help="loguear cada request")
+    args = parser.parse_args(argv)
+
+    servicios = tuple(s.strip() for s in args.servicios.split(",") if s.strip())
+    desconocidos = set(servicios) - set(SERVICIOS)
+    if desconocidos:
+        parser.error(f"Servicios desconocidos: {', '.join(sorted(desconocidos))}")
+
+    catalogo = None
+    if args.catalogo:
+        with open(args.catalogo, encoding="utf-8") as fh:
+            catalogo = json.load(fh)
+
+    try:
+        latencias = _parsear_latencias(args.latencia)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    config = StubConfig(
+        servicios=servicios,
+        productos=args.productos,
+        semilla=args.semilla,
+        catalogo=catalogo,
+        latencias=latencias,
+        tasa_error=args.tasa_error,
+        tasa_timeout=args.tasa_timeout,
+        tasa_corte=args.tasa_corte,
+        duracion_timeout=args.duracion_timeout,
+    )
+    servidor = crear_servidor(config, args.host, args.port)
+    servidor.verbose = args.verbose
+    print(f"Stub {'+'.join(servicios)} escuchando en http://{args.host}:{servidor.server_address[1]} "
+          f"({len(servidor.RequestHandlerClass.estado.productos)} productos)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
 """Paquete de clientes HTTP para servicios externos.
 
 Exporta: BaseAPIClient está en `base.py`. Clientes concretos: `StockClient`, `LogisticsClient`, `EnviosClient`.
+Los codecs JSON (y el parser incremental) están en `codec.py`.
 """
 from .base import BaseAPIClient, APIError
+from .codec import JSONCodec, obtener_codec, iter_json_array
 from .stock import StockClient
 from .logistica import LogisticsClient
 
-__all__ = ["BaseAPIClient", "APIError", "StockClient", "LogisticsClient"]
+__all__ = ["BaseAPIClient", "APIError", "StockClient", "LogisticsClient", "JSONCodec", "obtener_codec", "iter_json_array"]
@@ -0,0 +1,161 @@
+# utils/apiCliente/asincrono.py
+"""Versión asíncrona de los clientes HTTP (httpx), para vistas async bajo ASGI.
+
+    class AsyncStockClient(AsyncClientMixin, StockClient): ...
+    productos = await AsyncStockClient(base_url).listar_productos(limit=20)
+
+El mixin reemplaza sólo el transporte (``request`` y los helpers
+get/post/put/delete): los métodos de cada cliente concreto (rutas, params,
+timeouts por operación, upstream del bulkhead) no cambian y pasan a
+devolver corutinas. Se conservan los reintentos, el deadline de la request,
+el X-Request-ID, el bulkhead y las métricas de upstream; no hay coalescing
+(`SingleFlight` coordina hilos) ni modo streaming: ``stream_items``,
+``iter_get`` e ``iterar_productos`` no existen en los clientes async
+(``AttributeError`` al accederlos).
+
+Las conexiones se reutilizan con un ``httpx.AsyncClient`` por event loop y
+upstream: bajo un servidor ASGI hay un loop por worker, así que el
+keep-alive se comparte entre todas sus requests.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import httpx
+
+from .base import APIError, BaseAPIClient, DeadlineExcedido
+from .deadline import tiempo_restante
+from .logistica import LogisticsClient
+from .stock import StockClient
+from utils.contexto_request import HEADER_REQUEST_ID, request_id_actual
+from utils.metricas_request import registrar_upstream
+
+# conexiones abiertas por upstream dentro de un worker
+LIMITES_POOL = httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30)
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+
+def cliente_http(base_url: str) -> httpx.AsyncClient:
+    """``httpx.AsyncClient`` compartido del event loop en curso para ``base_url``."""
+    por_loop = _pools.setdefault(asyncio.get_running_loop(), {})
+    cliente = por_loop.get(base_url)
+    if cliente is None or cliente.is_closed:
+        cliente = por_loop[base_url] = httpx.AsyncClient(limits=LIMITES_POOL)
+    return cliente
+
+
+async def cerrar_clientes_http() -> None:
+    """Cierra los pools del loop en curso (lo llama el lifespan de ``Main.asgi`` al apagar el worker)."""
+    por_loop = _pools.pop(asyncio.get_running_loop(), {})
+    for cliente in por_loop.values():
+        await cliente.aclose()
+
+
+class SinStreaming:
+    """Oculta un método heredado: accederlo levanta ``AttributeError`` (y ``hasattr`` da False)."""
+
+    def __set_name__(self, owner, nombre: str) -> None:
+        self.nombre = nombre
+
+    def __get__(self, instancia, owner=None):
+        clase = owner.__name__ if owner is not None else type(instancia).__name__
+        raise AttributeError(f"{clase} no tiene modo streaming ({self.nombre}); usar el listado completo")
+
+
+class AsyncClientMixin:
+    """Transporte async para cualquier subclase de :class:`BaseAPIClient` (va primero en las bases)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.coalesce = False
+        # la sesión de requests no se usa
+        self.session.close()
+        if self.default_headers.get("Accept-Encoding") != "identity":
+            # httpx anuncia y descomprime las codificaciones que tiene instaladas
+            self.default_headers.pop("Accept-Encoding", None)
+
+    async def _con_bulkhead(self, url: str, hacer: Callable[[], Awaitable[Any]]) -> Any:
+        if self.bulkhead is None:
+            return await hacer()
+        self._ocupar_bulkhead(url)
+        inicio = time.perf_counter()
+        caida = False
+        try:
+            return await hacer()
+        except APIError as exc:
+            caida = exc.status is None and not isinstance(exc, DeadlineExcedido)
+            raise
+        finally:
+            self.bulkhead.liberar(time.perf_counter() - inicio, caida=caida)
+
+    async def _send(self, method: str, url: str, *, params: Dict[str, Any] | None, json: Any,
+                    headers: Dict[str, str], operation: str | None = None) -> httpx.Response:
+        """Como :meth:`BaseAPIClient._send`, sin bloquear el event loop mientras espera."""
+        headers = dict(headers)
+        request_id = request_id_actual()
+        if request_id:
+            headers.setdefault(HEADER_REQUEST_ID, request_id)
+        cliente = cliente_http(self.base_url)
+        for attempt in range(self.max_retries + 1):
+            conexion, lectura = self._timeout_con_deadline(url, self._timeout_para(operation), headers)
+            inicio = time.perf_counter()
+            try:
+                return await cliente.request(
+                    method.upper(), url, params=params, json=json, headers=headers,
+                    timeout=httpx.Timeout(lectura, connect=conexion, pool=conexion),
+                )
+            except httpx.TransportError as exc:
+                if attempt >= self.max_retries:
+                    raise APIError(f"Timeout/Conexión a {url} falló tras reintentos") from exc
+                restante = tiempo_restante()
+                if restante is not None and restante <= 0:
+                    raise DeadlineExcedido(f"Deadline de la request vencido llamando a {url}", url=url,
+                                           payload={"code": "DEADLINE_EXCEDIDO"}) from exc
+            finally:
+                registrar_upstream((time.perf_counter() - inicio) * 1000)
+
+    async def request(self, method: str, path: str, *, params: Dict[str, Any] | None = None, json: Any = None,
+                      expected_status: int | Tuple[int, ...] | None = 200, headers: Dict[str, str] | None = None,
+                      operation: str | None = None) -> Any:
+        url = self._url(path)
+        _headers = dict(self.default_headers)
+        if headers:
+            _headers.update(headers)
+        resp = await self._con_bulkhead(
+            url, lambda: self._send(method, url, params=params, json=json, headers=_headers, operation=operation)
+        )
+        self._check_status(resp, url, expected_status)
+        if resp.headers.get("Content-Type", "").startswith("application/json"):
+            return self._decode_json(resp)
+        return resp.text
+
+    stream_items = SinStreaming()
+    iter_get = SinStreaming()
+
+    async def get(self, path: str, *, params=None, expected_status=200, headers=None, operation=None):
+        return await self.request("GET", path, params=params, expected_status=expected_status, headers=headers, operation=operation)
+
+    async def post(self, path: str, *, json=None, expected_status=201, headers=None, operation=None):
+        return await self.request("POST", path, json=json, expected_status=expected_status, headers=headers, operation=operation)
+
+    async def put(self, path: str, *, json=None, expected_status=200, headers=None, operation=None):
+        return await self.request("PUT", path, json=json, expected_status=expected_status, headers=headers, operation=operation)
+
+    async def delete(self, path: str, *, expected_status=204, headers=None, operation=None):
+        return await self.request("DELETE", path, expected_status=expected_status, headers=headers, operation=operation)
+
+
+class AsyncAPIClient(AsyncClientMixin, BaseAPIClient):
+    """Cliente genérico (sin endpoints propios) para llamadas puntuales."""
+
+
+class AsyncStockClient(AsyncClientMixin, StockClient):
+    iterar_productos = SinStreaming()
+
+
+class AsyncLogisticsClient(AsyncClientMixin, LogisticsClient):
+    pass
@@ -1,9 +1,22 @@
 # utils/api_clients/base.py
 from __future__ import annotations
 
-from typing import  Any, Dict, Optional
+import time
+from typing import  Any, Callable, Dict, Iterator, Optional, Tuple
 import requests
 
+try:
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:  # pragma: no cover - urllib3 viene con requests
+    ACCEPT_ENCODING = "gzip,deflate"
+
+from .bulkhead import AdaptiveBulkhead, BulkheadLleno, nombre_upstream, obtener_bulkhead
+from .codec import JSONCodec, iter_json_array, obtener_codec
+from .deadline import HEADER_DEADLINE, tiempo_restante
+from .singleflight import SingleFlight, clave_request, grupo_por_defecto
+from utils.contexto_request import HEADER_REQUEST_ID, request_id_actual
+from utils.metricas_request import registrar_upstream
+
 # Excepción personalizada para errores de API
 class APIError(Exception):
     def __init__(self, message: str, *, status: int | None = None,
@@ -13,17 +26,48 @@ class APIError(Exception):
         self.url = url
         self.payload = payload
 
+
+class DeadlineExcedido(APIError):
+    """No queda tiempo del deadline de la request para llamar al upstream."""
+
 # Cliente base para consumir APIs RESTful
 class BaseAPIClient:
-    def __init__( self, base_url: str, timeout: float = 8.0, max_retries: int = 2, default_headers: Optional[Dict[str, str]] = None, token: str | None = None, api_key: str | None = None,):
+    # tamaño de chunk al leer respuestas en modo streaming
+    stream_chunk_size = 64 * 1024
+    # nombre del servicio para el bulkhead; si es None se usa el host del base_url
+    upstream: Optional[str] = None
+    # timeouts (connect, read) por operación; los clientes concretos los sobreescriben
+    operation_timeouts: Dict[str, Tuple[float, float]] = {}
+    # tope por defecto para establecer la conexión TCP/TLS
+    default_connect_timeout = 3.05
+
+    def __init__( self, base_url: str, timeout: float = 8.0, max_retries: int = 2, default_headers: Optional[Dict[str, str]] = None, token: str | None = None, api_key: str | None = None, codec: JSONCodec | str | None = None, compression: bool = True, coalesce: bool = True, bulkhead: bool = True, connect_timeout: float | None = None, read_timeout: float | None = None, timeouts: Optional[Dict[str, float | Tuple[float, float]]] = None,):
         if not base_url:
             raise ValueError("base_url es requerido")
         self.base_url = base_url.rstrip("/")
+        # `timeout` sigue siendo el tiempo de lectura por defecto; la conexión tiene su propio tope
         self.timeout = timeout
+        self.connect_timeout = connect_timeout if connect_timeout is not None else min(timeout, self.default_connect_timeout)
+        self.read_timeout = read_timeout if read_timeout is not None else timeout
+        self.timeouts: Dict[str, Tuple[float, float]] = dict(self.operation_timeouts)
+        for operacion, valor in (timeouts or {}).items():
+            self.timeouts[operacion] = valor if isinstance(valor, tuple) else (min(valor, self.connect_timeout), valor)
         self.max_retries = max_retries
         self.session = requests.Session()
+        # codec JSON: instancia, nombre ("json"/"orjson") o None para el más rápido disponible
+        self.codec = codec if isinstance(codec, JSONCodec) else obtener_codec(codec)
+        # GETs idénticos y concurrentes comparten una sola llamada al upstream
+        self.coalesce = coalesce
+        self.single_flight: SingleFlight = grupo_por_defecto
+        # límite adaptativo de llamadas en vuelo, compartido por todos los clientes del mismo upstream
+        self.bulkhead: AdaptiveBulkhead | None = (
+            obtener_bulkhead(self.upstream or nombre_upstream(self.base_url)) if bulkhead else None
+        )
 
         self.default_headers: Dict[str, str] = {"Accept": "application/json"}
+        # negociar compresión con el upstream: requests/urllib3 descomprimen solos
+        # las codificaciones que anuncia ACCEPT_ENCODING (br/zstd si están instalados)
+        self.default_headers["Accept-Encoding"] = ACCEPT_ENCODING if compression else "identity"
         if default_headers:
             self.default_headers.update(default_headers)
         if token:
@@ -36,53 +80,164 @@ class BaseAPIClient:
             path = "/" + path
         return self.base_url + path
 
-    def request( self, method: str, path: str, *, params: Dict[str, Any] | None = None, json: Any = None, expected_status: int | tuple[int, ...] | None = 200, headers: Dict[str, str] | None = None,) -> Any:
-        url = self._url(path)
-        _headers = dict(self.default_headers)
-        if headers:
-            _headers.update(headers)
+    def _decode_json(self, resp) -> Any:
+        """Decodifica el cuerpo con el codec configurado."""
+        content = getattr(resp, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            return self.codec.loads(content)
+        return resp.json()
 
+    def _check_status(self, resp, url: str, expected_status: int | tuple[int, ...] | None) -> None:
+        """Valida el status esperado(s); si no coincide levanta APIError con el payload."""
+        if expected_status is None:
+            return
+        oks = expected_status if isinstance(expected_status, tuple) else (expected_status,)
+        if resp.status_code not in oks:
+            try:
+                payload = self._decode_json(resp)
+            except Exception:
+                payload = resp.text
+            raise APIError(
+                f"HTTP {resp.status_code} calling {url}",
+                status=resp.status_code, url=url, payload=payload
+            )
+
+    def _ocupar_bulkhead(self, url: str) -> None:
+        try:
+            self.bulkhead.adquirir()
+        except BulkheadLleno as exc:
+            raise APIError(
+                f"Upstream saturado, llamada a {url} rechazada",
+                status=503, url=url, payload={"code": "UPSTREAM_SATURADO", "detail": str(exc)},
+            ) from exc
+
+    def _con_bulkhead(self, url: str, fn: Callable[[], Any]) -> Any:
+        """Ejecuta `fn` ocupando un lugar del bulkhead del upstream (si hay)."""
+        if self.bulkhead is None:
+            return fn()
+        self._ocupar_bulkhead(url)
+        inicio = time.perf_counter()
+        caida = False
+        try:
+            return fn()
+        except APIError as exc:
+            # sin status = timeout o error de conexión tras los reintentos
+            caida = exc.status is None and not isinstance(exc, DeadlineExcedido)
+            raise
+        finally:
+            self.bulkhead.liberar(time.perf_counter() - inicio, caida=caida)
+
+    def _timeout_para(self, operation: str | None) -> Tuple[float, float]:
+        """Timeout (connect, read) de la operación o el del cliente."""
+        if operation and operation in self.timeouts:
+            return self.timeouts[operation]
+        return (self.connect_timeout, self.read_timeout)
+
+    def _timeout_con_deadline(self, url: str, timeout: Tuple[float, float], headers: Dict[str, str]) -> Tuple[float, float]:
+        """Recorta el timeout al tiempo que queda del deadline y lo anuncia al upstream."""
+        restante = tiempo_restante()
+        if restante is None:
+            return timeout
+        if restante <= 0:
+            raise DeadlineExcedido(f"Deadline de la request vencido antes de llamar a {url}", url=url,
+                                   payload={"code": "DEADLINE_EXCEDIDO"})
+        headers[HEADER_DEADLINE] = str(int(restante * 1000))
+        return (min(timeout[0], restante), min(timeout[1], restante))
+
+    def _send(self, method: str, url: str, *, params: Dict[str, Any] | None, json: Any, headers: Dict[str, str], stream: bool = False, operation: str | None = None):
+        """Envía la request reintentando ante timeouts o errores de conexión.
+
+        Cada intento usa el timeout de la operación recortado al deadline
+        vigente; si el deadline vence no se reintenta más.
+        """
+        headers = dict(headers)
+        request_id = request_id_actual()
+        if request_id:
+            # mismo id en los logs de ambos lados para seguir la request
+            headers.setdefault(HEADER_REQUEST_ID, request_id)
         last_exc: Exception | None = None
         for attempt in range(self.max_retries + 1):
+            timeout = self._timeout_con_deadline(url, self._timeout_para(operation), headers)
+            inicio = time.perf_counter()
             try:
-                resp = self.session.request(
+                return self.session.request(
                     method.upper(), url,
                     params=params, json=json,
-                    headers=_headers, timeout=self.timeout
+                    headers=headers, timeout=timeout, stream=stream
                 )
-                # validar status esperado(s)
-                if expected_status is not None:
-                    oks = expected_status if isinstance(expected_status, tuple) else (expected_status,)
-                    if resp.status_code not in oks:
-                        try:
-                            payload = resp.json()
-                        except Exception:
-                            payload = resp.text
-                        raise APIError(
-                            f"HTTP {resp.status_code} calling {url}",
-                            status=resp.status_code, url=url, payload=payload
-                        )
-                # devolver JSON si hay
-                if resp.headers.get("Content-Type", "").startswith("application/json"):
-                    return resp.json()
-                return resp.text
             except (requests.Timeout, requests.ConnectionError) as exc:
                 last_exc = exc
                 if attempt >= self.max_retries:
                     raise APIError(f"Timeout/Conexión a {url} falló tras reintentos") from exc
+                restante = tiempo_restante()
+                if restante is not None and restante <= 0:
+                    raise DeadlineExcedido(f"Deadline de la request vencido llamando a {url}", url=url,
+                                           payload={"code": "DEADLINE_EXCEDIDO"}) from exc
+            finally:
+                # cada intento cuenta como una llamada en las métricas de la request
+                registrar_upstream((time.perf_counter() - inicio) * 1000)
         raise last_exc  # no debería llegar
+
+    def request( self, method: str, path: str, *, params: Dict[str, Any] | None = None, json: Any = None, expected_status: int | tuple[int, ...] | None = 200, headers: Dict[str, str] | None = None, operation: str | None = None,) -> Any:
+        url = self._url(path)
+        _headers = dict(self.default_headers)
+        if headers:
+            _headers.update(headers)
+
+        def _hacer_request():
+            resp = self._con_bulkhead(url, lambda: self._send(method, url, params=params, json=json, headers=_headers, operation=operation))
+            self._check_status(resp, url, expected_status)
+            # devolver JSON si hay
+            if resp.headers.get("Content-Type", "").startswith("application/json"):
+                return self._decode_json(resp)
+            return resp.text
+
+        if self.coalesce and method.upper() == "GET":
+            key = clave_request(method, url, params, _headers) + (expected_status,)
+            return self.single_flight.do(key, _hacer_request)
+        return _hacer_request()
+
+    def stream_items(self, method: str, path: str, *, params: Dict[str, Any] | None = None, json: Any = None, key: str | None = "data", expected_status: int | tuple[int, ...] | None = 200, headers: Dict[str, str] | None = None, operation: str | None = None,) -> Iterator[Any]:
+        """Modo streaming: produce uno a uno los elementos del arreglo `key`.
+
+        Pensado para listados grandes (p. ej. el catálogo con ``limit=5000``):
+        el cuerpo se lee por chunks y cada elemento se entrega apenas se
+        termina de parsear, sin armar el dict completo de la respuesta.
+        Si la respuesta es un arreglo en la raíz se recorre ese arreglo.
+
+        Los reintentos sólo cubren el establecimiento de la conexión; una vez
+        que empezaron a llegar elementos un corte se propaga como APIError.
+        """
+        url = self._url(path)
+        _headers = dict(self.default_headers)
+        if headers:
+            _headers.update(headers)
+
+        # el lugar del bulkhead se ocupa hasta recibir los headers, no durante la lectura del body
+        resp = self._con_bulkhead(url, lambda: self._send(method, url, params=params, json=json, headers=_headers, stream=True, operation=operation))
+        try:
+            self._check_status(resp, url, expected_status)
+            try:
+                yield from iter_json_array(resp.iter_content(chunk_size=self.stream_chunk_size), key=key)
+            except (requests.RequestException, ValueError) as exc:
+                raise APIError(f"Respuesta inválida o cortada desde {url}", url=url) from exc
+        finally:
+            resp.close()
     
     # helpers cómodos
-    def get(self, path: str, *, params=None, expected_status=200, headers=None):
-        return self.request("GET", path, params=params, expected_status=expected_status, headers=headers)
+    def get(self, path: str, *, params=None, expected_status=200, headers=None, operation=None):
+        return self.request("GET", path, params=params, expected_status=expected_status, headers=headers, operation=operation)
+
+    def iter_get(self, path: str, *, params=None, key="data", expected_status=200, headers=None, operation=None):
+        return self.stream_items("GET", path, params=params, key=key, expected_status=expected_status, headers=headers, operation=operation)
 
-    def post(self, path: str, *, json=None, expected_status=201, headers=None):
-        return self.request("POST", path, json=json, expected_status=expected_status, headers=headers)
+    def post(self, path: str, *, json=None, expected_status=201, headers=None, operation=None):
+        return self.request("POST", path, json=json, expected_status=expected_status, headers=headers, operation=operation)
 
-    def put(self, path: str, *, json=None, expected_status=200, headers=None):
-        return self.request("PUT", path, json=json, expected_status=expected_status, headers=headers)
+    def put(self, path: str, *, json=None, expected_status=200, headers=None, operation=None):
+        return self.request("PUT", path, json=json, expected_status=expected_status, headers=headers, operation=operation)
 
-    def delete(self, path: str, *, expected_status=204, headers=None):
-        return self.request("DELETE", path, expected_status=expected_status, headers=headers)
+    def delete(self, path: str, *, expected_status=204, headers=None, operation=None):
+        return self.request("DELETE", path, expected_status=expected_status, headers=headers, operation=operation)
 
 
@@ -0,0 +1,173 @@
+# utils/apiCliente/bulkhead.py
+"""Bulkhead adaptativo: límite de llamadas en vuelo por servicio upstream.
+
+Cada upstream (identificado por el atributo ``upstream`` del cliente, o por
+el host de su ``base_url`` si no lo define) tiene su propio
+:class:`AdaptiveBulkhead`. Si ya hay tantas llamadas en vuelo como el límite
+actual, la nueva llamada se rechaza al instante con :class:`APIError`
+(status 503) en lugar de quedar bloqueando un worker.
+
+El límite se ajusta con cada respuesta usando un gradiente de latencia:
+mientras la latencia se mantiene cerca de la mínima observada el límite
+crece de a poco; cuando la latencia sube (el upstream se está saturando)
+el límite se achica proporcionalmente, y ante timeouts o errores de
+conexión se recorta de forma multiplicativa.
+
+Los parámetros de cada upstream salen de ``settings.UPSTREAM_BULKHEADS``
+(se leen al crear su bulkhead, en el primer uso) o de
+:func:`configurar_bulkhead`.
+
+El límite es por proceso: con workers sync de gunicorn cada proceso atiende
+una request a la vez, así que el bulkhead cobra sentido con workers de
+hilos (gthread) o asíncronos.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class BulkheadLleno(Exception):
+    """Se alcanzó el límite de llamadas en vuelo para un upstream."""
+
+
+class AdaptiveBulkhead:
+    def __init__(
+        self,
+        nombre: str,
+        *,
+        limite_inicial: int = 20,
+        limite_minimo: int = 2,
+        limite_maximo: int = 100,
+        tolerancia: float = 2.0,
+        suavizado: float = 0.2,
+        factor_caida: float = 0.7,
+        ventana_rtt: int = 500,
+    ) -> None:
+        if not 1 <= limite_minimo <= limite_inicial <= limite_maximo:
+            raise ValueError("Se requiere 1 <= limite_minimo <= limite_inicial <= limite_maximo")
+        self.nombre = nombre
+        self.limite_minimo = limite_minimo
+        self.limite_maximo = limite_maximo
+        # cuánto puede crecer la latencia respecto de la mínima antes de recortar
+        self.tolerancia = tolerancia
+        self.suavizado = suavizado
+        self.factor_caida = factor_caida
+        self.ventana_rtt = ventana_rtt
+
+        self._lock = threading.Lock()
+        self._limite = float(limite_inicial)
+        self._en_vuelo = 0
+        self._rtt_minimo: Optional[float] = None
+        self._rtt_minimo_ventana: Optional[float] = None
+        self._muestras_ventana = 0
+        self.rechazadas = 0
+
+    # ------------------------------------------------------------------
+    @property
+    def limite(self) -> int:
+        return int(self._limite)
+
+    @property
+    def en_vuelo(self) -> int:
+        return self._en_vuelo
+
+    def adquirir(self) -> None:
+        with self._lock:
+            if self._en_vuelo >= int(self._limite):
+                self.rechazadas += 1
+                raise BulkheadLleno(
+                    f"{self.nombre}: {self._en_vuelo} llamadas en vuelo (límite {int(self._limite)})"
+                )
+            self._en_vuelo += 1
+
+    def liberar(self, latencia: float, *, caida: bool = False) -> None:
+        """Libera el lugar y ajusta el límite según la latencia observada.
+
+        caida: la llamada terminó por timeout o error de conexión.
+        """
+        with self._lock:
+            self._en_vuelo -= 1
+            if caida:
+                self._limite = max(self.limite_minimo, self._limite * self.factor_caida)
+                return
+
+            self._registrar_rtt(latencia)
+            gradiente = max(0.5, min(1.0, self.tolerancia * self._rtt_minimo / max(latencia, 1e-6)))
+            margen = math.sqrt(self._limite)
+            nuevo = self._limite * gradiente + margen
+            nuevo = self._limite * (1 - self.suavizado) + nuevo * self.suavizado
+            self._limite = max(self.limite_minimo, min(self.limite_maximo, nuevo))
+
+    def _registrar_rtt(self, latencia: float) -> None:
+        # mínimo por ventanas: si el upstream cambia de "piso" se re-aprende
+        if self._rtt_minimo is None or latencia < self._rtt_minimo:
+            self._rtt_minimo = latencia
+        if self._rtt_minimo_ventana is None or latencia < self._rtt_minimo_ventana:
+            self._rtt_minimo_ventana = latencia
+        self._muestras_ventana += 1
+        if self._muestras_ventana >= self.ventana_rtt:
+            self._rtt_minimo = self._rtt_minimo_ventana
+            self._rtt_minimo_ventana = None
+            self._muestras_ventana = 0
+
+    def estado(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "nombre": self.nombre,
+                "limite": int(self._limite),
+                "en_vuelo": self._en_vuelo,
+                "rtt_minimo_ms": round(self._rtt_minimo * 1000, 1) if self._rtt_minimo is not None else None,
+                "rechazadas": self.rechazadas,
+            }
+
+
+# ----------------------------------------------------------------------
+# Registro por upstream
+# ----------------------------------------------------------------------
+_registro: Dict[str, AdaptiveBulkhead] = {}
+_config: Dict[str, dict] = {}
+_registro_lock = threading.Lock()
+
+
+def nombre_upstream(base_url: str) -> str:
+    return urlsplit(base_url).netloc or base_url
+
+
+def _opciones(nombre: str) -> dict:
+    """Parámetros de ``configurar_bulkhead`` o, si no hay, de ``settings.UPSTREAM_BULKHEADS``."""
+    if nombre in _config:
+        return _config[nombre]
+    # import perezoso: se lee al crear el bulkhead, no al cargar las apps
+    from django.conf import settings
+
+    if not settings.configured:
+        return {}
+    return getattr(settings, "UPSTREAM_BULKHEADS", {}).get(nombre, {})
+
+
+def configurar_bulkhead(nombre: str, **opciones) -> None:
+    """Define los parámetros del bulkhead de un upstream ("stock", "logistica"...).
+
+    Tiene prioridad sobre ``settings.UPSTREAM_BULKHEADS``. Debe llamarse antes
+    del primer uso; si ya existía se reemplaza.
+    """
+    with _registro_lock:
+        _config[nombre] = opciones
+        _registro.pop(nombre, None)
+
+
+def obtener_bulkhead(nombre: str) -> AdaptiveBulkhead:
+    with _registro_lock:
+        bulkhead = _registro.get(nombre)
+        if bulkhead is None:
+            bulkhead = _registro[nombre] = AdaptiveBulkhead(nombre, **_opciones(nombre))
+        return bulkhead
+
+
+def estado_bulkheads() -> list:
+    with _registro_lock:
+        bulkheads = list(_registro.values())
+    return [b.estado() for b in bulkheads]
@@ -0,0 +1,187 @@
+# utils/apiCliente/codec.py
+"""Codecs JSON intercambiables para los clientes HTTP.
+
+`BaseAPIClient` decodifica las respuestas a través de un codec en lugar de
+llamar directamente a ``resp.json()``. Si `orjson` está instalado se usa
+como decodificador rápido; si no, se cae a la librería estándar.
+
+También expone :func:`iter_json_array`, un parser incremental que recorre
+un arreglo JSON (por ejemplo ``{"data": [...]}``) elemento por elemento a
+partir de los chunks de la respuesta, sin armar el árbol completo en memoria.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+try:  # dependencia opcional
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+class JSONCodec:
+    """Codec basado en el módulo ``json`` de la librería estándar."""
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec rápido basado en `orjson` (decodifica bytes sin pasar por str)."""
+
+    name = "orjson"
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+def obtener_codec(nombre: Optional[str] = None) -> JSONCodec:
+    """Devuelve el codec pedido o el más rápido disponible.
+
+    nombre: ``"json"``, ``"orjson"`` o ``None`` (elige automáticamente).
+    """
+    if nombre == "json":
+        return JSONCodec()
+    if nombre == "orjson":
+        if orjson is None:
+            raise ValueError("orjson no está instalado")
+        return OrjsonCodec()
+    if nombre is not None:
+        raise ValueError(f"Codec JSON desconocido: {nombre}")
+    return OrjsonCodec() if orjson is not None else JSONCodec()
+
+
+# ----------------------------------------------------------------------
+# Parseo incremental
+# ----------------------------------------------------------------------
+_ESPACIOS = " \t\n\r"
+# caracteres que pueden continuar un número JSON
+_CARACTERES_NUMERO = "0123456789.eE+-"
+
+
+class _Buffer:
+    """Buffer de texto alimentado por chunks de bytes."""
+
+    def __init__(self, chunks: Iterable[bytes | str]):
+        self._chunks = iter(chunks)
+        self._decoder = None
+        self.texto = ""
+        self.pos = 0
+        self.agotado = False
+
+    def leer_mas(self) -> bool:
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if isinstance(chunk, (bytes, bytearray)):
+                if self._decoder is None:
+                    self._decoder = codecs.getincrementaldecoder("utf-8")()
+                chunk = self._decoder.decode(chunk)
+            # descartar lo ya consumido para que el buffer no crezca sin límite
+            self.texto = self.texto[self.pos:] + chunk
+            self.pos = 0
+            return True
+        self.agotado = True
+        return False
+
+    def saltar_espacios(self) -> Optional[str]:
+        """Avanza sobre espacios y devuelve el próximo carácter (o None si terminó)."""
+        while True:
+            while self.pos < len(self.texto) and self.texto[self.pos] in _ESPACIOS:
+                self.pos += 1
+            if self.pos < len(self.texto):
+                return self.texto[self.pos]
+            if not self.leer_mas():
+                return None
+
+    def esperar(self, caracter: str) -> None:
+        actual = self.saltar_espacios()
+        if actual != caracter:
+            raise ValueError(f"JSON inválido: se esperaba {caracter!r} y llegó {actual!r}")
+        self.pos += 1
+
+    def decodificar_valor(self, decoder: json.JSONDecoder) -> Any:
+        """Decodifica un valor completo, pidiendo más chunks si está cortado."""
+        self.saltar_espacios()
+        while True:
+            try:
+                valor, fin = decoder.raw_decode(self.texto, self.pos)
+            except json.JSONDecodeError:
+                if not self.leer_mas():
+                    raise
+                continue
+            # un número seguido del fin del buffer o de un carácter de número
+            # puede estar cortado ("12" de "123", "1234" de "1234.5", "1" de "1e3")
+            if (isinstance(valor, (int, float)) and not isinstance(valor, bool) and not self.agotado
+                    and (fin == len(self.texto) or self.texto[fin] in _CARACTERES_NUMERO)):
+                if self.leer_mas():
+                    continue
+            self.pos = fin
+            return valor
+
+
+def iter_json_array(chunks: Iterable[bytes | str], key: Optional[str] = "data") -> Iterator[Any]:
+    """Recorre los elementos de un arreglo JSON a medida que llegan los chunks.
+
+    Soporta dos formas de payload:
+    - un arreglo en la raíz (``[{...}, {...}]``)
+    - un objeto cuyo campo ``key`` contiene el arreglo (``{"data": [...], ...}``);
+      el resto de los campos de primer nivel se saltean.
+
+    Si el objeto no tiene el campo ``key`` no se produce ningún elemento.
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(chunks)
+
+    inicio = buf.saltar_espacios()
+    if inicio == "[":
+        yield from _iter_elementos(buf, decoder)
+        return
+    if inicio != "{" or key is None:
+        raise ValueError("JSON inválido: se esperaba un objeto o un arreglo en la raíz")
+
+    buf.pos += 1
+    if buf.saltar_espacios() == "}":
+        return
+    while True:
+        nombre = buf.decodificar_valor(decoder)
+        buf.esperar(":")
+        if nombre == key and buf.saltar_espacios() == "[":
+            buf.pos += 1
+            yield from _iter_elementos(buf, decoder, abierto=True)
+        else:
+            buf.decodificar_valor(decoder)
+        separador = buf.saltar_espacios()
+        buf.pos += 1
+        if separador == "}":
+            return
+        if separador != ",":
+            raise ValueError(f"JSON inválido: separador inesperado {separador!r}")
+
+
+def _iter_elementos(buf: _Buffer, decoder: json.JSONDecoder, abierto: bool = False) -> Iterator[Any]:
+    if not abierto:
+        buf.esperar("[")
+    if buf.saltar_espacios() == "]":
+        buf.pos += 1
+        return
+    while True:
+        yield buf.decodificar_valor(decoder)
+        separador = buf.saltar_espacios()
+        buf.pos += 1
+        if separador == "]":
+            return
+        if separador != ",":
+            raise ValueError(f"JSON inválido: separador inesperado {separador!r}")
@@ -0,0 +1,59 @@
+# utils/apiCliente/deadline.py
+"""Deadline de punta a punta para las llamadas a upstreams.
+
+El deadline vive en un ``ContextVar``: lo fija el middleware al comenzar la
+request de Django (o un bloque ``with deadline(...)``) y todas las llamadas
+de `BaseAPIClient` hechas dentro de ese contexto lo respetan, incluidos los
+reintentos y las llamadas anidadas. Un ``with deadline(...)`` interno nunca
+puede extender el deadline externo, sólo acortarlo.
+
+El tiempo restante también se envía al upstream en el header
+``X-Request-Deadline-Ms`` para que nuestros propios servicios (que se
+llaman por HTTP entre sí) lo sigan propagando.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+HEADER_DEADLINE = "X-Request-Deadline-Ms"
+
+# instante (time.monotonic) en el que vence el deadline actual
+_vence_en: ContextVar[Optional[float]] = ContextVar("deadline_vence_en", default=None)
+
+
+def establecer_deadline(segundos: float | None) -> Token:
+    """Fija un deadline de `segundos` desde ahora (sin extender uno existente).
+
+    Devuelve el token para restaurar el valor anterior con :func:`restablecer_deadline`.
+    """
+    actual = _vence_en.get()
+    if segundos is None:
+        return _vence_en.set(actual)
+    nuevo = time.monotonic() + max(0.0, segundos)
+    if actual is not None:
+        nuevo = min(actual, nuevo)
+    return _vence_en.set(nuevo)
+
+
+def restablecer_deadline(token: Token) -> None:
+    _vence_en.reset(token)
+
+
+@contextmanager
+def deadline(segundos: float | None) -> Iterator[None]:
+    token = establecer_deadline(segundos)
+    try:
+        yield
+    finally:
+        restablecer_deadline(token)
+
+
+def tiempo_restante() -> Optional[float]:
+    """Segundos que quedan hasta el deadline (None si no hay deadline)."""
+    vence_en = _vence_en.get()
+    if vence_en is None:
+        return None
+    return vence_en - time.monotonic()
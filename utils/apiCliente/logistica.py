@@ -6,6 +6,16 @@ from .base import BaseAPIClient
 
 
 class LogisticsClient(BaseAPIClient):
+    upstream = "logistica"
+    # (connect, read) en segundos: las consultas deben ser rápidas, la creación de envíos puede tardar
+    operation_timeouts = {
+        "get_transport_methods": (1.0, 2.0),
+        "calculate_shipping_cost": (2.0, 5.0),
+        "create_shipment": (3.05, 15.0),
+        "create_tracking": (3.05, 15.0),
+        "get_tracking": (2.0, 5.0),
+    }
+
     def create_shipment(self, order_id: int, user_id: int, delivery_address: dict, transport_type: str, products: list) -> dict:
         """
         Crea un nuevo envío para una orden, según el contrato OpenAPI.
@@ -22,7 +32,7 @@ class LogisticsClient(BaseAPIClient):
             "transport_type": transport_type,
             "products": products
         }
-        return self.post("/shipping", json=body, expected_status=201)
+        return self.post("/shipping", json=body, expected_status=201, operation="create_shipment")
     """
     Cliente para el servicio de Transporte / Logística.
 
@@ -45,11 +55,11 @@ class LogisticsClient(BaseAPIClient):
         body: Dict[str, Any] = {"delivery_address": delivery_address, "products": products}
         if transport_type:
             body["transport_type"] = transport_type
-        return self.post("/shipping/cost", json=body, expected_status=200)
+        return self.post("/shipping/cost", json=body, expected_status=200, operation="calculate_shipping_cost")
 
     def get_transport_methods(self) -> Dict[str, Any]:
         """Devuelve los métodos de transporte disponibles (air, road, rail, sea)."""
-        return self.get("/shipping/transport-methods", expected_status=200)
+        return self.get("/shipping/transport-methods", expected_status=200, operation="get_transport_methods")
 
     def list_shipments(self, user_id: Optional[int] = None, status: Optional[str] = None, from_date: Optional[str] = None, to_date: Optional[str] = None, page: int = 1, limit: int = 20) -> Dict[str, Any]:
         """
@@ -64,17 +74,17 @@ class LogisticsClient(BaseAPIClient):
             params["from_date"] = from_date
         if to_date:
             params["to_date"] = to_date
-        return self.get("/shipping", params=params, expected_status=200)
+        return self.get("/shipping", params=params, expected_status=200, operation="list_shipments")
 
     def get_shipment(self, shipping_id: int) -> Dict[str, Any]:
         """Obtiene detalle completo de un envío por su id."""
-        return self.get(f"/shipping/{shipping_id}", expected_status=200)
+        return self.get(f"/shipping/{shipping_id}", expected_status=200, operation="get_shipment")
 
     def cancel_shipment(self, shipping_id: int) -> Dict[str, Any]:
         """
         Cancela un envío. El servicio puede responder 200 (ok) o 4xx según la lógica.
         """
-        return self.post(f"/shipping/{shipping_id}/cancel", json={}, expected_status=200)
+        return self.post(f"/shipping/{shipping_id}/cancel", json={}, expected_status=200, operation="cancel_shipment")
 
     # --------------------------------------------------------------
     # Endpoints de Tracking (alias explícitos según OpenAPI externa)
@@ -103,8 +113,8 @@ class LogisticsClient(BaseAPIClient):
             "products": products,
         }
         # Ruta según OpenAPI de logística expuesta a compras
-        return self.post("/logistics/tracking", json=payload, expected_status=201)
+        return self.post("/logistics/tracking", json=payload, expected_status=201, operation="create_tracking")
 
     def get_tracking(self, tracking_id: int) -> Dict[str, Any]:
         """Obtiene el estado de un tracking (GET /logistics/tracking/{id})."""
-        return self.get(f"/logistics/tracking/{tracking_id}", expected_status=200)
+        return self.get(f"/logistics/tracking/{tracking_id}", expected_status=200, operation="get_tracking")
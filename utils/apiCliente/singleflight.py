@@ -0,0 +1,96 @@
+# utils/apiCliente/singleflight.py
+"""Coalescencia de requests idénticas en vuelo (patrón *single-flight*).
+
+Cuando varios hilos del mismo proceso piden exactamente lo mismo a la vez
+(mismo método, URL y parámetros), sólo el primero ("líder") llama al
+upstream; el resto espera y recibe el mismo resultado ya parseado, o la
+misma excepción. Apenas termina la llamada la clave se libera, así que no
+es un caché: una request posterior vuelve a salir al upstream.
+
+El líder recibe el resultado original y cada seguidor una copia profunda,
+así nadie ve las mutaciones de otro. Un seguidor espera como mucho lo que
+queda del deadline de su request (``utils.apiCliente.deadline``); si vence
+antes de que termine el líder, levanta ``DeadlineExcedido``.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from .deadline import tiempo_restante
+
+
+class _Llamada:
+    __slots__ = ("evento", "resultado", "error", "esperando")
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.resultado: Any = None
+        self.error: Optional[BaseException] = None
+        self.esperando = 0
+
+
+class SingleFlight:
+    """Grupo de llamadas coalescidas por clave."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._en_vuelo: Dict[Hashable, _Llamada] = {}
+        # contadores simples para diagnóstico
+        self.ejecutadas = 0
+        self.compartidas = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            llamada = self._en_vuelo.get(key)
+            if llamada is not None:
+                llamada.esperando += 1
+                self.compartidas += 1
+                lider = False
+            else:
+                llamada = self._en_vuelo[key] = _Llamada()
+                self.ejecutadas += 1
+                lider = True
+
+        if not lider:
+            restante = tiempo_restante()
+            if not llamada.evento.wait(None if restante is None else max(0.0, restante)):
+                from .base import DeadlineExcedido  # base importa este módulo
+
+                raise DeadlineExcedido("Deadline de la request vencido esperando una llamada en curso",
+                                       payload={"code": "DEADLINE_EXCEDIDO"})
+            if llamada.error is not None:
+                raise llamada.error
+            return copy.deepcopy(llamada.resultado)
+
+        try:
+            llamada.resultado = fn()
+            return llamada.resultado
+        except BaseException as exc:
+            llamada.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._en_vuelo.pop(key, None)
+            llamada.evento.set()
+
+    def en_vuelo(self) -> int:
+        with self._lock:
+            return len(self._en_vuelo)
+
+
+def clave_request(method: str, url: str, params: Mapping[str, Any] | None, headers: Mapping[str, str]) -> Tuple:
+    """Arma la clave (método, url, params, headers) de una request.
+
+    Incluye todos los headers (credenciales, Cookie, ...): dos requests sólo
+    comparten respuesta si el upstream no puede distinguirlas.
+    """
+    params_normalizados = tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items()))
+    headers_normalizados = tuple(sorted((str(k).lower(), str(v)) for k, v in headers.items()))
+    return (method.upper(), url, params_normalizados, headers_normalizados)
+
+
+# Grupo compartido por todos los clientes del proceso (los clientes se
+# instancian por request, así que el grupo no puede vivir en la instancia).
+grupo_por_defecto = SingleFlight()
@@ -9,15 +9,37 @@ class StockClient(BaseAPIClient):
     Cliente para consumir la API de Stock según el contrato OpenAPI.
     """
 
+    upstream = "stock"
+    # (connect, read) en segundos; el listado completo del catálogo es el más pesado
+    operation_timeouts = {
+        "listar_productos": (3.05, 10.0),
+        "obtener_producto": (2.0, 4.0),
+        "reservar_stock": (3.05, 10.0),
+        "liberar_stock": (3.05, 10.0),
+    }
+
     def listar_productos(self, page: int = 1, limit: int = 20, q: Optional[str] = None, categoriaId: Optional[int] = None):
         params = {"page": page, "limit": limit}
         if q:
             params["q"] = q
         if categoriaId:
             params["categoriaId"] = categoriaId
-        return self.get("/productos", params=params, expected_status=200)
+        return self.get("/productos", params=params, expected_status=200, operation="listar_productos")
+
+    def iterar_productos(self, page: int = 1, limit: int = 20, q: Optional[str] = None, categoriaId: Optional[int] = None):
+        """
+        Igual que listar_productos pero en modo streaming: produce los productos
+        de `data` de a uno, sin cargar la respuesta completa en memoria.
+        """
+        params = {"page": page, "limit": limit}
+        if q:
+            params["q"] = q
+        if categoriaId:
+            params["categoriaId"] = categoriaId
+        return self.iter_get("/productos", params=params, key="data", expected_status=200, operation="listar_productos")
+
     def obtener_producto(self, productoId: int):
-        return self.get(f"/productos/{productoId}", expected_status=200)
+        return self.get(f"/productos/{productoId}", expected_status=200, operation="obtener_producto")
 
     def reservar_stock(self, idCompra: str, usuarioId: int, productos: list):
         """
@@ -31,7 +53,7 @@ class StockClient(BaseAPIClient):
             "usuarioId": usuarioId,
             "productos": productos
         }
-        return self.post("/stock/reservar", json=reserva_data, expected_status=200)
+        return self.post("/stock/reservar", json=reserva_data, expected_status=200, operation="reservar_stock")
 
     def listar_reservas(self,  usuarioId: int, page: int = 1, limit: int = 20, estado: Optional[str] = None):
         params = {"usuarioId": usuarioId, "page": page, "limit": limit}
@@ -52,5 +74,5 @@ class StockClient(BaseAPIClient):
     # No sabemos si van o no
     def liberar_stock(self, idReserva: int, usuarioId: int, motivo: str):
         body = {"idReserva": idReserva, "usuarioId": usuarioId, "motivo": motivo}
-        return self.post("/stock/liberar", json=body, expected_status=(200, 201))
+        return self.post("/stock/liberar", json=body, expected_status=(200, 201), operation="liberar_stock")
     
\ No newline at end of file
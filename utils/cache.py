@@ -0,0 +1,296 @@
+# utils/cache.py
+"""Cache por dominio con claves versionadas, invalidación por tags y métricas.
+
+Cada dominio (catálogo, categorías, métodos de transporte, resúmenes de
+pedidos) tiene su propio espacio de claves ``<dominio>:v<version>:<clave>``
+y su TTL (``CACHE_TTLS``). Subir la versión del dominio en ``DOMINIOS``
+descarta todo lo cacheado con la forma vieja sin tocar el resto.
+
+Tags: cada entrada guarda la versión de sus tags al momento de escribirse;
+invalidar un tag le asigna una versión nueva y todas las entradas que lo
+llevan pasan a ser un miss, sin recorrer ni borrar claves. Todas las
+entradas llevan el tag de su dominio, así :meth:`CacheDominio.invalidar_todo`
+vacía el dominio entero.
+
+    catalogo = dominio("catalogo")
+    productos = catalogo.get_or_set(("listado", filtros), lambda: cliente.listar(...), tags=["productos"])
+    invalidar_tags("productos")   # p. ej. cuando Stock avisa un cambio
+
+:func:`pagina_anonima` cachea la respuesta completa de una vista para
+visitantes anónimos (la tienda), con una clave armada por la propia vista.
+
+El backend es el de ``CACHES`` (locmem, archivo o Redis), así que los tags
+valen entre procesos cuando el backend es compartido.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from inspect import iscoroutinefunction
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# versión del formato de cada dominio: subirla al cambiar la forma de lo que se guarda
+DOMINIOS = {
+    "catalogo": 1,
+    "categorias": 1,
+    "transportes": 1,
+    "pedidos": 1,
+    "paginas": 1,
+}
+# lo que depende del catálogo de Stock (listados, páginas y fragmentos de la tienda)
+TAG_CATALOGO = "catalogo"
+# TTL por defecto (segundos) si el dominio no está en CACHE_TTLS
+TTL_POR_DEFECTO = 300
+# las claves más largas se reemplazan por su hash (memcached corta en 250)
+LARGO_MAXIMO_CLAVE = 200
+
+_NO_ENCONTRADO = object()
+
+
+class _Metricas:
+    """Contadores por dominio del proceso (hits, misses, sets, invalidaciones)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def sumar(self, dominio: str, evento: str, cantidad: int = 1) -> None:
+        with self._lock:
+            self._contadores[dominio][evento] += cantidad
+
+    def resumen(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            resumen = {}
+            for dominio, contadores in self._contadores.items():
+                consultas = contadores["hits"] + contadores["misses"]
+                resumen[dominio] = dict(contadores)
+                resumen[dominio]["tasa_hits"] = round(contadores["hits"] / consultas, 3) if consultas else None
+            return resumen
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._contadores.clear()
+
+
+metricas = _Metricas()
+
+
+def normalizar_clave(clave: Any) -> str:
+    """Convierte str/tuplas/dicts en una clave estable (dicts ordenados por clave)."""
+    if isinstance(clave, str):
+        texto = clave
+    else:
+        texto = json.dumps(clave, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    if len(texto) > LARGO_MAXIMO_CLAVE or any(c.isspace() for c in texto):
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+    return texto
+
+
+def _clave_tag(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+# backends cuyo contenido es del proceso: una invalidación no llega a los demás workers
+BACKENDS_POR_PROCESO = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_compartido(alias: str = "default") -> bool:
+    """True si el backend de ``alias`` lo ven todos los procesos (file, redis...)."""
+    return settings.CACHES[alias]["BACKEND"] not in BACKENDS_POR_PROCESO
+
+
+def invalidar_tags(*tags: str, alias: str = "default") -> None:
+    """Invalida todas las entradas (de cualquier dominio) que lleven alguno de los tags."""
+    if not tags:
+        return
+    backend = caches[alias]
+    # una versión nueva e irrepetible; si la clave del tag se pierde (eviction) también es miss
+    backend.set_many({_clave_tag(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+    for tag in tags:
+        metricas.sumar(tag.split(":", 1)[1] if tag.startswith("dominio:") else "tags", "invalidaciones")
+
+
+class CacheDominio:
+    def __init__(self, nombre: str, ttl: Optional[int] = None, alias: str = "default"):
+        if nombre not in DOMINIOS:
+            raise ValueError(f"Dominio de cache desconocido: {nombre!r}")
+        self.nombre = nombre
+        self.version = DOMINIOS[nombre]
+        self.alias = alias
+        self._ttl = ttl
+        self.tag_dominio = f"dominio:{nombre}"
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "CACHE_TTLS", {}).get(self.nombre, TTL_POR_DEFECTO)
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def clave(self, clave: Any) -> str:
+        return f"{self.nombre}:v{self.version}:{normalizar_clave(clave)}"
+
+    def _versiones_tags(self, tags: Iterable[str]) -> Dict[str, Optional[str]]:
+        claves = {_clave_tag(tag): tag for tag in tags}
+        guardadas = self.backend.get_many(list(claves))
+        return {tag: guardadas.get(clave) for clave, tag in claves.items()}
+
+    def get(self, clave: Any, default: Any = None) -> Any:
+        entrada = self.backend.get(self.clave(clave))
+        if entrada is not None:
+            versiones = self._versiones_tags(entrada["tags"])
+            if versiones == entrada["tags"]:
+                metricas.sumar(self.nombre, "hits")
+                return entrada["valor"]
+        metricas.sumar(self.nombre, "misses")
+        return default
+
+    def _versiones_para_escribir(self, tags: Iterable[str]) -> Dict[str, str]:
+        versiones = self._versiones_tags([self.tag_dominio, *tags])
+        for tag, version in versiones.items():
+            if version is None:
+                # add() no pisa una versión que otro proceso acaba de crear
+                nueva = uuid.uuid4().hex
+                if not self.backend.add(_clave_tag(tag), nueva, timeout=None):
+                    nueva = self.backend.get(_clave_tag(tag))
+                versiones[tag] = nueva
+        return versiones
+
+    def _guardar(self, clave: Any, valor: Any, versiones: Dict[str, str], ttl: Optional[int]) -> None:
+        self.backend.set(self.clave(clave), {"valor": valor, "tags": versiones},
+                         timeout=self.ttl if ttl is None else ttl)
+        metricas.sumar(self.nombre, "sets")
+
+    def set(self, clave: Any, valor: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        self._guardar(clave, valor, self._versiones_para_escribir(tags), ttl)
+
+    def get_or_set(self, clave: Any, calcular: Callable[[], Any], ttl: Optional[int] = None,
+                   tags: Iterable[str] = ()) -> Any:
+        valor = self.get(clave, _NO_ENCONTRADO)
+        if valor is _NO_ENCONTRADO:
+            # versiones leídas *antes* de calcular: si se invalida mientras tanto,
+            # lo calculado queda guardado como viejo y el próximo get es un miss
+            versiones = self._versiones_para_escribir(tags)
+            inicio = time.perf_counter()
+            valor = calcular()
+            # tiempo gastado en recalcular misses: lo que el cache ahorra cuando acierta
+            metricas.sumar(self.nombre, "ms_calculo", int((time.perf_counter() - inicio) * 1000))
+            self._guardar(clave, valor, versiones, ttl)
+        return valor
+
+    async def aget_or_set(self, clave: Any, calcular: Callable[[], Awaitable[Any]], ttl: Optional[int] = None,
+                          tags: Iterable[str] = ()) -> Any:
+        """:meth:`get_or_set` para vistas async: ``calcular`` es una corutina.
+
+        Las operaciones contra el backend corren en el pool de hilos de asgiref
+        (no en el hilo de la request) para no bloquear el event loop.
+        """
+        valor = await sync_to_async(self.get, thread_sensitive=False)(clave, _NO_ENCONTRADO)
+        if valor is _NO_ENCONTRADO:
+            versiones = await sync_to_async(self._versiones_para_escribir, thread_sensitive=False)(tags)
+            inicio = time.perf_counter()
+            valor = await calcular()
+            metricas.sumar(self.nombre, "ms_calculo", int((time.perf_counter() - inicio) * 1000))
+            await sync_to_async(self._guardar, thread_sensitive=False)(clave, valor, versiones, ttl)
+        return valor
+
+    def delete(self, clave: Any) -> None:
+        self.backend.delete(self.clave(clave))
+
+    def invalidar_todo(self) -> None:
+        invalidar_tags(self.tag_dominio, alias=self.alias)
+
+
+_dominios: Dict[str, CacheDominio] = {}
+
+
+def dominio(nombre: str) -> CacheDominio:
+    """Instancia compartida del dominio (los TTL se leen de settings en cada uso)."""
+    if nombre not in _dominios:
+        _dominios[nombre] = CacheDominio(nombre)
+    return _dominios[nombre]
+
+
+def _cacheable(response) -> bool:
+    # sólo respuestas completas que no dejan cookies ni piden no cachearse
+    cache_control = response.get("Cache-Control", "")
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and "private" not in cache_control
+        and "no-store" not in cache_control
+    )
+
+
+def _respuesta_cacheada(entrada: Dict[str, Any]) -> HttpResponse:
+    response = HttpResponse(entrada["contenido"], content_type=entrada["content_type"])
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def _guardar_pagina(cache: CacheDominio, clave_pagina, response, versiones: Dict[str, str]) -> None:
+    if _cacheable(response):
+        if hasattr(response, "render") and not response.is_rendered:
+            response.render()
+        cache._guardar(clave_pagina, {"contenido": response.content,
+                                      "content_type": response["Content-Type"]}, versiones, None)
+        response["X-Cache"] = "MISS"
+
+
+def pagina_anonima(clave: Callable[[Any], Any], tags: Iterable[str] = (), nombre_dominio: str = "paginas"):
+    """Decorador: sirve desde el cache la respuesta de un GET anónimo.
+
+    ``clave(request)`` devuelve lo único de lo que depende la página (p. ej.
+    los filtros normalizados); host y path se agregan acá. Los usuarios
+    logueados siempre pasan por la vista, porque la página muestra su nombre.
+    Sirve tanto para vistas sync como async.
+    """
+    def decorador(vista):
+        if iscoroutinefunction(vista):
+            @functools.wraps(vista)
+            async def envoltura_async(request, *args, **kwargs):
+                if request.method != "GET" or (await request.auser()).is_authenticated:
+                    return await vista(request, *args, **kwargs)
+                cache = dominio(nombre_dominio)
+                clave_pagina = ("pagina", request.get_host(), request.path, clave(request))
+                entrada = await sync_to_async(cache.get, thread_sensitive=False)(clave_pagina)
+                if entrada is not None:
+                    return _respuesta_cacheada(entrada)
+                versiones = await sync_to_async(cache._versiones_para_escribir, thread_sensitive=False)(tags)
+                response = await vista(request, *args, **kwargs)
+                await sync_to_async(_guardar_pagina, thread_sensitive=False)(cache, clave_pagina, response, versiones)
+                return response
+            return envoltura_async
+
+        @functools.wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method != "GET" or request.user.is_authenticated:
+                return vista(request, *args, **kwargs)
+            cache = dominio(nombre_dominio)
+            clave_pagina = ("pagina", request.get_host(), request.path, clave(request))
+            entrada = cache.get(clave_pagina)
+            if entrada is not None:
+                return _respuesta_cacheada(entrada)
+            versiones = cache._versiones_para_escribir(tags)
+            response = vista(request, *args, **kwargs)
+            _guardar_pagina(cache, clave_pagina, response, versiones)
+            return response
+        return envoltura
+    return decorador
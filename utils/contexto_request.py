@@ -0,0 +1,57 @@
+# utils/contexto_request.py
+"""Contexto de la request (request_id, user_id) en ``ContextVar``.
+
+Con ``threading.local`` el contexto se mezcla cuando varias requests
+comparten hilo (ASGI, vistas async) y se pierde al pasar trabajo a otro
+hilo. Los ``ContextVar`` siguen a cada tarea de asyncio, y
+``sync_to_async``/``async_to_sync`` los copian al hilo donde corre el
+código sync. Quien pase trabajo a un ``ThreadPoolExecutor`` propio tiene
+que enviarlo con ``contextvars.copy_context().run``.
+
+Lo fija `RequestContextMiddleware`; lo leen el filtro de logging
+(`Main.logging_filters.RequestContextFilter`) y `BaseAPIClient`, que lo
+reenvía a los upstreams en el header ``X-Request-ID``.
+"""
+from __future__ import annotations
+
+import re
+from contextvars import ContextVar, Token
+from typing import Optional, Tuple
+
+HEADER_REQUEST_ID = "X-Request-ID"
+# ids entrantes aceptados: evita que un cliente meta basura (o saltos de línea) en los logs
+_ID_VALIDO = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_user_id: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
+
+
+def establecer_contexto(request_id: Optional[str], user_id: Optional[str] = None) -> Tuple[Token, Token]:
+    """Fija el contexto y devuelve los tokens para :func:`restablecer_contexto`."""
+    return _request_id.set(request_id or None), _user_id.set(user_id or None)
+
+
+def restablecer_contexto(tokens: Tuple[Token, Token]) -> None:
+    token_request, token_usuario = tokens
+    _user_id.reset(token_usuario)
+    _request_id.reset(token_request)
+
+
+def establecer_usuario(user_id: Optional[str]) -> Token:
+    return _user_id.set(user_id or None)
+
+
+def request_id_actual() -> Optional[str]:
+    return _request_id.get()
+
+
+def user_id_actual() -> Optional[str]:
+    return _user_id.get()
+
+
+def request_id_entrante(valor: Optional[str]) -> Optional[str]:
+    """El X-Request-ID recibido si es un id razonable, si no None."""
+    if valor and _ID_VALIDO.fullmatch(valor):
+        return valor
+    return None
+
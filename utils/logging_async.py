@@ -0,0 +1,137 @@
+# utils/logging_async.py
+"""Handler de logging que saca la escritura del hilo de la request.
+
+El hilo que loguea sólo arma el mensaje y lo encola (``put_nowait``); un
+hilo de fondo toma los registros de a lotes, los formatea y los escribe al
+stream con un único ``write`` + ``flush`` por lote. Si la cola se llena se
+descartan registros (y se cuentan) antes que bloquear una request.
+
+Los filtros del handler corren en el hilo que loguea, así que
+`RequestContextFilter` sigue viendo el request_id de la request en curso.
+
+Se configura desde ``LOGGING`` con la clave ``"()"``::
+
+    "console": {
+        "()": "utils.logging_async.HandlerAsincrono",
+        "stream": "ext://sys.stdout",
+        "formatter": "simple",
+        "filters": ["request_context"],
+    }
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+
+# handlers vivos, para vaciarlos al salir del proceso
+_activos: "weakref.WeakSet[HandlerAsincrono]" = weakref.WeakSet()
+
+
+class HandlerAsincrono(logging.Handler):
+    def __init__(self, stream=None, capacidad: int = 10000, tamano_lote: int = 256, intervalo: float = 0.2):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self.capacidad = capacidad
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.descartados = 0
+        self._pid = None
+        self._cola: queue.Queue | None = None
+        self._escritor: threading.Thread | None = None
+        self._detener = threading.Event()
+        _activos.add(self)
+
+    # --- hilo que loguea -------------------------------------------------
+    def _asegurar_escritor(self):
+        # el hilo no sobrevive a un fork (gunicorn --preload): cada proceso arranca el suyo
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self.lock:
+            if self._pid == pid:
+                return
+            self._cola = queue.Queue(self.capacidad)
+            self._detener = threading.Event()
+            self._escritor = threading.Thread(target=self._escribir, name="logging-async", daemon=True)
+            self._escritor.start()
+            self._pid = pid
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._asegurar_escritor()
+            # sólo se resuelven los args (pueden ser objetos que cambian después);
+            # fecha, formato y traceback se arman en el hilo de fondo
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            self._cola.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+        except Exception:
+            self.handleError(record)
+
+    # --- hilo de fondo ---------------------------------------------------
+    def _escribir(self):
+        cola = self._cola
+        while True:
+            try:
+                lote = [cola.get(timeout=self.intervalo)]
+            except queue.Empty:
+                if self._detener.is_set():
+                    return
+                continue
+            while len(lote) < self.tamano_lote:
+                try:
+                    lote.append(cola.get_nowait())
+                except queue.Empty:
+                    break
+            self._escribir_lote(lote)
+
+    def _escribir_lote(self, lote):
+        lineas = []
+        for record in lote:
+            try:
+                lineas.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        if self.descartados:
+            lineas.append(f"logging: {self.descartados} registros descartados (cola llena)")
+            self.descartados = 0
+        if not lineas:
+            return
+        try:
+            self.stream.write("\n".join(lineas) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(lote[-1])
+
+    # --- cierre ----------------------------------------------------------
+    def flush(self) -> None:
+        """Espera (hasta 2 s) a que el hilo de fondo escriba lo encolado."""
+        if self._pid != os.getpid() or self._escritor is None:
+            return
+        fin = time.monotonic() + 2
+        while not self._cola.empty() and self._escritor.is_alive() and time.monotonic() < fin:
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        if self._pid == os.getpid() and self._escritor is not None:
+            # el escritor termina cuando se le pide y la cola quedó vacía
+            self._detener.set()
+            self._escritor.join(timeout=2)
+            self._escritor = None
+            self._pid = None
+        super().close()
+
+
+@atexit.register
+def _vaciar_al_salir():
+    for handler in list(_activos):
+        handler.close()
@@ -0,0 +1,91 @@
+# utils/metricas_request.py
+"""Contadores por request: consultas SQL, llamadas a upstreams y sus tiempos.
+
+Igual que el deadline (`utils.apiCliente.deadline`), las métricas viven en un
+``ContextVar``: `RequestContextMiddleware` las inicia al comenzar la request
+y los puntos instrumentados (el execute wrapper de la conexión y
+`BaseAPIClient._send`) suman sobre las de la request en curso. Fuera de una
+request no hay métricas activas y registrar no hace nada.
+
+El CPU se mide con ``time.thread_time()``, así que sólo vale cuando toda la
+request corre en un hilo (WSGI). Bajo ASGI la vista y los middlewares corren
+en hilos distintos y el del event loop lo comparten requests concurrentes:
+ahí no se mide (``cpu_ms`` es None).
+"""
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class MetricasRequest:
+    sql_consultas: int = 0
+    sql_ms: float = 0.0
+    upstream_llamadas: int = 0
+    upstream_ms: float = 0.0
+    inicio: float = field(default_factory=time.perf_counter)
+    # None: no se mide el CPU (ASGI)
+    cpu_inicio: Optional[float] = field(default_factory=time.thread_time)
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.inicio) * 1000
+
+    def cpu_ms(self) -> Optional[float]:
+        if self.cpu_inicio is None:
+            return None
+        return (time.thread_time() - self.cpu_inicio) * 1000
+
+    def resumen(self) -> dict:
+        """Tiempos en ms; ``app`` es lo que queda fuera de la base y los upstreams."""
+        total = self.total_ms()
+        cpu = self.cpu_ms()
+        return {
+            "sql_consultas": self.sql_consultas,
+            "sql_ms": round(self.sql_ms, 2),
+            "upstream_llamadas": self.upstream_llamadas,
+            "upstream_ms": round(self.upstream_ms, 2),
+            "app_ms": round(max(0.0, total - self.sql_ms - self.upstream_ms), 2),
+            "cpu_ms": round(cpu, 2) if cpu is not None else None,
+            "total_ms": round(total, 2),
+        }
+
+
+_actuales: ContextVar[Optional[MetricasRequest]] = ContextVar("metricas_request", default=None)
+
+
+def iniciar_metricas(medir_cpu: bool = True) -> Token:
+    return _actuales.set(MetricasRequest() if medir_cpu else MetricasRequest(cpu_inicio=None))
+
+
+def finalizar_metricas(token: Token) -> None:
+    _actuales.reset(token)
+
+
+def metricas_actuales() -> Optional[MetricasRequest]:
+    return _actuales.get()
+
+
+def registrar_sql(ms: float) -> None:
+    metricas = _actuales.get()
+    if metricas is not None:
+        metricas.sql_consultas += 1
+        metricas.sql_ms += ms
+
+
+def registrar_upstream(ms: float) -> None:
+    metricas = _actuales.get()
+    if metricas is not None:
+        metricas.upstream_llamadas += 1
+        metricas.upstream_ms += ms
+
+
+def wrapper_sql(execute, sql, params, many, context):
+    """Execute wrapper de Django (``connection.execute_wrapper``) que mide cada consulta."""
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        registrar_sql((time.perf_counter() - inicio) * 1000)
@@ -0,0 +1,177 @@
+# utils/perfilador.py
+"""Perfilador estadístico por muestreo, sin dependencias externas.
+
+Un hilo auxiliar mira cada ``intervalo`` segundos la pila del hilo que
+atiende la request (``sys._current_frames``) y cuenta cuántas veces aparece
+cada pila. No instrumenta cada llamada como ``cProfile``, así que el costo
+sobre la request es bajo y estable aunque la vista haga miles de llamadas.
+
+Los perfiles se guardan como JSON (una pila por línea en formato
+"colapsado", el que entienden flamegraph.pl y speedscope) y se listan desde
+el panel de administración.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# corta pilas patológicas (recursión profunda) para no inflar el perfil
+PROFUNDIDAD_MAXIMA = 128
+
+
+def _etiqueta(frame) -> str:
+    codigo = frame.f_code
+    return f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})"
+
+
+class PerfiladorMuestreo:
+    """Muestrea la pila de un hilo mientras está activo.
+
+        perfilador = PerfiladorMuestreo(intervalo=0.005)
+        with perfilador:
+            ...  # código a perfilar, en este mismo hilo
+        perfilador.top()
+    """
+
+    def __init__(self, intervalo: float = 0.005):
+        self.intervalo = intervalo
+        self.pilas: Counter = Counter()
+        self.muestras = 0
+        self.duracion = 0.0
+        self._hilo_objetivo: Optional[int] = None
+        self._detener = threading.Event()
+        self._muestreador: Optional[threading.Thread] = None
+        self._inicio = 0.0
+
+    def iniciar(self, hilo: Optional[int] = None) -> None:
+        self._hilo_objetivo = hilo if hilo is not None else threading.get_ident()
+        self._inicio = time.perf_counter()
+        self._muestreador = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+        self._muestreador.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        if self._muestreador is not None:
+            self._muestreador.join()
+        self.duracion = time.perf_counter() - self._inicio
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.detener()
+        return False
+
+    def _muestrear(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self._hilo_objetivo)
+            if frame is None:
+                continue
+            pila = []
+            while frame is not None and len(pila) < PROFUNDIDAD_MAXIMA:
+                pila.append(_etiqueta(frame))
+                frame = frame.f_back
+            pila.reverse()  # de la raíz a la hoja
+            self.pilas[tuple(pila)] += 1
+            self.muestras += 1
+
+    def colapsado(self) -> List[str]:
+        """Líneas "raiz;...;hoja N" ordenadas por cantidad de muestras."""
+        return [f"{';'.join(pila)} {n}" for pila, n in self.pilas.most_common()]
+
+    def top(self, cantidad: int = 30) -> List[Dict]:
+        return top_funciones(self.pilas, self.muestras, cantidad)
+
+
+def top_funciones(pilas: Counter, muestras: int, cantidad: int = 30) -> List[Dict]:
+    """Funciones con más muestras: ``propio`` es en la hoja, ``acumulado`` en cualquier nivel."""
+    propio: Counter = Counter()
+    acumulado: Counter = Counter()
+    for pila, n in pilas.items():
+        if not pila:
+            continue
+        propio[pila[-1]] += n
+        for funcion in set(pila):
+            acumulado[funcion] += n
+    total = max(1, muestras)
+    return [
+        {
+            "funcion": funcion,
+            "acumulado": n,
+            "acumulado_pct": round(100 * n / total, 1),
+            "propio": propio[funcion],
+            "propio_pct": round(100 * propio[funcion] / total, 1),
+        }
+        for funcion, n in acumulado.most_common(cantidad)
+    ]
+
+
+# ----------------------------------------------------------------------
+# almacenamiento
+# ----------------------------------------------------------------------
+
+def guardar_perfil(directorio, perfilador: PerfiladorMuestreo, meta: Dict, maximo: int | None = None) -> Path:
+    """Escribe el perfil como JSON y, si hay ``maximo``, borra los más viejos."""
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    # el nombre ordena cronológicamente (también dentro del mismo segundo)
+    segundos, nanos = divmod(time.time_ns(), 10**9)
+    perfil_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(segundos))}-{nanos:09d}-{uuid.uuid4().hex[:6]}"
+    registro = dict(meta)
+    registro.update({
+        "id": perfil_id,
+        "ts": round(time.time(), 3),
+        "muestras": perfilador.muestras,
+        "intervalo_ms": perfilador.intervalo * 1000,
+        "duracion_ms": round(perfilador.duracion * 1000, 2),
+        "pilas": perfilador.colapsado(),
+    })
+    ruta = directorio / f"{perfil_id}.json"
+    tmp = ruta.with_suffix(".tmp")
+    tmp.write_text(json.dumps(registro, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ruta)  # el índice nunca ve archivos a medio escribir
+    if maximo:
+        for viejo in sorted(directorio.glob("*.json"))[:-maximo]:
+            viejo.unlink(missing_ok=True)
+    return ruta
+
+
+def listar_perfiles(directorio, limite: int = 200) -> List[Dict]:
+    """Metadatos (sin las pilas) de los perfiles guardados, del más nuevo al más viejo."""
+    directorio = Path(directorio)
+    if not directorio.is_dir():
+        return []
+    perfiles = []
+    for ruta in sorted(directorio.glob("*.json"), reverse=True)[:limite]:
+        try:
+            registro = json.loads(ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        registro.pop("pilas", None)
+        perfiles.append(registro)
+    return perfiles
+
+
+def cargar_perfil(directorio, perfil_id: str) -> Optional[Dict]:
+    """El perfil completo, con ``pilas`` y el ``top`` de funciones ya calculado."""
+    if not perfil_id or "/" in perfil_id or "\\" in perfil_id or perfil_id.startswith("."):
+        return None
+    ruta = Path(directorio) / f"{perfil_id}.json"
+    try:
+        registro = json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    pilas: Counter = Counter()
+    for linea in registro.get("pilas", []):
+        pila, _, n = linea.rpartition(" ")
+        pilas[tuple(pila.split(";"))] += int(n)
+    registro["top"] = top_funciones(pilas, registro.get("muestras", 0))
+    return registro
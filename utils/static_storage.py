@@ -0,0 +1,89 @@
+# utils/static_storage.py
+"""Storage de estáticos para producción: nombres con hash y variantes precomprimidas.
+
+``collectstatic`` con :class:`ManifestComprimido` (``STATIC_HASHED=1``):
+
+- copia cada archivo también como ``nombre.<hash>.ext`` y reescribe las
+  referencias ``url(...)``/``@import`` de los CSS (ManifestStaticFilesStorage);
+  ``{% static %}`` devuelve el nombre con hash, así que el contenido de una
+  URL nunca cambia y nginx la sirve con ``Cache-Control: immutable``;
+- deja al lado de cada archivo de texto (CSS, JS, SVG, JSON...) un ``.gz`` y,
+  si ``brotli`` está instalado, un ``.br``. nginx los entrega tal cual con
+  ``gzip_static``/``brotli_static``: no comprime en cada request y puede usar
+  el nivel máximo.
+
+Los originales sin hash se conservan (hay JS que arma rutas ``/static/...``
+a mano) y también se precomprimen.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Iterator, Tuple
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage
+
+try:  # dependencia opcional: si no está, sólo se generan los .gz
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+# formatos de texto; imágenes, fuentes woff y zips ya vienen comprimidos
+EXTENSIONES_COMPRIMIBLES = (
+    ".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico", ".ttf", ".otf", ".eot",
+)
+# por debajo de esto el .gz no ahorra ni un paquete
+TAMANO_MINIMO = 256
+
+
+def _gzip(contenido: bytes) -> bytes:
+    # mtime=0: el mismo archivo da siempre los mismos bytes (builds reproducibles)
+    return gzip.compress(contenido, compresslevel=9, mtime=0)
+
+
+def _brotli(contenido: bytes) -> bytes:
+    return brotli.compress(contenido, quality=11)
+
+
+def variantes_comprimidas(contenido: bytes) -> Iterator[Tuple[str, bytes]]:
+    """(sufijo, bytes) de cada variante que resulta más chica que el original."""
+    if len(contenido) < TAMANO_MINIMO:
+        return
+    compresores = [(".gz", _gzip)]
+    if brotli is not None:
+        compresores.append((".br", _brotli))
+    for sufijo, comprimir in compresores:
+        comprimido = comprimir(contenido)
+        if len(comprimido) < len(contenido):
+            yield sufijo, comprimido
+
+
+class ManifestComprimido(ManifestStaticFilesStorage):
+    def url(self, name, force=False):
+        # DEBUG está activo también en los contenedores; con este storage
+        # configurado siempre se sirven los nombres del manifest
+        try:
+            return super().url(name, force=True)
+        except ValueError:
+            # el template referencia un archivo que no está en el manifest: la
+            # página se renderiza igual (ese recurso da 404, como sin hash)
+            return StaticFilesStorage.url(self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for nombre in paths:
+            if not nombre.lower().endswith(EXTENSIONES_COMPRIMIBLES):
+                continue
+            for destino in dict.fromkeys((nombre, self.stored_name(nombre))):
+                for sufijo, procesado in self._precomprimir(destino):
+                    yield nombre, procesado, True
+
+    def _precomprimir(self, nombre: str) -> Iterator[Tuple[str, str]]:
+        with self.open(nombre) as archivo:
+            contenido = archivo.read()
+        for sufijo, comprimido in variantes_comprimidas(contenido):
+            # escritura directa: _save() renombraría el archivo si ya existe
+            with open(self.path(nombre + sufijo), "wb") as salida:
+                salida.write(comprimido)
+            yield sufijo, nombre + sufijo